@@ -14,4 +14,5 @@ export PATH="$HOME/.local/bin:$PATH"
 
 uv run manage.py collectstatic --no-input
 uv run manage.py migrate
+uv run manage.py createcachetable
 uv run manage.py loaddata zlatnic_db_data.json
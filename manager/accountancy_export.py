@@ -0,0 +1,76 @@
+import csv
+import json
+from collections.abc import Iterator
+from datetime import date
+from itertools import batched
+
+from django.db.models import Q, QuerySet
+from django.utils import timezone
+
+from manager.models import Accountancy, Card, Cash, Cryptocurrency
+from manager.money import CRYPTO_DECIMAL_PLACES, from_minor
+from manager.wallet_operations import date_range_filter, wallet_filter
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FIELDS = ("datetime", "wallet", "IO", "IO_type", "amount")
+EXPORT_FORMATS = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+class _Echo:
+    """File-like object that returns what is written to it, so `csv.writer` can build lines for streaming."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def user_accountancy(
+    user_id: int, start: date | None = None, end: date | None = None, wallet_type: str = "", wallet_id: int = 0
+) -> QuerySet:
+    """Return a user's accountancy as
+    `(datetime, card_id, cash_id, cryptocurrency_id, IO, category_id, amount)` rows.
+    """
+    if wallet_type:
+        wallets = wallet_filter(wallet_type, wallet_id)
+    else:
+        # Resolving the wallet ids first keeps the joins out of the (potentially huge) scan.
+        wallets = (
+            Q(card_id__in=list(Card.objects.filter(user_id=user_id).values_list("id", flat=True)))
+            | Q(cash_id__in=list(Cash.objects.filter(user_id=user_id).values_list("id", flat=True)))
+            | Q(cryptocurrency_id__in=list(Cryptocurrency.objects.filter(user_id=user_id).values_list("id", flat=True)))
+        )
+    return (
+        Accountancy.objects.filter(wallets & date_range_filter(start, end))
+        .order_by("datetime", "id")
+        .values_list("datetime", "card_id", "cash_id", "cryptocurrency_id", "IO", "category_id", "amount")
+    )
+
+
+def _records(queryset: QuerySet, decimal_places: dict[str, int], categories: dict[int, str]) -> Iterator[tuple]:
+    for moment, card_id, cash_id, cryptocurrency_id, io, category_id, amount in queryset.iterator(EXPORT_CHUNK_SIZE):
+        if card_id:
+            wallet = f"card - {card_id}"
+        elif cash_id:
+            wallet = f"cash - {cash_id}"
+        else:
+            wallet = f"crypto - {cryptocurrency_id}"
+        amount = str(from_minor(amount, decimal_places.get(wallet, CRYPTO_DECIMAL_PLACES)))
+        yield timezone.localtime(moment).isoformat(), wallet, io, categories[category_id], amount
+
+
+def export_lines(
+    queryset: QuerySet, export_format: str, decimal_places: dict[str, int], categories: dict[int, str]
+) -> Iterator[str]:
+    """Stream the rows of `user_accountancy()` as CSV or NDJSON, a chunk of lines per yielded string.
+
+    Amounts are exported as exact decimal strings, using the decimal places of their `"<type> - <id>"` wallets.
+    Categories are exported by name, as the `IO_type` column that `manager.statement_import` reads back.
+    """
+    records = _records(queryset, decimal_places, categories)
+    if export_format == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow(EXPORT_FIELDS)
+        for chunk in batched(records, EXPORT_CHUNK_SIZE, strict=False):
+            yield "".join(writer.writerow(record) for record in chunk)
+    else:
+        for chunk in batched(records, EXPORT_CHUNK_SIZE, strict=False):
+            yield "".join(json.dumps(dict(zip(EXPORT_FIELDS, record, strict=True))) + "\n" for record in chunk)
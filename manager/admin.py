@@ -1,29 +1,73 @@
-from django.contrib import admin
+from decimal import Decimal
+from typing import Any
+
+from django.contrib import admin, messages
 from django.contrib.admin import ModelAdmin
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import ForeignKey, QuerySet
+from django.forms import ModelChoiceField
+from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 
+from manager.currencies import currencies
+from manager.forms import CurrencyChoiceField
 from manager.models import (
     Accountancy,
     Card,
     Cash,
+    Category,
     Cryptocurrency,
     Currency,
+    ExchangeRate,
+    Job,
+    RecurringTransaction,
 )
+from manager.search import search_categories
+from manager.wallet_operations import delete_transaction
 
 admin.site.register(Currency, ModelAdmin)
 
 
+class CurrencyModelAdmin(ModelAdmin):
+    """`ModelAdmin` whose currency choices come from the currency registry."""
+
+    def formfield_for_foreignkey(self, db_field: ForeignKey, request: HttpRequest, **kwargs: Any) -> ModelChoiceField:
+        if db_field.name == "currency":
+            kwargs["form_class"] = CurrencyChoiceField
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+
+@admin.register(Category)
+class CategoryAdmin(ModelAdmin):
+    list_display = (
+        "name",
+        "IO",
+        "user",
+        "icon",
+    )
+    list_filter = ("IO",)
+
+
 @admin.register(Card)
-class CardAdmin(ModelAdmin):
+class CardAdmin(CurrencyModelAdmin):
     list_display = (
         "user",
         "bank_name",
         "type",
-        "balance",
-        "currency",
+        "balance_amount",
+        "currency_name",
     )
 
+    @admin.display(description="balance", ordering="balance")
+    def balance_amount(self, obj: Card) -> Decimal:
+        return obj.balance_decimal
+
+    @admin.display(description="currency", ordering="currency")
+    def currency_name(self, obj: Card) -> str:
+        return str(currencies.get(obj.currency_id))  # type: ignore[reportAttributeAccessIssue]
+
 
-admin.site.register(Cash, ModelAdmin)
+admin.site.register(Cash, CurrencyModelAdmin)
 
 admin.site.register(Cryptocurrency, ModelAdmin)
 
@@ -35,9 +79,84 @@ class AccountancyAdmin(ModelAdmin):
         "cash",
         "cryptocurrency",
         "IO",
-        "IO_type",
+        "category",
         "amount",
         "datetime",
     )
-    search_fields = ("IO_type",)
-    list_filter = ("IO_type",)
+    search_fields = ("category__name",)
+    list_filter = ("category",)
+
+    def get_search_results(self, request: HttpRequest, queryset: QuerySet, search_term: str) -> tuple[QuerySet, bool]:
+        return search_categories(queryset, search_term), False
+
+    # The records are deleted with `delete_transaction()`, which takes them back from the wallet balances
+    # and deletes both records of a transfer, rather than by `Model.delete()` or `QuerySet.delete()`
+
+    def delete_model(self, request: HttpRequest, obj: Accountancy) -> None:
+        delete_transaction(obj)
+
+    def delete_queryset(self, request: HttpRequest, queryset: QuerySet) -> None:
+        transfers = set()
+        with transaction.atomic():
+            for record in queryset:
+                if record.transfer in transfers:
+                    continue
+                if record.transfer:
+                    transfers.add(record.transfer)
+                delete_transaction(record)
+
+    def delete_view(self, request: HttpRequest, object_id: str, extra_context: dict | None = None) -> HttpResponse:
+        try:
+            return super().delete_view(request, object_id, extra_context)
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)
+            return HttpResponseRedirect(request.path)
+
+    def changelist_view(self, request: HttpRequest, extra_context: dict | None = None) -> HttpResponse:
+        # The "Delete selected" action
+        try:
+            return super().changelist_view(request, extra_context)
+        except ValidationError as error:
+            self.message_user(request, " ".join(error.messages), messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+
+@admin.register(RecurringTransaction)
+class RecurringTransactionAdmin(ModelAdmin):
+    list_display = (
+        "card",
+        "cash",
+        "cryptocurrency",
+        "IO",
+        "category",
+        "amount",
+        "period",
+        "next_date",
+    )
+    list_filter = ("period", "IO")
+    readonly_fields = ("occurrences", "next_date")
+
+
+@admin.register(ExchangeRate)
+class ExchangeRateAdmin(CurrencyModelAdmin):
+    list_display = (
+        "date",
+        "currency",
+        "crypto_name",
+        "rate",
+    )
+    list_filter = ("date",)
+
+
+@admin.register(Job)
+class JobAdmin(ModelAdmin):
+    list_display = (
+        "name",
+        "user",
+        "status",
+        "attempts",
+        "created_at",
+        "finished_at",
+    )
+    list_filter = ("status", "name")
+    readonly_fields = ("claimed_by", "attempts", "started_at", "finished_at")
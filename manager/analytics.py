@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from datetime import date, datetime
+
+import numpy as np
+from django.db.models import Q
+from django.utils import timezone
+
+from manager.models import Accountancy
+
+ROLLING_WINDOWS = (3, 6, 12)
+SECONDS_PER_DAY = 24 * 60 * 60
+# Categories whose spending this month is this many standard deviations above their monthly mean are flagged
+ANOMALY_Z_SCORE = 2.0
+
+
+@dataclass(frozen=True, slots=True)
+class SpendingHistory:
+    """Outcome records as column arrays: local day, category id and amount in minor units."""
+
+    days: np.ndarray
+    categories: np.ndarray
+    amounts: np.ndarray
+
+
+@dataclass(frozen=True, slots=True)
+class SpendingAnalytics:
+    """Spending series in minor units. Series by month run from the month of the first record to the current one."""
+
+    days: np.ndarray
+    daily: np.ndarray
+    months: np.ndarray
+    monthly: np.ndarray
+    # Means of the last `window` completed months, NaN until there are enough of them; the current month is partial
+    rolling: dict[int, np.ndarray]
+    month_spent: float
+    projection: float
+    category_ids: np.ndarray
+    category_current: np.ndarray
+    category_mean: np.ndarray
+    category_z_scores: np.ndarray
+    anomalies: np.ndarray
+
+
+def local_days(timestamps: np.ndarray) -> np.ndarray:
+    """Turn POSIX timestamps into the days of the current time zone.
+
+    The UTC offset is looked up once at the start and once at the end of each UTC day; only the records of the
+    days with a DST transition get a lookup of their own.
+    """
+    tz = timezone.get_current_timezone()
+
+    def offset(seconds: int) -> int:
+        return int(datetime.fromtimestamp(seconds, tz).utcoffset().total_seconds())  # type: ignore[reportOptionalMemberAccess]
+
+    seconds = np.floor(timestamps).astype(np.int64)
+    utc_days, day_index = np.unique(seconds // SECONDS_PER_DAY, return_inverse=True)
+    day_starts = (utc_days * SECONDS_PER_DAY).tolist()
+    start_offsets = np.array([offset(start) for start in day_starts], dtype=np.int64)
+    end_offsets = np.array([offset(start + SECONDS_PER_DAY - 1) for start in day_starts], dtype=np.int64)
+
+    offsets = start_offsets[day_index]
+    transition = (start_offsets != end_offsets)[day_index]
+    offsets[transition] = [offset(moment) for moment in seconds[transition].tolist()]
+    return ((seconds + offsets) // SECONDS_PER_DAY).astype("datetime64[D]")
+
+
+def load_spending(q_filter: Q) -> SpendingHistory:
+    """Fetch the outcome records matching `q_filter` as three narrow columns, without building model instances.
+
+    Days are derived from the timestamps with NumPy, since truncating them in SQLite runs a Python function per row.
+    """
+    rows = (
+        Accountancy.objects.filter(q_filter, IO=Accountancy.OUTCOME)
+        .order_by()
+        .values_list("datetime", "category_id", "amount")
+    )
+    moments, categories, amounts = list(zip(*rows, strict=True)) or ((), (), ())
+    timestamps = np.fromiter((moment.timestamp() for moment in moments), dtype=np.float64, count=len(moments))
+    return SpendingHistory(
+        local_days(timestamps),
+        np.array(categories, dtype=np.int64),
+        np.array(amounts, dtype=np.int64),
+    )
+
+
+def rolling_mean(series: np.ndarray, window: int) -> np.ndarray:
+    result = np.full(series.shape, np.nan)
+    if len(series) >= window:
+        cumsum = np.cumsum(np.insert(series, 0, 0.0))
+        result[window - 1 :] = (cumsum[window:] - cumsum[:-window]) / window
+    return result
+
+
+def analyze_spending(history: SpendingHistory, today: date) -> SpendingAnalytics:
+    """Compute the daily and monthly series, rolling averages, projection and category anomalies of a history."""
+    end = np.datetime64(today, "D")
+    # Records dated in the future don't count yet
+    past = history.days <= end
+    days, categories, amounts = history.days[past], history.categories[past], history.amounts[past]
+
+    first_day = days.min() if len(days) else end
+    day_index = (days - first_day).astype(np.int64)
+    daily = np.bincount(day_index, weights=amounts, minlength=int((end - first_day).astype(np.int64)) + 1)
+
+    month_of_days = days.astype("datetime64[M]")
+    first_month, current_month = first_day.astype("datetime64[M]"), end.astype("datetime64[M]")
+    months_count = int((current_month - first_month).astype(np.int64)) + 1
+    month_index = (month_of_days - first_month).astype(np.int64)
+    monthly = np.bincount(month_index, weights=amounts, minlength=months_count)
+
+    month_start = current_month.astype("datetime64[D]")
+    elapsed = int((end - month_start).astype(np.int64)) + 1
+    month_length = int(((current_month + 1).astype("datetime64[D]") - month_start).astype(np.int64))
+    month_spent = float(monthly[-1])
+
+    # A category x month matrix of totals, built by one `bincount` over the flattened cell indexes
+    category_ids, category_index = np.unique(categories, return_inverse=True)
+    matrix = np.bincount(
+        category_index * months_count + month_index, weights=amounts, minlength=len(category_ids) * months_count
+    ).reshape(len(category_ids), months_count)
+    previous = matrix[:, :-1]
+    mean = previous.mean(axis=1) if previous.shape[1] else np.zeros(len(category_ids))
+    std = previous.std(axis=1) if previous.shape[1] else np.zeros(len(category_ids))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_scores = np.where(std > 0, (matrix[:, -1] - mean) / std, np.nan)
+
+    return SpendingAnalytics(
+        days=np.arange(first_day, end + 1),
+        daily=daily,
+        months=np.arange(first_month, current_month + 1),
+        monthly=monthly,
+        rolling={window: rolling_mean(monthly[:-1], window) for window in ROLLING_WINDOWS},
+        month_spent=month_spent,
+        projection=month_spent / elapsed * month_length,
+        category_ids=category_ids,
+        category_current=matrix[:, -1],
+        category_mean=mean,
+        category_z_scores=z_scores,
+        anomalies=z_scores > ANOMALY_Z_SCORE,
+    )
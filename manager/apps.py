@@ -4,3 +4,13 @@ from django.apps import AppConfig
 class ManagerConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "manager"
+
+    def ready(self) -> None:
+        from django.db.backends.signals import connection_created
+
+        from manager import signals  # noqa: F401
+        from manager.db import apply_sqlite_pragmas
+        from manager.metrics import install_query_recorder
+
+        connection_created.connect(apply_sqlite_pragmas)
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,82 @@
+from collections import defaultdict
+from collections.abc import Iterator
+from datetime import date, timedelta
+from itertools import batched
+
+import numpy as np
+
+from manager.analytics import local_days
+from manager.models import Accountancy, BalanceCheckpoint, Card, Cash, Cryptocurrency, MonthlyTurnover
+from manager.wallet_operations import date_range_filter, wallet_filter
+
+CHECKPOINT_BATCH_SIZE = 1000
+# Length of the daily balance series when no date range is given
+BALANCE_HISTORY_DAYS = 30
+
+
+def daily_balances(
+    wallet: Card | Cash | Cryptocurrency, wallet_type: str, start: date, end: date
+) -> tuple[np.ndarray, np.ndarray]:
+    """Return the days from `start` to `end` inclusive and the wallet's balance at the end of each, in minor units.
+
+    The balance at the start of `start`'s month comes from two checkpoints, so only the records from then to `end`
+    are read, however long the history is.
+    """
+    q_wallet = wallet_filter(wallet_type, wallet.id)  # type: ignore[reportAttributeAccessIssue]
+    month_start = start.replace(day=1)
+    checkpoints = BalanceCheckpoint.objects.filter(q_wallet).order_by("-month").values_list("net_total", flat=True)
+    latest = checkpoints.first() or 0
+    previous = checkpoints.filter(month__lt=month_start).first() or 0
+    # The current balance includes the records dated after `end` too, so they're taken back with `latest`
+    opening = wallet.balance - latest + previous
+
+    rows = (
+        Accountancy.objects.filter(q_wallet & date_range_filter(month_start, end))
+        .order_by()
+        .values_list("datetime", "IO", "amount")
+    )
+    moments, directions, amounts = list(zip(*rows, strict=True)) or ((), (), ())
+    timestamps = np.fromiter((moment.timestamp() for moment in moments), dtype=np.float64, count=len(moments))
+    signs = np.where(np.array(directions) == Accountancy.INCOME, 1, -1)
+
+    daily_net = np.zeros((end - month_start).days + 1, dtype=np.int64)
+    day_index = (local_days(timestamps) - np.datetime64(month_start, "D")).astype(np.int64)
+    np.add.at(daily_net, day_index, signs * np.array(amounts, dtype=np.int64))
+    balances = opening + np.cumsum(daily_net)
+    return np.arange(start, end + timedelta(days=1), dtype="datetime64[D]"), balances[(start - month_start).days :]
+
+
+def balance_at(wallet: Card | Cash | Cryptocurrency, wallet_type: str, day: date) -> int:
+    """Return the wallet's balance at the end of `day` in minor units."""
+    return int(daily_balances(wallet, wallet_type, day, day)[1][0])
+
+
+def rebuild_balance_checkpoints(batch_size: int = CHECKPOINT_BATCH_SIZE) -> int:
+    """Recreate all the checkpoints from the monthly turnover rollup. Must be called inside a transaction."""
+    net: defaultdict[tuple[int | None, int | None, int | None], defaultdict[date, int]] = defaultdict(
+        lambda: defaultdict(int)
+    )
+    rows = MonthlyTurnover.objects.order_by().values_list(
+        "card_id", "cash_id", "cryptocurrency_id", "IO", "month", "amount_sum"
+    )
+    for card_id, cash_id, cryptocurrency_id, io, month, amount_sum in rows.iterator(chunk_size=batch_size):
+        net[card_id, cash_id, cryptocurrency_id][month] += amount_sum if io == Accountancy.INCOME else -amount_sum
+
+    def checkpoints() -> Iterator[BalanceCheckpoint]:
+        for (card_id, cash_id, cryptocurrency_id), months in net.items():
+            net_total = 0
+            for month in sorted(months):
+                net_total += months[month]
+                yield BalanceCheckpoint(
+                    card_id=card_id,
+                    cash_id=cash_id,
+                    cryptocurrency_id=cryptocurrency_id,
+                    month=month,
+                    net_total=net_total,
+                )
+
+    BalanceCheckpoint.objects.all().delete()
+    created = 0
+    for batch in batched(checkpoints(), batch_size, strict=False):
+        created += len(BalanceCheckpoint.objects.bulk_create(batch))
+    return created
@@ -0,0 +1,191 @@
+import statistics
+import threading
+import time
+import urllib.request
+from dataclasses import dataclass, field
+from http.client import HTTPException
+from itertools import cycle
+from typing import Any
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.contrib.auth.models import AbstractBaseUser
+from django.db import connection
+from django.middleware.csrf import CSRF_SECRET_LENGTH
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.crypto import get_random_string
+
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency
+
+# Scenarios of the pages with per-user `{% cache %}` fragments
+FRAGMENT_CACHED_SCENARIOS = ("wallets", "index")
+
+
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    name: str
+    path: str
+    method: str = "get"
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+def benchmark_scenarios(user: AbstractBaseUser) -> list[Scenario]:
+    """Return the benchmarked requests, pointed at the user's busiest wallet and its latest record."""
+    wallet_type, wallet = next(
+        (
+            (wallet_type, wallet)
+            for wallet_type, model in (("card", Card), ("cash", Cash), ("crypto", Cryptocurrency))
+            if (wallet := model.objects.filter(user=user).order_by("id").first()) is not None
+        ),
+        (None, None),
+    )
+    if wallet is None:
+        raise ValueError(f"User '{user}' has no wallets to benchmark.")
+
+    wallet_field = "cryptocurrency" if wallet_type == "crypto" else wallet_type
+    record = Accountancy.objects.filter(**{wallet_field: wallet}).order_by("-datetime").first()
+    if record is None:
+        raise ValueError(f"Wallet '{wallet}' has no accountancy records to benchmark.")
+    month = timezone.localtime(record.datetime)
+    wallet_choice = f"{wallet_type} - {wallet.id}"  # type: ignore[reportAttributeAccessIssue]
+    income_category = Category.objects.for_user(user.pk).filter(IO=Accountancy.INCOME).values_list("id", flat=True)
+
+    return [
+        Scenario("wallets", reverse("manager:wallets")),
+        Scenario("index", reverse("manager:index")),
+        Scenario(
+            "index_post",
+            reverse("manager:index"),
+            "post",
+            {"wallet_choice": wallet_choice, "Income": str(income_category.first()), "amount": "1"},
+        ),
+        Scenario("monthly_accountancy_list", reverse("manager:monthly-accountancy-list")),
+        Scenario(
+            "monthly_accountancy_search",
+            reverse(
+                "manager:monthly-accountancy",
+                kwargs={"wallet": wallet_type, "wallet_id": wallet.id, "month": month.month, "year": month.year},  # type: ignore[reportAttributeAccessIssue]
+            ),
+            data={"IO_type": record.category.name[:3]},
+        ),
+        Scenario("accountancy_update", reverse("manager:accountancy-update", kwargs={"pk": record.id})),  # type: ignore[reportAttributeAccessIssue]
+        Scenario(
+            "accountancy_update_post",
+            reverse("manager:accountancy-update", kwargs={"pk": record.id}),  # type: ignore[reportAttributeAccessIssue]
+            "post",
+            {"amount": record.amount_decimal, "wallet_choice": f"{wallet_type} - {record.amount_decimal}"},
+        ),
+    ]
+
+
+def run_scenario(client: Client, scenario: Scenario, iterations: int, warmup: int) -> dict[str, Any]:
+    """Request the scenario `warmup + iterations` times and summarize the latency and SQL queries of the latter."""
+    request = getattr(client, scenario.method)
+    for _ in range(warmup):
+        request(scenario.path, scenario.data)
+
+    durations, queries = [], []
+    for _ in range(iterations):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            response = request(scenario.path, scenario.data)
+            durations.append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            raise ValueError(f"{scenario.method.upper()} {scenario.path} responded with {response.status_code}.")
+        queries.append(len(captured))
+
+    percentiles = statistics.quantiles(durations, n=100, method="inclusive")
+    return {
+        "method": scenario.method.upper(),
+        "path": scenario.path,
+        "iterations": iterations,
+        "mean_ms": round(statistics.fmean(durations), 3),
+        "p50_ms": round(percentiles[49], 3),
+        "p90_ms": round(percentiles[89], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "max_ms": round(max(durations), 3),
+        "queries": round(statistics.median(queries)),
+        "max_queries": max(queries),
+    }
+
+
+def compare_fragment_cache(
+    client: Client, scenarios: list[Scenario], iterations: int, warmup: int
+) -> dict[str, dict[str, float]]:
+    """Measure the pages with cached template fragments with the fragment cache off and on."""
+    report = {}
+    for scenario in scenarios:
+        if scenario.name not in FRAGMENT_CACHED_SCENARIOS:
+            continue
+        with override_settings(FRAGMENT_CACHE_TIMEOUT=0):
+            uncached = run_scenario(client, scenario, iterations, warmup)
+        cached = run_scenario(client, scenario, iterations, warmup)
+        report[scenario.name] = {
+            "uncached_p50_ms": uncached["p50_ms"],
+            "cached_p50_ms": cached["p50_ms"],
+            "saved_p50_ms": round(uncached["p50_ms"] - cached["p50_ms"], 3),
+        }
+    return report
+
+
+def run_load(
+    base_url: str, scenarios: list[Scenario], session_cookie: str, concurrency: int, duration: float
+) -> dict[str, Any]:
+    """Request the scenarios round-robin from `concurrency` threads for `duration` seconds over HTTP.
+
+    Unlike `run_scenario()`, the requests go through a real server, so its connection handling is measured too.
+    """
+    csrf_token = get_random_string(CSRF_SECRET_LENGTH)
+    headers = [("Cookie", f"{session_cookie}; {settings.CSRF_COOKIE_NAME}={csrf_token}"), ("X-CSRFToken", csrf_token)]
+    durations: list[float] = []
+    errors = 0
+    lock = threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def worker(offset: int) -> None:
+        nonlocal errors
+        opener = urllib.request.build_opener()
+        opener.addheaders = headers
+        # `Request` objects keep the redirects they followed, so a new one is built every time
+        requests = [
+            (base_url + scenario.path, urlencode(scenario.data).encode())
+            if scenario.method == "post"
+            else (base_url + scenario.path + (f"?{urlencode(scenario.data)}" if scenario.data else ""), None)
+            for scenario in scenarios
+        ]
+        local_durations, local_errors = [], 0
+        for url, data in cycle(requests[offset % len(requests) :] + requests[: offset % len(requests)]):
+            start = time.perf_counter()
+            if start >= deadline:
+                break
+            try:
+                with opener.open(urllib.request.Request(url, data)) as response:
+                    response.read()
+                local_durations.append((time.perf_counter() - start) * 1000)
+            except (OSError, HTTPException):
+                local_errors += 1
+        with lock:
+            durations.extend(local_durations)
+            errors += local_errors
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(durations, n=100, method="inclusive") if len(durations) > 1 else [0.0] * 99
+    return {
+        "concurrency": concurrency,
+        "duration_s": round(elapsed, 3),
+        "requests": len(durations),
+        "errors": errors,
+        "requests_per_second": round(len(durations) / elapsed, 1),
+        "p50_ms": round(percentiles[49], 3),
+        "p99_ms": round(percentiles[98], 3),
+    }
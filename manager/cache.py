@@ -0,0 +1,145 @@
+import asyncio
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import QuerySet
+
+from manager.models import Card, Cash, Cryptocurrency
+
+WALLETS_CACHE_TIMEOUT = 60 * 60 * 24
+CACHE_STATS = ("hits", "misses")
+
+
+def _version_key(user_id: int) -> str:
+    return f"zlatnic:user:{user_id}:version"
+
+
+def _modified_key(user_id: int) -> str:
+    return f"zlatnic:user:{user_id}:modified"
+
+
+def user_data_version(user_id: int) -> int:
+    """Return the version of a user's cached data, which changes whenever their wallets change."""
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        # Starting from the clock (not from 1) keeps an evicted counter from reusing old versions.
+        cache.add(_version_key(user_id), time.time_ns(), timeout=None)
+        version = cache.get(_version_key(user_id), 0)
+    return version
+
+
+async def auser_data_version(user_id: int) -> int:
+    version = await cache.aget(_version_key(user_id))
+    if version is None:
+        await cache.aadd(_version_key(user_id), time.time_ns(), timeout=None)
+        version = await cache.aget(_version_key(user_id), 0)
+    return version
+
+
+async def auser_data_stamp(user_id: int) -> tuple[int, float | None]:
+    """Return the version of a user's data and the time of its last change, unknown if the cache lost it."""
+    stamp = await cache.aget_many([_version_key(user_id), _modified_key(user_id)])
+    version = stamp.get(_version_key(user_id))
+    if version is None:
+        version = await auser_data_version(user_id)
+    return version, stamp.get(_modified_key(user_id))
+
+
+async def afragment_cache_context(user_id: int) -> dict[str, int]:
+    """Return the context of the `{% cache %}` fragments of a user's pages, which vary on their data version.
+
+    Read it after any change the request makes, or the fragments cached under the previous version are served.
+    """
+    return {
+        "fragment_cache_timeout": settings.FRAGMENT_CACHE_TIMEOUT,
+        "data_version": await auser_data_version(user_id),
+    }
+
+
+def _bump(user_id: int) -> None:
+    try:
+        cache.incr(_version_key(user_id))
+    except ValueError:
+        cache.add(_version_key(user_id), time.time_ns(), timeout=None)
+    cache.set(_modified_key(user_id), time.time(), timeout=None)
+
+
+def bump_user_data_version(user_id: int) -> None:
+    """Invalidate everything cached for a user.
+
+    The version is bumped right away and once more after the transaction commits, so a concurrent request
+    that cached uncommitted-yet data under the intermediate version doesn't keep serving it.
+    """
+    _bump(user_id)
+    transaction.on_commit(partial(_bump, user_id))
+
+
+def _count(stat: str) -> None:
+    key = f"zlatnic:wallets:{stat}"
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def _acount(stat: str) -> None:
+    key = f"zlatnic:wallets:{stat}"
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def wallet_cache_stats() -> dict[str, int]:
+    return {stat: cache.get(f"zlatnic:wallets:{stat}", 0) for stat in CACHE_STATS}
+
+
+def reset_wallet_cache_stats() -> None:
+    cache.delete_many([f"zlatnic:wallets:{stat}" for stat in CACHE_STATS])
+
+
+def cached_wallet_objects(user_id: int) -> tuple[list[Card], list[Cash], list[Cryptocurrency]]:
+    """Return the user's cards, cash and cryptocurrencies, cached until their data version changes."""
+    key = f"zlatnic:user:{user_id}:wallets:{user_data_version(user_id)}"
+    wallets = cache.get(key)
+    if wallets is not None:
+        _count("hits")
+        return wallets
+
+    _count("misses")
+    wallets = (
+        list(Card.objects.filter(user_id=user_id)),
+        list(Cash.objects.filter(user_id=user_id)),
+        list(Cryptocurrency.objects.filter(user_id=user_id)),
+    )
+    cache.set(key, wallets, WALLETS_CACHE_TIMEOUT)
+    return wallets
+
+
+async def _alist(queryset: QuerySet) -> list:
+    return [obj async for obj in queryset]
+
+
+async def acached_wallet_objects(user_id: int) -> tuple[list[Card], list[Cash], list[Cryptocurrency]]:
+    """Async version of `cached_wallet_objects()`, which looks the three wallet types up concurrently."""
+    key = f"zlatnic:user:{user_id}:wallets:{await auser_data_version(user_id)}"
+    wallets = await cache.aget(key)
+    if wallets is not None:
+        await _acount("hits")
+        return wallets
+
+    await _acount("misses")
+    wallets = tuple(
+        await asyncio.gather(
+            _alist(Card.objects.filter(user_id=user_id)),
+            _alist(Cash.objects.filter(user_id=user_id)),
+            _alist(Cryptocurrency.objects.filter(user_id=user_id)),
+        )
+    )
+    await cache.aset(key, wallets, WALLETS_CACHE_TIMEOUT)
+    return wallets  # type: ignore[reportReturnType]
@@ -0,0 +1,44 @@
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponseBase
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+from manager.cache import auser_data_stamp
+
+
+@dataclass(frozen=True, slots=True)
+class PageValidators:
+    etag: str
+    last_modified: int | None
+
+    def not_modified(self, request: HttpRequest) -> HttpResponseBase | None:
+        """Return `304 Not Modified` if the browser has the page already."""
+        response = get_conditional_response(request, etag=self.etag, last_modified=self.last_modified)
+        return response and self.apply(response)
+
+    def apply(self, response: HttpResponseBase) -> HttpResponseBase:
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", self.etag)
+            if self.last_modified:
+                response.headers.setdefault("Last-Modified", http_date(self.last_modified))
+        # The pages are per user and must be revalidated on every visit
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+async def page_validators(request: HttpRequest, *vary: Any) -> PageValidators:
+    """Return the validators of a page that only changes with the user's data and the `vary` values.
+
+    They come from the cached data stamp of the user, so a page the browser has already is answered
+    without running its queries or rendering it.
+    """
+    user_id = (await request.auser()).id  # type: ignore[reportAttributeAccessIssue]
+    version, modified = await auser_data_stamp(user_id)
+    key = repr((user_id, version, settings.RELEASE, *vary)).encode()
+    # Weak, as the pages are the same for the user, not byte for byte (e.g. after compression)
+    etag = f'W/"{hashlib.blake2b(key, digest_size=16).hexdigest()}"'
+    return PageValidators(etag, int(modified) if modified else None)
@@ -0,0 +1,72 @@
+import threading
+import time
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+
+
+class CurrencyInfo(NamedTuple):
+    id: int
+    name: str
+    abbreviation: str
+    sign: str
+    decimal_places: int
+
+    def __str__(self) -> str:
+        return f"{self.name} ({self.abbreviation})"
+
+
+class CurrencyRegistry:
+    """Process-wide, read-only copy of the static `Currency` table.
+
+    It's loaded on first use and reloaded after the table changes, so wallets, forms and the admin can show
+    currency names and signs without joining or querying `Currency`. Only the process that changed the table
+    knows it, so the copy is also reloaded once it's older than `ttl` seconds. The `decimal_places` of a
+    currency in use can't change, see `Currency.clean()`.
+    """
+
+    ttl = 5 * 60
+
+    def __init__(self) -> None:
+        self._currencies: Mapping[int, CurrencyInfo] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return self._currencies is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _load(self) -> Mapping[int, CurrencyInfo]:
+        with self._lock:
+            if not self._fresh():
+                rows = apps.get_model("manager", "Currency").objects.values_list(
+                    "id", "name", "abbreviation", "sign", "decimal_places"
+                )
+                self._currencies = MappingProxyType({row[0]: CurrencyInfo(*row) for row in rows})
+                self._loaded_at = time.monotonic()
+            return self._currencies  # type: ignore[reportReturnType]
+
+    def all(self) -> Mapping[int, CurrencyInfo]:
+        return self._currencies if self._fresh() else self._load()  # type: ignore[reportReturnType]
+
+    def get(self, currency_id: int) -> CurrencyInfo:
+        currency = self.all().get(currency_id)
+        if currency is None:
+            # The currency may have been added by another process since this one loaded the table.
+            self.refresh()
+            currency = self.all()[currency_id]
+        return currency
+
+    async def aget(self, currency_id: int) -> CurrencyInfo:
+        """`get()` for async code, which (re)loads the table in the thread of the sync ORM calls when needed."""
+        if self._fresh() and currency_id in self._currencies:  # type: ignore[reportOperatorIssue]
+            return self._currencies[currency_id]
+        return await sync_to_async(self.get)(currency_id)
+
+    def refresh(self) -> None:
+        self._currencies = None
+
+
+currencies = CurrencyRegistry()
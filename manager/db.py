@@ -0,0 +1,13 @@
+from typing import Any
+
+from django.conf import settings
+from django.db.backends.base.base import BaseDatabaseWrapper
+
+
+def apply_sqlite_pragmas(sender: type, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """`connection_created` receiver setting `settings.SQLITE_PRAGMAS` on every new SQLite connection."""
+    if connection.vendor != "sqlite" or not settings.SQLITE_PRAGMAS:
+        return
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {pragma} = {value}")
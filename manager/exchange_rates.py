@@ -0,0 +1,193 @@
+import csv
+import threading
+import time
+from collections.abc import Iterable, Mapping
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import NamedTuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Count, DecimalField, F, OuterRef, Q, QuerySet, Subquery, Sum, Value, When
+from django.db.models.functions import Lower, Power
+from django.utils.dateparse import parse_date
+
+from manager.currencies import CurrencyInfo, currencies
+from manager.models import Card, Cash, Cryptocurrency, ExchangeRate
+from manager.money import CRYPTO_DECIMAL_PLACES
+
+MONEY = DecimalField(max_digits=40, decimal_places=12)
+
+
+class RateSnapshot(NamedTuple):
+    date: date | None
+    # Base currency value of one unit of an asset, by `Currency` id or lowercased cryptocurrency name
+    rates: Mapping[int | str, Decimal]
+
+
+class NetWorth(NamedTuple):
+    amount: Decimal
+    currency: CurrencyInfo
+    date: date | None
+    # Wallets without a rate in the snapshot, which are left out of the amount
+    unconverted: int
+
+
+class ExchangeRateCache:
+    """Process-wide, read-only copy of the latest daily snapshot of `ExchangeRate`.
+
+    Rates are loaded by the `load_exchange_rates` command, possibly in another process, so the snapshot is also
+    reloaded once it's older than `ttl` seconds.
+    """
+
+    ttl = 60 * 60
+
+    def __init__(self) -> None:
+        self._snapshot: RateSnapshot | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def _fresh(self) -> bool:
+        return self._snapshot is not None and time.monotonic() - self._loaded_at < self.ttl
+
+    def _load(self) -> RateSnapshot:
+        with self._lock:
+            if not self._fresh():
+                latest = ExchangeRate.objects.order_by("-date").values("date")[:1]
+                rows = ExchangeRate.objects.filter(date=Subquery(latest)).values_list(
+                    "date", "currency_id", "crypto_name", "rate"
+                )
+                rows = list(rows)
+                rates = {currency_id or crypto_name: rate for _, currency_id, crypto_name, rate in rows}
+                self._snapshot = RateSnapshot(rows[0][0] if rows else None, MappingProxyType(rates))
+                self._loaded_at = time.monotonic()
+            return self._snapshot  # type: ignore[reportReturnType]
+
+    def snapshot(self) -> RateSnapshot:
+        return self._snapshot if self._fresh() else self._load()  # type: ignore[reportReturnType]
+
+    async def asnapshot(self) -> RateSnapshot:
+        return self._snapshot if self._fresh() else await sync_to_async(self._load)()  # type: ignore[reportReturnType]
+
+    def refresh(self) -> None:
+        self._snapshot = None
+
+
+exchange_rates = ExchangeRateCache()
+
+
+def base_currency() -> CurrencyInfo | None:
+    return next((c for c in currencies.all().values() if c.abbreviation == settings.BASE_CURRENCY), None)
+
+
+def read_rates(lines: Iterable[str]) -> list[ExchangeRate]:
+    """Parse a CSV with `date`, `asset` and `rate` columns, where the asset is a currency abbreviation or a
+    cryptocurrency name and the rate is the value of one unit of it in the base currency.
+    """
+    by_abbreviation = {currency.abbreviation: currency.id for currency in currencies.all().values()}
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not {"date", "asset", "rate"} <= set(reader.fieldnames):
+        raise ValidationError("The exchange rates CSV must have 'date', 'asset' and 'rate' columns.")
+
+    rates = []
+    for row in reader:
+        try:
+            rate_date = parse_date(row["date"].strip())
+        except ValueError:
+            rate_date = None
+        if rate_date is None:
+            raise ValidationError(f"Line {reader.line_num}: '{row['date']}' is not a valid date.")
+        try:
+            rate = Decimal(row["rate"].strip())
+        except InvalidOperation:
+            raise ValidationError(f"Line {reader.line_num}: '{row['rate']}' is not a valid rate.") from None
+        # NaN can't be compared, the infinities don't fit the column
+        if not rate.is_finite() or rate <= 0:
+            raise ValidationError(f"Line {reader.line_num}: the rate must be positive.")
+        asset = row["asset"].strip()
+        if asset in by_abbreviation:
+            rates.append(ExchangeRate(date=rate_date, currency_id=by_abbreviation[asset], rate=rate))
+        else:
+            rates.append(ExchangeRate(date=rate_date, crypto_name=asset.lower(), rate=rate))
+    return rates
+
+
+def load_rates(rates: list[ExchangeRate]) -> int:
+    """Replace the snapshots of the dates in `rates`."""
+    with transaction.atomic():
+        ExchangeRate.objects.filter(date__in={rate.date for rate in rates}).delete()
+        created = len(ExchangeRate.objects.bulk_create(rates))
+    exchange_rates.refresh()
+    return created
+
+
+def _wallet_totals(
+    queryset: QuerySet, rate: Case | Subquery, decimal_places: F | Value
+) -> QuerySet[tuple[Decimal | None, int]]:
+    """Sum the balances of a wallet queryset converted to the base currency; count those without a rate."""
+    return (
+        queryset.order_by()
+        .annotate(rate=rate)
+        .values("user_id")
+        .annotate(
+            total=Sum(F("balance") * F("rate") / Power(Value(Decimal(10)), decimal_places), output_field=MONEY),
+            unconverted=Count("id", filter=Q(rate__isnull=True)),
+        )
+        .values_list("total", "unconverted")
+    )
+
+
+def net_worth_query(user_id: int, snapshot_date: date | None, base: CurrencyInfo) -> QuerySet:
+    """Return one `UNION ALL` query of the converted totals of the user's cards, cash and cryptocurrencies."""
+    rates = ExchangeRate.objects.filter(date=snapshot_date).values("rate")
+    currency_rate = Case(
+        When(currency_id=base.id, then=Value(Decimal(1))),
+        default=Subquery(rates.filter(currency_id=OuterRef("currency_id"))[:1]),
+        output_field=MONEY,
+    )
+    cards = _wallet_totals(Card.objects.filter(user_id=user_id), currency_rate, F("currency__decimal_places"))
+    cash = _wallet_totals(Cash.objects.filter(user_id=user_id), currency_rate, F("currency__decimal_places"))
+    crypto = _wallet_totals(
+        Cryptocurrency.objects.filter(user_id=user_id),
+        Subquery(rates.filter(crypto_name=Lower(OuterRef("name")))[:1], output_field=MONEY),
+        Value(CRYPTO_DECIMAL_PLACES),
+    )
+    return cards.union(cash, crypto, all=True)
+
+
+def _net_worth(rows: Iterable[tuple[Decimal | None, int]], snapshot: RateSnapshot, base: CurrencyInfo) -> NetWorth:
+    amount, unconverted = Decimal(0), 0
+    for total, missing in rows:
+        amount += Decimal(total or 0)
+        unconverted += missing
+    return NetWorth(round(amount, base.decimal_places), base, snapshot.date, unconverted)
+
+
+def net_worth(user_id: int) -> NetWorth | None:
+    """Convert every wallet balance of the user to the base currency in a single SQL query."""
+    base = base_currency()
+    if base is None:
+        return None
+    snapshot = exchange_rates.snapshot()
+    return _net_worth(net_worth_query(user_id, snapshot.date, base), snapshot, base)
+
+
+anet_worth = sync_to_async(net_worth)
+
+
+def wallet_asset(wallet: Card | Cash | Cryptocurrency) -> int | str:
+    """Return the `Currency` id or lowercased cryptocurrency name the wallet holds, as keyed in the rates."""
+    return wallet.name.lower() if isinstance(wallet, Cryptocurrency) else wallet.currency_id  # type: ignore[reportAttributeAccessIssue]
+
+
+def convert(wallet: Card | Cash | Cryptocurrency) -> Decimal | None:
+    """Convert one wallet balance to the base currency with the cached snapshot, without querying the rates."""
+    base = base_currency()
+    if base is None:
+        return None
+    asset = wallet_asset(wallet)
+    rate = Decimal(1) if asset == base.id else exchange_rates.snapshot().rates.get(asset)
+    return None if rate is None else round(wallet.balance_decimal * rate, base.decimal_places)
@@ -1,10 +1,16 @@
-from typing import Any
+from collections.abc import Iterable
+from typing import Any, ClassVar
 
 from django import forms
 from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
 
-from manager.models import Accountancy
-from manager.wallet_operations import change_wallet_balance, wallet_choice
+from manager.currencies import currencies
+from manager.exchange_rates import wallet_asset
+from manager.models import Accountancy, Category, Currency
+from manager.money import to_minor
+from manager.search import search_categories
+from manager.wallet_operations import change_wallet_balance, update_transaction, wallet_choice
 
 
 class AccountancyForm(forms.ModelForm):
@@ -13,27 +19,77 @@ class AccountancyForm(forms.ModelForm):
         fields = ()
 
     def clean(self) -> dict[str, Any] | None:
-        amount = float(self.data["amount"])
-        if amount < 0:
-            raise ValidationError("Amount can't be negative.")
-
-        wallet_type, previous_amount = self.data["wallet_choice"].split(" - ")
+        if self.instance.transfer:
+            raise ValidationError("Transfers can't be changed, delete the transfer and make it again.")
+        wallet_type = self.data["wallet_choice"].split(" - ")[0]
         _, self.wallet_obj = wallet_choice(
             wallet_type, self.instance.card_id or self.instance.cash_id or self.instance.cryptocurrency_id
         )
-        amount = amount - float(previous_amount) if previous_amount else 0
+        self.amount = to_minor(self.data["amount"], self.wallet_obj.decimal_places)
+        if self.amount < 0:
+            raise ValidationError("Amount can't be negative.")
 
-        self.wallet_obj = change_wallet_balance(self.instance.IO, self.wallet_obj, amount)
+        # An early check for the form errors, `update_transaction()` repeats it atomically
+        change_wallet_balance(self.instance.IO, self.wallet_obj, self.amount - self.instance.amount)
 
         return super().clean()
 
     def save(self, *, commit: bool = True) -> Any:  # type: ignore[reportIncompatibleMethodOverride]
         accountancy = super().save(commit=False)
-        self.clean()
         if commit:
-            accountancy.amount = float(self.data["amount"])
-            self.wallet_obj.save()
-        return super().save(commit)
+            update_transaction(accountancy, self.amount)
+        else:
+            accountancy.amount = self.amount
+        return accountancy
+
+
+class CategoryForm(forms.ModelForm):
+    class Meta:
+        model = Category
+        fields = ("IO", "name")
+
+    def clean(self) -> dict[str, Any] | None:
+        cleaned_data = super().clean()
+        if (
+            cleaned_data
+            and Category.objects.for_user(self.instance.user_id)
+            .filter(IO=cleaned_data.get("IO"), name__iexact=cleaned_data.get("name"))
+            .exists()
+        ):
+            raise ValidationError("There's such a category already.")
+        return cleaned_data
+
+
+class CurrencyChoiceField(forms.ModelChoiceField):
+    """`ModelChoiceField` of the currencies that takes its choices and values from the currency registry.
+
+    A plain one queries `Currency` on every render and on every submit.
+    """
+
+    def _get_choices(self) -> list[tuple[Any, str]]:
+        empty = [("", self.empty_label)] if self.empty_label is not None else []
+        return [*empty, *((currency.id, str(currency)) for currency in currencies.all().values())]
+
+    choices = property(_get_choices, forms.ChoiceField.choices.fset)  # type: ignore[reportAttributeAccessIssue]
+
+    def to_python(self, value: Any) -> Currency | None:
+        if value in self.empty_values:
+            return None
+        if isinstance(value, Currency):
+            value = value.pk
+        try:
+            return Currency(**currencies.get(int(value))._asdict())
+        except (KeyError, TypeError, ValueError):
+            raise ValidationError(
+                self.error_messages["invalid_choice"], code="invalid_choice", params={"value": value}
+            ) from None
+
+
+class WalletForm(forms.ModelForm):
+    """Base of the card and cash forms, whose fields are set by their views."""
+
+    class Meta:
+        field_classes: ClassVar[dict[str, type[forms.Field]]] = {"currency": CurrencyChoiceField}
 
 
 class AccountancySearchForm(forms.Form):
@@ -45,3 +101,95 @@ class AccountancySearchForm(forms.Form):
             attrs={"placeholder": "Search by type ...", "class": "small_plate _comforta_bold text_shadow"}
         ),
     )
+
+    def search(self, queryset: QuerySet, user_id: int) -> QuerySet:
+        return search_categories(queryset, self.cleaned_data["IO_type"], user_id)
+
+
+class StatementImportForm(forms.Form):
+    wallet_choice = forms.ChoiceField(
+        label="Wallet", widget=forms.Select(attrs={"class": "small_plate _comforta_bold text_shadow"})
+    )
+    statement = forms.FileField(
+        help_text="CSV with 'datetime', 'amount' and optional 'IO', 'IO_type' columns or an OFX file."
+    )
+
+    def __init__(self, *args: Any, wallets: Iterable[list[Any]] = (), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.fields["wallet_choice"].choices = [(value, str(wallet)) for value, wallet in wallets]  # type: ignore[reportAttributeAccessIssue]
+
+    def clean_statement(self) -> Any:
+        statement = self.cleaned_data["statement"]
+        if not statement.name.lower().endswith((".csv", ".ofx")):
+            raise ValidationError("Only CSV and OFX statements are supported.")
+        return statement
+
+
+class TransferForm(forms.Form):
+    source = forms.ChoiceField(label="From")
+    destination = forms.ChoiceField(label="To")
+    amount = forms.DecimalField(min_value=0, help_text="In the currency of the source wallet.")
+    received = forms.DecimalField(
+        min_value=0, required=False, help_text="In the currency of the destination wallet, if it's another one."
+    )
+
+    def __init__(self, *args: Any, wallets: Iterable[list[Any]] = (), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.wallets = {value: wallet for value, wallet in wallets}
+        choices = [(value, str(wallet)) for value, wallet in self.wallets.items()]
+        for field in ("source", "destination"):
+            self.fields[field].choices = choices  # type: ignore[reportAttributeAccessIssue]
+        for field in self.fields.values():
+            field.widget.attrs.update({"class": "small_plate _comforta_bold text_shadow"})
+
+    def clean(self) -> dict[str, Any] | None:
+        cleaned_data = super().clean()
+        if not cleaned_data or self.errors:
+            return cleaned_data
+        if cleaned_data["source"] == cleaned_data["destination"]:
+            raise ValidationError("Choose two different wallets.")
+        source, destination = self.wallets[cleaned_data["source"]], self.wallets[cleaned_data["destination"]]
+        if cleaned_data["received"] is None and wallet_asset(source) != wallet_asset(destination):
+            self.add_error("received", "The wallets have different currencies, enter the amount received.")
+        return cleaned_data
+
+
+class DateRangeForm(forms.Form):
+    start = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+    end = forms.DateField(required=False, widget=forms.DateInput(attrs={"type": "date"}))
+
+    def clean(self) -> dict[str, Any] | None:
+        cleaned_data = super().clean()
+        if (
+            cleaned_data
+            and cleaned_data.get("start")
+            and cleaned_data.get("end")
+            and cleaned_data["start"] > cleaned_data["end"]
+        ):
+            raise ValidationError("The start date must not be after the end date.")
+        return cleaned_data
+
+
+class BalanceHistoryForm(DateRangeForm):
+    date = forms.DateField(required=False, help_text="Return only the balance at the end of this day.")
+
+    def clean(self) -> dict[str, Any] | None:
+        cleaned_data = super().clean()
+        if cleaned_data and cleaned_data.get("date") and (cleaned_data.get("start") or cleaned_data.get("end")):
+            raise ValidationError("Pass either a date or a date range.")
+        return cleaned_data
+
+
+class AccountancyExportForm(DateRangeForm):
+    format = forms.ChoiceField(choices={"csv": "CSV", "ndjson": "NDJSON"})
+    wallet_choice = forms.ChoiceField(label="Wallet", required=False)
+    field_order = ("format", "start", "end", "wallet_choice")
+
+    def __init__(self, *args: Any, wallets: Iterable[list[Any]] = (), **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.fields["wallet_choice"].choices = [
+            ("", "All wallets"),
+            *((value, str(wallet)) for value, wallet in wallets),
+        ]  # type: ignore[reportAttributeAccessIssue]
+        for field in self.fields.values():
+            field.widget.attrs.update({"class": "small_plate _comforta_bold text_shadow"})
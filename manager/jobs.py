@@ -0,0 +1,167 @@
+import logging
+import multiprocessing
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from datetime import date, timedelta
+from io import TextIOWrapper
+from typing import Any
+from uuid import uuid4
+
+import django
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from manager.models import Job
+from manager.recurring import materialize_recurring
+from manager.statement_import import import_statement, read_csv, read_ofx
+
+logger = logging.getLogger(__name__)
+
+JOB_POLL_INTERVAL = 1.0
+# Running jobs not finished within this time are considered abandoned by a crashed worker and queued again
+JOB_STALE_AFTER = timedelta(hours=1)
+JOB_MAX_ATTEMPTS = 3
+
+JOB_HANDLERS: dict[str, Callable[[Job], Any]] = {}
+
+
+def job_handler(name: str) -> Callable[[Callable[[Job], Any]], Callable[[Job], Any]]:
+    """Register a function run for the jobs named `name`. Its JSON serializable return value is the job result."""
+
+    def register(handler: Callable[[Job], Any]) -> Callable[[Job], Any]:
+        JOB_HANDLERS[name] = handler
+        return handler
+
+    return register
+
+
+def enqueue(name: str, payload: dict[str, Any] | None = None, user_id: int | None = None) -> Job:
+    if name not in JOB_HANDLERS:
+        raise ValueError(f"There's no handler for '{name}' jobs.")
+    return Job.objects.create(name=name, payload=payload or {}, user_id=user_id)
+
+
+def claim_jobs(limit: int) -> list[int]:
+    """Move up to `limit` queued jobs to `RUNNING` and return their ids, oldest first.
+
+    On PostgreSQL the candidates are locked with `SELECT ... FOR UPDATE SKIP LOCKED`, so concurrent workers
+    claim different jobs without waiting for each other. Other databases get one conditional `UPDATE` tagged
+    with a unique token; SQLite runs it under the database write lock, which serializes the claims.
+    """
+    token = uuid4().hex
+    changes = {
+        "status": Job.RUNNING,
+        "claimed_by": token,
+        "attempts": F("attempts") + 1,
+        "started_at": timezone.now(),
+    }
+    queued = Job.objects.filter(status=Job.QUEUED).order_by("id")
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            ids = list(queued.select_for_update(skip_locked=True).values_list("id", flat=True)[:limit])
+            Job.objects.filter(id__in=ids).update(**changes)
+        return ids
+
+    Job.objects.filter(id__in=queued.values("id")[:limit], status=Job.QUEUED).update(**changes)
+    return list(Job.objects.filter(claimed_by=token, status=Job.RUNNING).order_by("id").values_list("id", flat=True))
+
+
+def requeue_stale_jobs(stale_after: timedelta = JOB_STALE_AFTER) -> int:
+    """Queue again the jobs a crashed worker left running, failing the ones out of attempts."""
+    stale = Job.objects.filter(status=Job.RUNNING, started_at__lt=timezone.now() - stale_after)
+    stale.filter(attempts__gte=JOB_MAX_ATTEMPTS).update(
+        status=Job.FAILED, error="The job was abandoned by its workers.", finished_at=timezone.now()
+    )
+    return stale.update(status=Job.QUEUED, claimed_by="")
+
+
+def run_job(job_id: int) -> str:
+    """Run a claimed job and store its result or error. Returns the final status."""
+    job = Job.objects.get(id=job_id)
+    try:
+        result = JOB_HANDLERS[job.name](job)
+    except ValidationError as error:
+        job.status, job.error = Job.FAILED, "; ".join(error.messages)
+    except Exception as error:  # noqa: BLE001
+        logger.exception("Job %s (%s) failed", job.id, job.name)  # type: ignore[reportAttributeAccessIssue]
+        job.status, job.error = Job.FAILED, "".join(traceback.format_exception_only(error)).strip()
+    else:
+        job.status, job.result = Job.SUCCEEDED, result
+    job.finished_at = timezone.now()
+    # Don't overwrite a job requeued or failed by `requeue_stale_jobs()` meanwhile
+    Job.objects.filter(id=job_id, status=Job.RUNNING, claimed_by=job.claimed_by).update(
+        status=job.status, result=job.result, error=job.error, finished_at=job.finished_at
+    )
+    return job.status
+
+
+def _work(job_id: int) -> str:
+    try:
+        return run_job(job_id)
+    finally:
+        # Pool threads and processes must not keep their connections open between jobs
+        connections.close_all()
+
+
+def job_executor(workers: int, processes: bool = False) -> Executor:
+    if processes:
+        # Forking would share the parent's database connections, so start fresh interpreters instead
+        return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"), initializer=django.setup)
+    return ThreadPoolExecutor(workers, thread_name_prefix="job")
+
+
+def run_worker(
+    workers: int = 1,
+    processes: bool = False,
+    poll_interval: float = JOB_POLL_INTERVAL,
+    once: bool = False,
+    stale_after: timedelta = JOB_STALE_AFTER,
+) -> int:
+    """Claim and run jobs with a pool of `workers` threads or processes. Returns the number of jobs run.
+
+    New jobs are claimed as soon as a pool slot is free. With `once` the worker exits when the queue is drained.
+    """
+    ran = 0
+    running: set[Future[str]] = set()
+    with job_executor(workers, processes) as executor:
+        while True:
+            if not running:
+                requeue_stale_jobs(stale_after)
+            free_slots = workers - len(running)
+            claimed = claim_jobs(free_slots) if free_slots else []
+            running.update(executor.submit(_work, job_id) for job_id in claimed)
+            if not running:
+                if once:
+                    return ran
+                time.sleep(poll_interval)
+                continue
+            done, running = wait(running, timeout=poll_interval, return_when=FIRST_COMPLETED)
+            ran += len(done)
+
+
+@job_handler("import_statement")
+def import_statement_job(job: Job) -> dict[str, int]:
+    """Import a statement file saved to the default storage, deleting it afterwards."""
+    path = job.payload["path"]
+    reader = read_ofx if path.lower().endswith(".ofx") else read_csv
+    try:
+        with default_storage.open(path, "rb") as statement:
+            imported = import_statement(
+                reader(TextIOWrapper(statement, encoding="utf-8-sig", newline="")),
+                job.payload["wallet"],
+                job.payload["wallet_id"],
+            )
+    finally:
+        default_storage.delete(path)
+    return {"imported": imported}
+
+
+@job_handler("materialize_recurring")
+def materialize_recurring_job(job: Job) -> dict[str, int]:
+    today = job.payload.get("date")
+    return materialize_recurring(date.fromisoformat(today) if today else None)._asdict()
@@ -0,0 +1,80 @@
+import json
+import platform
+from pathlib import Path
+from typing import Any
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection, transaction
+from django.test import Client, override_settings
+from django.utils import timezone
+
+from manager.benchmark import benchmark_scenarios, compare_fragment_cache, run_scenario
+from manager.cache import cached_wallet_objects
+from manager.management.commands.seed_data import BENCHMARK_USERNAME_PREFIX
+from manager.models import Accountancy
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure latency percentiles and SQL query counts of the main views as JSON. "
+        "Seed the data with the `seed_data` command first. Changes made by POST requests are rolled back."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--user", help="Username to benchmark as. Defaults to the first seeded user.")
+        parser.add_argument("--iterations", type=int, default=50)
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--output", type=Path, help="Write the results to this file instead of stdout.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["iterations"] < 2:
+            raise CommandError("Run at least 2 iterations to compute percentiles.")
+        users = get_user_model().objects.order_by("id")
+        if options["user"]:
+            user = users.filter(username=options["user"]).first()
+        else:
+            user = users.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).first()
+        if user is None:
+            raise CommandError("There is no user to benchmark as, run the `seed_data` command or pass --user.")
+
+        client = Client()
+        client.force_login(user)
+        # The debug toolbar and other DEBUG-only overhead would dominate the measurements
+        with (
+            override_settings(DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]),
+            transaction.atomic(),
+        ):
+            try:
+                scenarios = benchmark_scenarios(user)
+                results = {
+                    scenario.name: run_scenario(client, scenario, options["iterations"], options["warmup"])
+                    for scenario in scenarios
+                }
+                fragment_cache = compare_fragment_cache(client, scenarios, options["iterations"], options["warmup"])
+            except ValueError as error:
+                raise CommandError(error) from error
+            finally:
+                transaction.set_rollback(True)
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "user": user.username,
+            "dataset": {
+                "users": users.count(),
+                "wallets": sum(len(wallets) for wallets in cached_wallet_objects(user.pk)),
+                "accountancy": Accountancy.objects.count(),
+            },
+            "scenarios": results,
+            "fragment_cache": fragment_cache,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            options["output"].write_text(output + "\n")
+        else:
+            self.stdout.write(output)
@@ -0,0 +1,36 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from manager.statement_import import IMPORT_BATCH_SIZE, import_statement, read_csv, read_ofx
+from manager.wallet_operations import WALLET_MODELS
+
+
+class Command(BaseCommand):
+    help = "Import a CSV or OFX bank statement into the accountancy of a wallet."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path)
+        parser.add_argument("--wallet", choices=tuple(WALLET_MODELS), required=True)
+        parser.add_argument("--wallet-id", type=int, required=True)
+        parser.add_argument("--format", choices=("csv", "ofx"), help="Defaults to the file extension.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        path: Path = options["path"]
+        statement_format = options["format"] or path.suffix.lstrip(".").lower()
+        if statement_format not in ("csv", "ofx"):
+            raise CommandError("Can't guess the statement format, pass --format.")
+
+        reader = read_csv if statement_format == "csv" else read_ofx
+        try:
+            with path.open(encoding="utf-8-sig", newline="") as statement:
+                imported = import_statement(
+                    reader(statement), options["wallet"], options["wallet_id"], options["batch_size"]
+                )
+        except ValidationError as error:
+            raise CommandError("; ".join(error.messages)) from error
+
+        self.stdout.write(self.style.SUCCESS(f"Imported {imported} records."))
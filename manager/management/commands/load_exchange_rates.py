@@ -0,0 +1,27 @@
+from pathlib import Path
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from manager.exchange_rates import load_rates, read_rates
+
+
+class Command(BaseCommand):
+    help = (
+        "Load daily exchange rate snapshots from a CSV file with 'date', 'asset' and 'rate' columns. "
+        "The asset is a currency abbreviation or a cryptocurrency name, the rate is the value of one unit of it in "
+        "the BASE_CURRENCY. Snapshots of the dates in the file are replaced."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("path", type=Path)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        try:
+            with options["path"].open(newline="") as file:
+                loaded = load_rates(read_rates(file))
+        except (OSError, ValidationError) as error:
+            raise CommandError(error) from error
+
+        self.stdout.write(self.style.SUCCESS(f"Loaded {loaded} exchange rates."))
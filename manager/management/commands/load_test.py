@@ -0,0 +1,75 @@
+import json
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import connection
+from django.test import Client
+from django.utils import timezone
+
+from manager.benchmark import benchmark_scenarios, run_load
+from manager.management.commands.seed_data import BENCHMARK_USERNAME_PREFIX
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the requests per second a running server sustains on the main pages, as JSON. "
+        "Start the server with the `DATABASE_PROFILE` to compare and the same database, seeded by `seed_data`."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--url", default="http://127.0.0.1:8000", help="Base URL of the server.")
+        parser.add_argument("--user", help="Username to log in as. Defaults to the first seeded user.")
+        parser.add_argument("--concurrency", type=int, default=8, help="Number of concurrent clients.")
+        parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run for.")
+        parser.add_argument(
+            "--writes",
+            action="store_true",
+            help="Include the POST requests. Unlike in the `benchmark` command, their changes are kept.",
+        )
+        parser.add_argument("--output", type=Path, help="Write the results to this file instead of stdout.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        users = get_user_model().objects.order_by("id")
+        if options["user"]:
+            user = users.filter(username=options["user"]).first()
+        else:
+            user = users.filter(username__startswith=BENCHMARK_USERNAME_PREFIX).first()
+        if user is None:
+            raise CommandError("There is no user to load test as, run the `seed_data` command or pass --user.")
+
+        try:
+            scenarios = benchmark_scenarios(user)
+        except ValueError as error:
+            raise CommandError(error) from error
+        if not options["writes"]:
+            scenarios = [scenario for scenario in scenarios if scenario.method == "get"]
+        client = Client()
+        client.force_login(user)
+        session_cookie = client.cookies[settings.SESSION_COOKIE_NAME]
+
+        results = run_load(
+            options["url"].rstrip("/"),
+            scenarios,
+            f"{session_cookie.key}={session_cookie.value}",
+            options["concurrency"],
+            options["duration"],
+        )
+        if not results["requests"]:
+            raise CommandError(f"No request to {options['url']} succeeded, is the server running?")
+
+        report = {
+            "created_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "profile": settings.DATABASE_PROFILE,
+            "user": user.username,
+            "scenarios": [scenario.name for scenario in scenarios],
+            **results,
+        }
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            options["output"].write_text(output + "\n")
+        else:
+            self.stdout.write(output)
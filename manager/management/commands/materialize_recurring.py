@@ -0,0 +1,33 @@
+from datetime import date
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from manager.recurring import RECURRING_BATCH_SIZE, materialize_recurring
+
+
+class Command(BaseCommand):
+    help = (
+        "Post the due occurrences of the recurring transactions of all users. Safe to re-run, e.g. from cron; "
+        "occurrences missed while it wasn't running are posted too."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--date", type=date.fromisoformat, default=None, help="Post occurrences due by this date, today by default."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECURRING_BATCH_SIZE,
+            help="Number of recurring transactions materialized per database transaction.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result = materialize_recurring(options["date"], options["batch_size"])
+
+        self.stdout.write(self.style.SUCCESS(f"Posted {result.created} recurring transactions."))
+        if result.skipped:
+            self.stdout.write(
+                self.style.WARNING(f"Skipped {result.skipped} recurring transactions the wallets can't afford.")
+            )
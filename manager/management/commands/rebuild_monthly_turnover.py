@@ -0,0 +1,36 @@
+from itertools import batched
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from django.db.models import Count, DateField, Sum
+from django.db.models.functions import TruncMonth
+
+from manager.balance_history import rebuild_balance_checkpoints
+from manager.models import Accountancy, MonthlyTurnover
+
+
+class Command(BaseCommand):
+    help = "Rebuild the monthly turnover rollup and the balance checkpoints from the accountancy records."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--batch-size", type=int, default=1000, help="Number of rollup rows inserted per query.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        rows = (
+            Accountancy.objects.annotate(month=TruncMonth("datetime", output_field=DateField()))
+            .values("card_id", "cash_id", "cryptocurrency_id", "IO", "month")
+            .annotate(amount_sum=Sum("amount"), transactions=Count("id"))
+            .order_by()
+        )
+
+        created = 0
+        with transaction.atomic():
+            MonthlyTurnover.objects.all().delete()
+            for batch in batched(rows.iterator(chunk_size=options["batch_size"]), options["batch_size"], strict=False):
+                created += len(MonthlyTurnover.objects.bulk_create(MonthlyTurnover(**row) for row in batch))
+            checkpoints = rebuild_balance_checkpoints(options["batch_size"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt {created} monthly turnover rows and {checkpoints} balance checkpoints.")
+        )
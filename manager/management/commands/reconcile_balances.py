@@ -0,0 +1,36 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from manager.reconciliation import RECONCILE_BATCH_SIZE, reconcile_balances
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute every wallet balance from its opening balance and accountancy records and report the drifted ones."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--fix", action="store_true", help="Overwrite the drifted balances with the expected ones.")
+        parser.add_argument("--workers", type=int, default=1, help="Number of user ranges reconciled concurrently.")
+        parser.add_argument("--processes", action="store_true", help="Use worker processes instead of threads.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RECONCILE_BATCH_SIZE,
+            help="Number of users whose wallets are aggregated by one query.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        result = reconcile_balances(options["fix"], options["workers"], options["processes"], options["batch_size"])
+
+        for drift in result.drifts:
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{drift.wallet_type} {drift.wallet_id} of user {drift.user_id}: "
+                    f"balance {drift.balance}, expected {drift.expected}"
+                )
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {result.checked} wallets, {len(result.drifts)} drifted, {result.fixed} fixed.")
+        )
@@ -0,0 +1,40 @@
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from manager.jobs import JOB_POLL_INTERVAL, JOB_STALE_AFTER, run_worker
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the queued background jobs (large statement imports, etc.). Start as many workers as needed; "
+        "they claim different jobs from the database, no message broker is involved."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--workers", type=int, default=1, help="Number of jobs run concurrently.")
+        parser.add_argument(
+            "--processes", action="store_true", help="Run the jobs in a process pool rather than in threads."
+        )
+        parser.add_argument(
+            "--poll-interval", type=float, default=JOB_POLL_INTERVAL, help="Seconds between checks for new jobs."
+        )
+        parser.add_argument(
+            "--stale-after",
+            type=int,
+            default=int(JOB_STALE_AFTER.total_seconds()),
+            help="Seconds after which running jobs of a crashed worker are queued again.",
+        )
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is drained.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        ran = run_worker(
+            options["workers"],
+            options["processes"],
+            options["poll_interval"],
+            options["once"],
+            timedelta(seconds=options["stale_after"]),
+        )
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {ran} jobs."))
@@ -0,0 +1,134 @@
+import random
+from collections.abc import Iterator
+from datetime import timedelta
+from itertools import batched
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.db import transaction
+from django.utils import timezone
+from faker import Faker
+
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, Currency
+
+BENCHMARK_USERNAME_PREFIX = "bench_"
+
+
+class Command(BaseCommand):
+    help = "Seed synthetic users, wallets and accountancy records (e.g. for the `benchmark` command)."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--users", type=int, default=10)
+        parser.add_argument("--wallets", type=int, default=2, help="Cards, cash and cryptocurrencies per user each.")
+        parser.add_argument("--records", type=int, default=1000, help="Accountancy records per wallet.")
+        parser.add_argument("--years", type=int, default=3, help="Spread the records over this many past years.")
+        parser.add_argument("--seed", type=int, default=0, help="Seed of the generated data.")
+        parser.add_argument("--password", default="benchmark", help="Password of the created users.")
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        currency_ids = list(Currency.objects.order_by("id").values_list("id", flat=True))
+        if not currency_ids:
+            raise CommandError("There are no currencies, load them with `manage.py loaddata zlatnic_db_data.json`.")
+
+        categories = {
+            io: list(Category.objects.filter(user__isnull=True, IO=io).values_list("id", flat=True))
+            for io in Accountancy.IN_OUT_COME
+        }
+        if not all(categories.values()):
+            raise CommandError("There are no default income and outcome categories, run `manage.py migrate`.")
+
+        fake = Faker()
+        fake.seed_instance(options["seed"])
+        rng = random.Random(options["seed"])
+        password = make_password(options["password"])
+        wallets_count = options["wallets"]
+
+        with transaction.atomic():
+            users = get_user_model().objects.bulk_create(
+                get_user_model()(
+                    username=f"{BENCHMARK_USERNAME_PREFIX}{options['seed']}_{index}_{fake.user_name()}"[:150],
+                    first_name=fake.first_name(),
+                    last_name=fake.last_name(),
+                    email=fake.email(),
+                    password=password,
+                )
+                for index in range(options["users"])
+            )
+            wallets: list[Card | Cash | Cryptocurrency] = []
+            for user in users:
+                wallets += Card.objects.bulk_create(
+                    Card(
+                        user=user,
+                        bank_name=fake.company()[:50],
+                        type=f"{fake.credit_card_provider()} {index + 1}"[:50],
+                        currency_id=rng.choice(currency_ids),
+                    )
+                    for index in range(wallets_count)
+                )
+                wallets += Cash.objects.bulk_create(
+                    Cash(user=user, currency_id=currency_id)
+                    for currency_id in rng.sample(currency_ids, min(wallets_count, len(currency_ids)))
+                )
+                wallets += Cryptocurrency.objects.bulk_create(
+                    Cryptocurrency(user=user, name=f"{fake.cryptocurrency_name()} {index + 1}"[:50])
+                    for index in range(wallets_count)
+                )
+
+            records = 0
+            for batch in batched(
+                self.accountancy(wallets, categories, rng, options), options["batch_size"], strict=False
+            ):
+                records += len(Accountancy.objects.bulk_create(batch))
+            for model in (Card, Cash, Cryptocurrency):
+                model.objects.bulk_update(
+                    [wallet for wallet in wallets if isinstance(wallet, model)], ["balance"], options["batch_size"]
+                )
+            # The records are bulk inserted, bypassing `Accountancy.save()`, which maintains the rollup
+            call_command("rebuild_monthly_turnover", stdout=self.stdout)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Seeded {len(users)} users, {len(wallets)} wallets and {records} accountancy records.")
+        )
+
+    @staticmethod
+    def accountancy(
+        wallets: list[Card | Cash | Cryptocurrency],
+        categories: dict[str, list[int]],
+        rng: random.Random,
+        options: dict[str, Any],
+    ) -> Iterator[Accountancy]:
+        """Yield the records of every wallet, then set the wallet balance to their net sum."""
+        now = timezone.now()
+        span = timedelta(days=365 * options["years"]).total_seconds()
+        for wallet in wallets:
+            # Amounts are in minor units; cryptocurrency ones are kept in coins rather than in fiat money
+            scale = 10**wallet.decimal_places // (10_000 if isinstance(wallet, Cryptocurrency) else 1)
+            wallet_lookup = {wallet._meta.model_name: wallet}
+            net = 0
+            for _ in range(options["records"]):
+                moment = now - timedelta(seconds=rng.uniform(0, span))
+                if rng.random() < 0.2:
+                    io, amount = "I", round(rng.uniform(500, 5000) * scale)
+                    net += amount
+                else:
+                    io, amount = "O", round(rng.uniform(1, 300) * scale)
+                    net -= amount
+                yield Accountancy(
+                    **wallet_lookup, IO=io, category_id=rng.choice(categories[io]), amount=amount, datetime=moment
+                )
+
+            if net < 0:
+                # Top the wallet up at the start of the period so its balance never goes negative
+                yield Accountancy(
+                    **wallet_lookup,
+                    IO="I",
+                    category_id=categories["I"][0],
+                    amount=-net,
+                    datetime=now - timedelta(seconds=span),
+                )
+                net = 0
+            wallet.balance = net
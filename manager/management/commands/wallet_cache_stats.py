@@ -0,0 +1,21 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from manager.cache import reset_wallet_cache_stats, wallet_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Show the hit rate of the per-user wallet cache."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument("--reset", action="store_true", help="Reset the counters after printing them.")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        stats = wallet_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0
+        self.stdout.write(f"Hits: {stats['hits']}, misses: {stats['misses']}, hit rate: {hit_rate:.1%}")
+
+        if options["reset"]:
+            reset_wallet_cache_stats()
@@ -0,0 +1,143 @@
+import logging
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.base.base import BaseDatabaseWrapper
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.template.backends.django import DjangoTemplates as BaseDjangoTemplates
+from django.template.backends.django import Template
+from django.test.utils import CaptureQueriesContext
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGETS = {"queries": 20, "db_ms": 200, "total_ms": 500}
+
+
+@dataclass(slots=True)
+class RequestMetrics:
+    queries: int = 0
+    db_time: float = 0
+    template_time: float = 0
+    started: float = field(default_factory=time.perf_counter)
+
+
+# Set for the duration of a request by `RequestMetricsMiddleware`; copied into the threads of `sync_to_async()`
+_metrics: ContextVar[RequestMetrics | None] = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute: Callable, sql: str, params: Any, many: bool, context: dict[str, Any]) -> Any:
+    metrics = _metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.db_time += time.perf_counter() - start
+        metrics.queries += 1
+
+
+def install_query_recorder(sender: type, connection: BaseDatabaseWrapper, **kwargs: Any) -> None:
+    """`connection_created` receiver, so the per-thread connections used by `sync_to_async()` are recorded too."""
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class TimedTemplate(Template):
+    def render(self, context: dict[str, Any] | None = None, request: HttpRequest | None = None) -> str:
+        metrics = _metrics.get()
+        if metrics is None:
+            return super().render(context, request)
+
+        start = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            metrics.template_time += time.perf_counter() - start
+
+
+class DjangoTemplates(BaseDjangoTemplates):
+    """Django template backend that adds the render time of the top-level templates to the request metrics."""
+
+    def from_string(self, template_code: str) -> TimedTemplate:
+        return TimedTemplate(super().from_string(template_code).template, self)
+
+    def get_template(self, template_name: str) -> TimedTemplate:
+        return TimedTemplate(super().get_template(template_name).template, self)
+
+
+class RequestMetricsMiddleware:
+    """Report the SQL queries, DB, template and view time of a request in a `Server-Timing` header.
+
+    Requests over `REQUEST_METRICS_BUDGETS` are logged as warnings. Template time is only measured with the
+    `manager.metrics.DjangoTemplates` backend.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable) -> None:
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.report(request, response, metrics)
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponseBase:
+        metrics = RequestMetrics()
+        token = _metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _metrics.reset(token)
+        return self.report(request, response, metrics)
+
+    def report(self, request: HttpRequest, response: HttpResponseBase, metrics: RequestMetrics) -> HttpResponseBase:
+        total_ms = (time.perf_counter() - metrics.started) * 1000
+        db_ms = metrics.db_time * 1000
+        budgets = {**DEFAULT_BUDGETS, **getattr(settings, "REQUEST_METRICS_BUDGETS", {})}
+        response.headers["Server-Timing"] = (
+            f'db;dur={db_ms:.1f};desc="{metrics.queries} queries", '
+            f"template;dur={metrics.template_time * 1000:.1f}, "
+            f"view;dur={total_ms:.1f}"
+        )
+
+        if metrics.queries > budgets["queries"] or db_ms > budgets["db_ms"] or total_ms > budgets["total_ms"]:
+            logger.warning(
+                "%s %s is over budget: %d queries, %.1f ms in the database, %.1f ms in total",
+                request.method,
+                request.path,
+                metrics.queries,
+                db_ms,
+                total_ms,
+            )
+        return response
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, using: str = "default") -> Iterator[CaptureQueriesContext]:
+    """Fail if the block runs more than `max_queries` SQL queries, like a ceiling of `assertNumQueries()`."""
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    if len(captured) > max_queries:
+        queries = "\n".join(f"{index}. {query['sql']}" for index, query in enumerate(captured.captured_queries, 1))
+        raise AssertionError(f"{len(captured)} queries executed, the budget is {max_queries}:\n{queries}")
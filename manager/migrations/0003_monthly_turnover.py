@@ -0,0 +1,86 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0002_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonthlyTurnover",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "IO",
+                    models.CharField(
+                        choices=[("I", "Income"), ("O", "Outcome")], max_length=1
+                    ),
+                ),
+                ("month", models.DateField()),
+                ("amount_sum", models.FloatField(default=0.0)),
+                ("transactions", models.IntegerField(default=0)),
+                (
+                    "card",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_turnover",
+                        to="manager.card",
+                    ),
+                ),
+                (
+                    "cash",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_turnover",
+                        to="manager.cash",
+                    ),
+                ),
+                (
+                    "cryptocurrency",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="monthly_turnover",
+                        to="manager.cryptocurrency",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("card__isnull", False)),
+                        fields=("card", "month", "IO"),
+                        name="unique_card_monthly_turnover",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("cash__isnull", False)),
+                        fields=("cash", "month", "IO"),
+                        name="unique_cash_monthly_turnover",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("cryptocurrency__isnull", False)),
+                        fields=("cryptocurrency", "month", "IO"),
+                        name="unique_cryptocurrency_monthly_turnover",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0003_monthly_turnover"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="accountancy",
+            name="card",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="accountancy",
+                to="manager.card",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="accountancy",
+            name="cash",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="accountancy",
+                to="manager.cash",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="accountancy",
+            name="cryptocurrency",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="accountancy",
+                to="manager.cryptocurrency",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountancy",
+            index=models.Index(
+                fields=["card", "datetime", "IO"], name="acc_card_datetime_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountancy",
+            index=models.Index(
+                fields=["cash", "datetime", "IO"], name="acc_cash_datetime_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountancy",
+            index=models.Index(
+                fields=["cryptocurrency", "datetime", "IO"],
+                name="acc_crypto_datetime_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:27
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0004_accountancy_wallet_datetime_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="accountancy",
+            name="datetime",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+    ]
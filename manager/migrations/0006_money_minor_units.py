@@ -0,0 +1,129 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:46
+
+from django.db import migrations, models
+from django.db.models import F
+from django.db.models.functions import Cast, Round
+
+# ISO 4217 minor units of the currencies in `zlatnic_db_data.json` that don't have 2 decimal places
+CURRENCY_DECIMAL_PLACES = {
+    "CLP": 0,
+    "ISK": 0,
+    "JPY": 0,
+    "KRW": 0,
+    "PYG": 0,
+    "VND": 0,
+    "OMR": 3,
+}
+CRYPTO_DECIMAL_PLACES = 8
+
+# Wide enough to hold any former balance or amount scaled to its minor units
+SCALED = models.DecimalField(max_digits=30, decimal_places=8, default=0)
+
+
+def money_querysets(apps, decimal_places):
+    """Yield `(queryset, field)` pairs of the money columns of the wallets with the given decimal places."""
+    Accountancy = apps.get_model("manager", "Accountancy")
+    MonthlyTurnover = apps.get_model("manager", "MonthlyTurnover")
+    for wallet in ("card", "cash"):
+        wallets = {f"{wallet}__currency__decimal_places": decimal_places}
+        yield (
+            apps.get_model("manager", wallet).objects.filter(
+                currency__decimal_places=decimal_places
+            ),
+            "balance",
+        )
+        yield Accountancy.objects.filter(**wallets), "amount"
+        yield MonthlyTurnover.objects.filter(**wallets), "amount_sum"
+    if decimal_places == CRYPTO_DECIMAL_PLACES:
+        yield apps.get_model("manager", "Cryptocurrency").objects.all(), "balance"
+        yield Accountancy.objects.filter(cryptocurrency__isnull=False), "amount"
+        yield MonthlyTurnover.objects.filter(cryptocurrency__isnull=False), "amount_sum"
+
+
+def set_currency_decimal_places(apps, schema_editor):
+    Currency = apps.get_model("manager", "Currency")
+    for abbreviation, decimal_places in CURRENCY_DECIMAL_PLACES.items():
+        Currency.objects.filter(abbreviation=abbreviation).update(
+            decimal_places=decimal_places
+        )
+
+
+def to_minor_units(apps, schema_editor):
+    Currency = apps.get_model("manager", "Currency")
+    for decimal_places in {
+        *Currency.objects.values_list("decimal_places", flat=True),
+        CRYPTO_DECIMAL_PLACES,
+    }:
+        for queryset, field in money_querysets(apps, decimal_places):
+            queryset.update(**{field: Round(F(field) * 10**decimal_places)})
+
+
+def from_minor_units(apps, schema_editor):
+    Currency = apps.get_model("manager", "Currency")
+    for decimal_places in {
+        *Currency.objects.values_list("decimal_places", flat=True),
+        CRYPTO_DECIMAL_PLACES,
+    }:
+        for queryset, field in money_querysets(apps, decimal_places):
+            queryset.update(
+                **{field: Cast(field, models.FloatField()) / 10**decimal_places}
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0005_accountancy_datetime_default"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="currency",
+            name="decimal_places",
+            field=models.PositiveSmallIntegerField(default=2),
+        ),
+        migrations.RunPython(set_currency_decimal_places, migrations.RunPython.noop),
+        # Floats are first widened to decimals, so they can be scaled to whole minor units in place
+        migrations.AlterField(model_name="accountancy", name="amount", field=SCALED),
+        migrations.AlterField(model_name="card", name="balance", field=SCALED),
+        migrations.AlterField(model_name="cash", name="balance", field=SCALED),
+        migrations.AlterField(
+            model_name="cryptocurrency", name="balance", field=SCALED
+        ),
+        migrations.AlterField(
+            model_name="monthlyturnover", name="amount_sum", field=SCALED
+        ),
+        migrations.RunPython(to_minor_units, from_minor_units),
+        migrations.AlterField(
+            model_name="accountancy",
+            name="amount",
+            field=models.BigIntegerField(
+                help_text="In minor units of the wallet currency."
+            ),
+        ),
+        migrations.AlterField(
+            model_name="card",
+            name="balance",
+            field=models.BigIntegerField(
+                default=0, help_text="In minor units of the currency, e.g. cents."
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cash",
+            name="balance",
+            field=models.BigIntegerField(
+                default=0, help_text="In minor units of the currency, e.g. cents."
+            ),
+        ),
+        migrations.AlterField(
+            model_name="cryptocurrency",
+            name="balance",
+            field=models.BigIntegerField(default=0, help_text="In 1e-8 coin units."),
+        ),
+        migrations.AlterField(
+            model_name="monthlyturnover",
+            name="amount_sum",
+            field=models.BigIntegerField(
+                default=0, help_text="In minor units of the wallet currency."
+            ),
+        ),
+    ]
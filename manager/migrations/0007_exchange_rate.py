@@ -0,0 +1,77 @@
+# Generated by Django 5.2.2 on 2026-10-18 13:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0006_money_minor_units"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "crypto_name",
+                    models.CharField(
+                        blank=True,
+                        help_text="Lowercased `Cryptocurrency.name`.",
+                        max_length=50,
+                    ),
+                ),
+                ("rate", models.DecimalField(decimal_places=12, max_digits=30)),
+                (
+                    "currency",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exchange_rates",
+                        to="manager.currency",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-date"],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(("currency__isnull", False), ("crypto_name", "")),
+                            models.Q(
+                                ("currency__isnull", True),
+                                models.Q(("crypto_name", ""), _negated=True),
+                            ),
+                            _connector="OR",
+                        ),
+                        name="exchange_rate_one_asset",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("rate__gt", 0)),
+                        name="positive_exchange_rate",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("currency__isnull", False)),
+                        fields=("date", "currency"),
+                        name="unique_currency_rate_date",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("currency__isnull", True)),
+                        fields=("date", "crypto_name"),
+                        name="unique_crypto_rate_date",
+                    ),
+                ],
+            },
+        ),
+    ]
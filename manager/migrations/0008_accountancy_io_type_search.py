@@ -0,0 +1,64 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:20
+
+from django.db import migrations
+
+TABLE = "manager_accountancy"
+FTS_TABLE = f"{TABLE}_fts"
+TRIGRAM_INDEX = "acc_io_type_trgm_idx"
+
+# An external content FTS5 table: it only stores the index, the triggers keep it in sync with the records
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, "IO_type") VALUES (new.id, new."IO_type");
+        END""",
+    f"{FTS_TABLE}_delete": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, "IO_type") VALUES ('delete', old.id, old."IO_type");
+        END""",
+    f"{FTS_TABLE}_update": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF "IO_type" ON {TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, "IO_type") VALUES ('delete', old.id, old."IO_type");
+            INSERT INTO {FTS_TABLE}(rowid, "IO_type") VALUES (new.id, new."IO_type");
+        END""",
+}
+
+
+def install_search_index(apps, schema_editor):
+    """Create the `IO_type` search index: a trigram GIN index on PostgreSQL, an FTS5 table on SQLite."""
+    execute = schema_editor.execute
+    if schema_editor.connection.vendor == "postgresql":
+        execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Matches the `UPPER("IO_type"::text) LIKE UPPER(...)` of `icontains`
+        execute(
+            f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {TABLE} "
+            f'USING gin (UPPER("IO_type"::text) gin_trgm_ops)'
+        )
+    elif schema_editor.connection.vendor == "sqlite":
+        execute(
+            f'CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("IO_type", '
+            f"content='{TABLE}', content_rowid='id', tokenize='trigram')"
+        )
+        for statement in SQLITE_TRIGGERS.values():
+            execute(statement)
+        execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(apps, schema_editor):
+    execute = schema_editor.execute
+    if schema_editor.connection.vendor == "postgresql":
+        execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+    elif schema_editor.connection.vendor == "sqlite":
+        for trigger in SQLITE_TRIGGERS:
+            execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0007_exchange_rate"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
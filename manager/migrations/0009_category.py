@@ -0,0 +1,172 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:45
+
+from importlib import import_module
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Q, Subquery
+
+search_index = import_module("manager.migrations.0008_accountancy_io_type_search")
+
+# The categories that used to be hard-coded in `index.html`, in the order of the buttons. This migration is
+# their only seed, the `zlatnic_db_data.json` fixture loaded on every deploy has just the currencies.
+DEFAULT_CATEGORIES = (
+    ("O", "Home", "home"),
+    ("O", "Utilities", "utilities"),
+    ("O", "Food", "food"),
+    ("O", "Pets", "pets"),
+    ("O", "Health", "health"),
+    ("O", "Transport", "transport"),
+    ("O", "Clothes", "clothes"),
+    ("O", "Household goods", "household_goods"),
+    ("O", "Study", "study"),
+    ("O", "Communication", "communication"),
+    ("O", "Leisure", "leisure"),
+    ("O", "Charity", "charity"),
+    ("O", "Savings", "savings"),
+    ("O", "Other", "other"),
+    ("I", "Salary", "other"),
+    ("I", "One-time", "other"),
+    ("I", "Assets", "other"),
+    ("I", "Passives", "other"),
+    ("I", "Other", "other"),
+)
+
+
+def categorize(apps, schema_editor):
+    """Create the default categories and point every record at the one named like its `IO_type`.
+
+    Types that aren't among the defaults become categories of the wallet owner.
+    """
+    Category = apps.get_model("manager", "Category")
+    Accountancy = apps.get_model("manager", "Accountancy")
+    defaults = {
+        (io, name): Category.objects.create(IO=io, name=name, icon=icon).id
+        for io, name, icon in DEFAULT_CATEGORIES
+    }
+
+    for wallet in ("card", "cash", "cryptocurrency"):
+        records = Accountancy.objects.filter(**{f"{wallet}__isnull": False})
+        for user_id, io, io_type in (
+            records.values_list(f"{wallet}__user_id", "IO", "IO_type")
+            .distinct()
+            .order_by()
+            .iterator()
+        ):
+            category_id = defaults.get((io, io_type))
+            if category_id is None:
+                category_id = Category.objects.get_or_create(
+                    user_id=user_id, IO=io, name=io_type
+                )[0].id
+            records.filter(
+                **{f"{wallet}__user_id": user_id}, IO=io, IO_type=io_type
+            ).update(category_id=category_id)
+
+
+def uncategorize(apps, schema_editor):
+    Category = apps.get_model("manager", "Category")
+    Accountancy = apps.get_model("manager", "Accountancy")
+    Accountancy.objects.update(
+        IO_type=Subquery(
+            Category.objects.filter(id=OuterRef("category_id")).values("name")
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0008_accountancy_io_type_search"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # The category names are searched instead, the index would go away with its column anyway.
+        # Reinstalled last on the way back, after the table remakes that would drop SQLite triggers.
+        migrations.RunPython(
+            search_index.uninstall_search_index, search_index.install_search_index
+        ),
+        migrations.CreateModel(
+            name="Category",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "IO",
+                    models.CharField(
+                        choices=[("I", "Income"), ("O", "Outcome")], max_length=1
+                    ),
+                ),
+                ("name", models.CharField(max_length=50)),
+                (
+                    "icon",
+                    models.CharField(
+                        default="other",
+                        help_text="CSS class of the outcome button icon.",
+                        max_length=30,
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="categories",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "categories",
+                "ordering": ["id"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "IO", "name"), name="unique_user_category"
+                    ),
+                    models.UniqueConstraint(
+                        condition=Q(user__isnull=True),
+                        fields=("IO", "name"),
+                        name="unique_default_category",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="accountancy",
+            name="category",
+            field=models.ForeignKey(
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="accountancy",
+                to="manager.category",
+            ),
+        ),
+        migrations.RunPython(categorize, uncategorize),
+        migrations.AlterField(
+            model_name="accountancy",
+            name="category",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="accountancy",
+                to="manager.category",
+            ),
+        ),
+        # Lets the column be added back to existing rows before `uncategorize` fills it
+        migrations.AlterField(
+            model_name="accountancy",
+            name="IO_type",
+            field=models.CharField(default="Other", max_length=50),
+        ),
+        migrations.RemoveField(
+            model_name="accountancy",
+            name="IO_type",
+        ),
+    ]
@@ -0,0 +1,140 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0009_category"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecurringTransaction",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "IO",
+                    models.CharField(
+                        choices=[("I", "Income"), ("O", "Outcome")],
+                        default="O",
+                        max_length=1,
+                    ),
+                ),
+                (
+                    "amount",
+                    models.BigIntegerField(
+                        help_text="In minor units of the wallet currency."
+                    ),
+                ),
+                (
+                    "period",
+                    models.CharField(
+                        choices=[
+                            ("D", "Daily"),
+                            ("W", "Weekly"),
+                            ("M", "Monthly"),
+                            ("Y", "Yearly"),
+                        ],
+                        default="M",
+                        max_length=1,
+                    ),
+                ),
+                (
+                    "start_date",
+                    models.DateField(default=django.utils.timezone.localdate),
+                ),
+                ("end_date", models.DateField(blank=True, null=True)),
+                ("occurrences", models.PositiveIntegerField(default=0, editable=False)),
+                (
+                    "next_date",
+                    models.DateField(
+                        blank=True,
+                        editable=False,
+                        help_text="Empty once the schedule ended.",
+                        null=True,
+                    ),
+                ),
+                (
+                    "card",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recurring_transactions",
+                        to="manager.card",
+                    ),
+                ),
+                (
+                    "cash",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recurring_transactions",
+                        to="manager.cash",
+                    ),
+                ),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="recurring_transactions",
+                        to="manager.category",
+                    ),
+                ),
+                (
+                    "cryptocurrency",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recurring_transactions",
+                        to="manager.cryptocurrency",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["next_date"], name="recurring_next_date_idx")
+                ],
+                "constraints": [
+                    models.CheckConstraint(
+                        condition=models.Q(
+                            models.Q(
+                                ("card__isnull", False),
+                                ("cash__isnull", True),
+                                ("cryptocurrency__isnull", True),
+                            ),
+                            models.Q(
+                                ("card__isnull", True),
+                                ("cash__isnull", False),
+                                ("cryptocurrency__isnull", True),
+                            ),
+                            models.Q(
+                                ("card__isnull", True),
+                                ("cash__isnull", True),
+                                ("cryptocurrency__isnull", False),
+                            ),
+                            _connector="OR",
+                        ),
+                        name="recurring_only_one_wallet",
+                    ),
+                    models.CheckConstraint(
+                        condition=models.Q(("amount__gt", 0)),
+                        name="recurring_positive_amount",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,116 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_checkpoints(apps, schema_editor):
+    """Accumulate the monthly turnover rollup of every wallet into its checkpoints."""
+    MonthlyTurnover = apps.get_model("manager", "MonthlyTurnover")
+    BalanceCheckpoint = apps.get_model("manager", "BalanceCheckpoint")
+    checkpoints = {}
+    rows = MonthlyTurnover.objects.order_by("month").values_list(
+        "card_id", "cash_id", "cryptocurrency_id", "IO", "month", "amount_sum"
+    )
+    for card_id, cash_id, cryptocurrency_id, io, month, amount_sum in rows.iterator():
+        wallet = (card_id, cash_id, cryptocurrency_id)
+        net = amount_sum if io == "I" else -amount_sum
+        checkpoints.setdefault(wallet, {}).setdefault(month, 0)
+        checkpoints[wallet][month] += net
+
+    records = []
+    for (card_id, cash_id, cryptocurrency_id), months in checkpoints.items():
+        net_total = 0
+        for month in sorted(months):
+            net_total += months[month]
+            records.append(
+                BalanceCheckpoint(
+                    card_id=card_id,
+                    cash_id=cash_id,
+                    cryptocurrency_id=cryptocurrency_id,
+                    month=month,
+                    net_total=net_total,
+                )
+            )
+    BalanceCheckpoint.objects.bulk_create(records, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0011_job"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BalanceCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("month", models.DateField()),
+                (
+                    "net_total",
+                    models.BigIntegerField(
+                        default=0, help_text="In minor units of the wallet currency."
+                    ),
+                ),
+                (
+                    "card",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_checkpoints",
+                        to="manager.card",
+                    ),
+                ),
+                (
+                    "cash",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_checkpoints",
+                        to="manager.cash",
+                    ),
+                ),
+                (
+                    "cryptocurrency",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="balance_checkpoints",
+                        to="manager.cryptocurrency",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-month"],
+                "constraints": [
+                    models.UniqueConstraint(
+                        condition=models.Q(("card__isnull", False)),
+                        fields=("card", "month"),
+                        name="unique_card_balance_checkpoint",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("cash__isnull", False)),
+                        fields=("cash", "month"),
+                        name="unique_cash_balance_checkpoint",
+                    ),
+                    models.UniqueConstraint(
+                        condition=models.Q(("cryptocurrency__isnull", False)),
+                        fields=("cryptocurrency", "month"),
+                        name="unique_cryptocurrency_balance_checkpoint",
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(build_checkpoints, migrations.RunPython.noop),
+    ]
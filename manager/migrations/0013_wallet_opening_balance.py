@@ -0,0 +1,65 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:41
+
+from django.db import migrations, models
+from django.db.models import Case, F, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+
+def set_opening_balances(apps, schema_editor):
+    """Take the net of the existing records back from every wallet balance.
+
+    Unlike the balance itself, the records can't be trusted to be complete, so a drift
+    made before this migration stays in the opening balance.
+    """
+    Accountancy = apps.get_model("manager", "Accountancy")
+    for model_name, field in (
+        ("Card", "card"),
+        ("Cash", "cash"),
+        ("Cryptocurrency", "cryptocurrency"),
+    ):
+        net = (
+            Accountancy.objects.filter(**{field: OuterRef("pk")})
+            .order_by()
+            .values(field)
+            .annotate(
+                net=Sum(Case(When(IO="I", then=F("amount")), default=-F("amount")))
+            )
+            .values("net")
+        )
+        apps.get_model("manager", model_name).objects.update(
+            opening_balance=F("balance") - Coalesce(Subquery(net), Value(0))
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0012_balance_checkpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="card",
+            name="opening_balance",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="Balance the wallet was created with, before any accountancy record.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cash",
+            name="opening_balance",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="Balance the wallet was created with, before any accountancy record.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cryptocurrency",
+            name="opening_balance",
+            field=models.BigIntegerField(
+                default=0,
+                help_text="Balance the wallet was created with, before any accountancy record.",
+            ),
+        ),
+        migrations.RunPython(set_opening_balances, migrations.RunPython.noop),
+    ]
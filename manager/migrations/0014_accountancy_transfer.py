@@ -0,0 +1,43 @@
+# Generated by Django 5.2.2 on 2026-10-18 14:45
+
+from django.db import migrations, models
+
+
+def create_transfer_categories(apps, schema_editor):
+    Category = apps.get_model("manager", "Category")
+    for io in ("O", "I"):
+        Category.objects.get_or_create(user=None, IO=io, name="Transfer")
+
+
+def delete_transfer_categories(apps, schema_editor):
+    apps.get_model("manager", "Category").objects.filter(
+        user=None, name="Transfer", accountancy__isnull=True
+    ).delete()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0013_wallet_opening_balance"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="accountancy",
+            name="transfer",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="Shared by the outcome and income of a transfer between wallets.",
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="accountancy",
+            index=models.Index(
+                condition=models.Q(("transfer__isnull", False)),
+                fields=["transfer"],
+                name="acc_transfer_idx",
+            ),
+        ),
+        migrations.RunPython(create_transfer_categories, delete_transfer_categories),
+    ]
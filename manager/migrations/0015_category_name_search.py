@@ -0,0 +1,35 @@
+# Generated by Django 5.2.2 on 2026-10-18 16:10
+
+from django.db import migrations
+
+TABLE = "manager_category"
+TRIGRAM_INDEX = "category_name_trgm_idx"
+
+
+def install_search_index(apps, schema_editor):
+    """Create a trigram GIN index for the category search on PostgreSQL, the successor of the `IO_type` one.
+
+    SQLite scans the categories of the user, which the `unique_user_category` index narrows down.
+    """
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        # Matches the `UPPER("name"::text) LIKE UPPER(...)` of `icontains`
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON {TABLE} "
+            f'USING gin (UPPER("name"::text) gin_trgm_ops)'
+        )
+
+
+def uninstall_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("manager", "0014_accountancy_transfer"),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
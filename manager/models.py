@@ -1,26 +1,47 @@
+from calendar import monthrange
+from datetime import date, timedelta
 from decimal import Decimal
 from typing import Any, ClassVar
 
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
-from django.db import models
-from django.db.models import Q
+from django.db import IntegrityError, models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from manager.currencies import currencies
+from manager.money import CRYPTO_DECIMAL_PLACES, from_minor
+
+# The balance is expected to equal it plus the incomes minus the outcomes, see `manager.reconciliation`
+OPENING_BALANCE_HELP_TEXT = "Balance the wallet was created with, before any accountancy record."
 
 
 class Currency(models.Model):
     name = models.CharField(max_length=50, unique=True)
     abbreviation = models.CharField(max_length=5)
     sign = models.CharField(max_length=5)
+    # Number of digits of the minor unit, which balances and amounts in the currency are stored in
+    decimal_places = models.PositiveSmallIntegerField(default=2)
 
     def __str__(self) -> str:
         return f"{self.name} ({self.abbreviation})"
 
+    def clean(self) -> None:
+        # The balances and amounts of the wallets in the currency would change their value
+        if (
+            self.pk
+            and Currency.objects.filter(pk=self.pk).exclude(decimal_places=self.decimal_places).exists()
+            and (self.cards.exists() or self.cash.exists())  # type: ignore[reportAttributeAccessIssue]
+        ):
+            raise ValidationError({"decimal_places": "The minor units of a currency with wallets can't be changed."})
+
 
 class Card(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="cards")
     bank_name = models.CharField(max_length=50)
     type = models.CharField(max_length=50)
-    balance = models.FloatField(default=0.0)
+    balance = models.BigIntegerField(default=0, help_text="In minor units of the currency, e.g. cents.")
+    opening_balance = models.BigIntegerField(default=0, help_text=OPENING_BALANCE_HELP_TEXT)
     currency = models.ForeignKey(Currency, on_delete=models.RESTRICT, related_name="cards")
 
     class Meta:
@@ -31,17 +52,23 @@ class Card(models.Model):
         ]
 
     def __str__(self) -> str:
-        return f"Card: {self.bank_name} - {self.type} - {self.balance} {self.currency.sign}"
+        currency = currencies.get(self.currency_id)  # type: ignore[reportAttributeAccessIssue]
+        return f"Card: {self.bank_name} - {self.type} - {self.balance_decimal} {currency.sign}"
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        self.balance = round(self.balance, 2)
-        return super().save(*args, **kwargs)
+    @property
+    def decimal_places(self) -> int:
+        return currencies.get(self.currency_id).decimal_places  # type: ignore[reportAttributeAccessIssue]
+
+    @property
+    def balance_decimal(self) -> Decimal:
+        return from_minor(self.balance, self.decimal_places)
 
 
 class Cash(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="cash")
     currency = models.ForeignKey(Currency, on_delete=models.RESTRICT, related_name="cash")
-    balance = models.FloatField(default=0.0)
+    balance = models.BigIntegerField(default=0, help_text="In minor units of the currency, e.g. cents.")
+    opening_balance = models.BigIntegerField(default=0, help_text=OPENING_BALANCE_HELP_TEXT)
 
     class Meta:
         verbose_name = "cash"
@@ -52,17 +79,24 @@ class Cash(models.Model):
         ]
 
     def __str__(self) -> str:
-        return f"Cash - {self.balance} {self.currency.sign} ({self.currency.abbreviation})"
+        currency = currencies.get(self.currency_id)  # type: ignore[reportAttributeAccessIssue]
+        return f"Cash - {self.balance_decimal} {currency.sign} ({currency.abbreviation})"
 
-    def save(self, *args: Any, **kwargs: Any) -> None:
-        self.balance = round(self.balance, 2)
-        return super().save(*args, **kwargs)
+    @property
+    def decimal_places(self) -> int:
+        return currencies.get(self.currency_id).decimal_places  # type: ignore[reportAttributeAccessIssue]
+
+    @property
+    def balance_decimal(self) -> Decimal:
+        return from_minor(self.balance, self.decimal_places)
 
 
 class Cryptocurrency(models.Model):
     user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="cryptocurrencies")
     name = models.CharField(max_length=50)
-    balance = models.DecimalField(max_digits=20, decimal_places=8, default=Decimal("0.0"))
+    balance = models.BigIntegerField(default=0, help_text="In 1e-8 coin units.")
+    opening_balance = models.BigIntegerField(default=0, help_text=OPENING_BALANCE_HELP_TEXT)
+    decimal_places = CRYPTO_DECIMAL_PLACES
 
     class Meta:
         ordering: ClassVar[list[str]] = ["name"]
@@ -72,7 +106,11 @@ class Cryptocurrency(models.Model):
         ]
 
     def __str__(self) -> str:
-        return f"Cryptocurrency: {self.name} - {self.balance}"
+        return f"Cryptocurrency: {self.name} - {self.balance_decimal}"
+
+    @property
+    def balance_decimal(self) -> Decimal:
+        return from_minor(self.balance, self.decimal_places)
 
 
 class Accountancy(models.Model):
@@ -81,18 +119,36 @@ class Accountancy(models.Model):
     IN_OUT_COME: ClassVar[dict[str, str]] = {INCOME: "Income", OUTCOME: "Outcome"}
     RELATED_NAME = "accountancy"
 
-    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
-    cash = models.ForeignKey(Cash, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    # The composite indexes declared in `Meta.indexes` lead with the wallet columns, so the
+    # single-column foreign key indexes would only duplicate them.
+    card = models.ForeignKey(
+        Card, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True, db_index=False
+    )
+    cash = models.ForeignKey(
+        Cash, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True, db_index=False
+    )
     cryptocurrency = models.ForeignKey(
-        Cryptocurrency, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True
+        Cryptocurrency, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True, db_index=False
     )
     IO = models.CharField(max_length=1, choices=IN_OUT_COME, default=OUTCOME)
-    IO_type = models.CharField(max_length=50)
-    amount = models.FloatField()
-    datetime = models.DateTimeField(auto_now_add=True)
+    category = models.ForeignKey("Category", on_delete=models.PROTECT, related_name=RELATED_NAME)
+    amount = models.BigIntegerField(help_text="In minor units of the wallet currency.")
+    datetime = models.DateTimeField(default=timezone.now)
+    transfer = models.UUIDField(
+        null=True,
+        blank=True,
+        editable=False,
+        help_text="Shared by the outcome and income of a transfer between wallets.",
+    )
 
     class Meta:
         ordering: ClassVar[list[str]] = ["-datetime"]
+        indexes: ClassVar[list[models.Index]] = [
+            models.Index(fields=("card", "datetime", "IO"), name="acc_card_datetime_idx"),
+            models.Index(fields=("cash", "datetime", "IO"), name="acc_cash_datetime_idx"),
+            models.Index(fields=("cryptocurrency", "datetime", "IO"), name="acc_crypto_datetime_idx"),
+            models.Index(fields=("transfer",), condition=Q(transfer__isnull=False), name="acc_transfer_idx"),
+        ]
         constraints: ClassVar[list[models.CheckConstraint]] = [
             models.CheckConstraint(
                 condition=(Q(card__isnull=False) & Q(cash__isnull=True) & Q(cryptocurrency__isnull=True))
@@ -104,10 +160,334 @@ class Accountancy(models.Model):
         ]
 
     def __str__(self) -> str:
-        return f"Accountancy: {self.IO}, {self.IO_type}, {self.amount}, {self.datetime}"
+        return f"Accountancy: {self.IO}, {self.category_id}, {self.amount}, {self.datetime}"  # type: ignore[reportAttributeAccessIssue]
+
+    @property
+    def wallet(self) -> Card | Cash | Cryptocurrency:
+        return self.card or self.cash or self.cryptocurrency  # type: ignore[reportReturnType]
+
+    @property
+    def amount_decimal(self) -> Decimal:
+        return from_minor(self.amount, self.wallet.decimal_places)
 
     def clean(self) -> None:
         if self.card and self.cash and self.cryptocurrency:
             raise ValidationError("Only one of the wallet fields can be set.")
         if self.amount < 0:
             raise ValidationError("Amount can't be negative.")
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        with transaction.atomic():
+            previous = None
+            if not self._state.adding:
+                previous = Accountancy.objects.select_for_update().filter(pk=self.pk).first()
+            super().save(*args, **kwargs)
+            if previous is not None:
+                MonthlyTurnover.objects.register(previous, sign=-1)
+            MonthlyTurnover.objects.register(self)
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        with transaction.atomic():
+            MonthlyTurnover.objects.register(self, sign=-1)
+            return super().delete(*args, **kwargs)
+
+    @property
+    def wallet_lookup(self) -> dict[str, int | None]:
+        if self.card_id:  # type: ignore[reportAttributeAccessIssue]
+            return {"card_id": self.card_id}  # type: ignore[reportAttributeAccessIssue]
+        if self.cash_id:  # type: ignore[reportAttributeAccessIssue]
+            return {"cash_id": self.cash_id}  # type: ignore[reportAttributeAccessIssue]
+        return {"cryptocurrency_id": self.cryptocurrency_id}  # type: ignore[reportAttributeAccessIssue]
+
+
+class CategoryQuerySet(models.QuerySet["Category"]):
+    def for_user(self, user_id: int) -> "CategoryQuerySet":
+        """The default categories and the user's own ones."""
+        return self.filter(Q(user__isnull=True) | Q(user_id=user_id))
+
+
+class Category(models.Model):
+    """Income or outcome category of the accountancy records. The default ones, without a user, are shared."""
+
+    # Name of the default categories of the two records of a transfer between wallets
+    TRANSFER = "Transfer"
+
+    user = models.ForeignKey(
+        get_user_model(), on_delete=models.CASCADE, related_name="categories", null=True, blank=True
+    )
+    IO = models.CharField(max_length=1, choices=Accountancy.IN_OUT_COME)
+    name = models.CharField(max_length=50)
+    icon = models.CharField(max_length=30, default="other", help_text="CSS class of the outcome button icon.")
+
+    objects = CategoryQuerySet.as_manager()
+
+    class Meta:
+        verbose_name_plural = "categories"
+        ordering: ClassVar[list[str]] = ["id"]
+        constraints: ClassVar[list[models.UniqueConstraint]] = [
+            models.UniqueConstraint(fields=("user", "IO", "name"), name="unique_user_category"),
+            models.UniqueConstraint(
+                fields=("IO", "name"), condition=Q(user__isnull=True), name="unique_default_category"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class RecurringTransaction(models.Model):
+    """Salary, rent, a subscription, etc. posted to a wallet on a schedule by `manage.py materialize_recurring`."""
+
+    DAILY = "D"
+    WEEKLY = "W"
+    MONTHLY = "M"
+    YEARLY = "Y"
+    PERIODS: ClassVar[dict[str, str]] = {DAILY: "Daily", WEEKLY: "Weekly", MONTHLY: "Monthly", YEARLY: "Yearly"}
+    RELATED_NAME = "recurring_transactions"
+
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cash = models.ForeignKey(Cash, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cryptocurrency = models.ForeignKey(
+        Cryptocurrency, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True
+    )
+    IO = models.CharField(max_length=1, choices=Accountancy.IN_OUT_COME, default=Accountancy.OUTCOME)
+    category = models.ForeignKey(Category, on_delete=models.PROTECT, related_name=RELATED_NAME)
+    amount = models.BigIntegerField(help_text="In minor units of the wallet currency.")
+    period = models.CharField(max_length=1, choices=PERIODS, default=MONTHLY)
+    start_date = models.DateField(default=timezone.localdate)
+    end_date = models.DateField(null=True, blank=True)
+    # Occurrences already posted, counted from `start_date` so monthly ones on the 31st don't drift to the 28th
+    occurrences = models.PositiveIntegerField(default=0, editable=False)
+    next_date = models.DateField(null=True, blank=True, editable=False, help_text="Empty once the schedule ended.")
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [models.Index(fields=("next_date",), name="recurring_next_date_idx")]
+        constraints: ClassVar[list[models.CheckConstraint]] = [
+            models.CheckConstraint(
+                condition=(Q(card__isnull=False) & Q(cash__isnull=True) & Q(cryptocurrency__isnull=True))
+                | (Q(card__isnull=True) & Q(cash__isnull=False) & Q(cryptocurrency__isnull=True))
+                | (Q(card__isnull=True) & Q(cash__isnull=True) & Q(cryptocurrency__isnull=False)),
+                name="recurring_only_one_wallet",
+            ),
+            models.CheckConstraint(condition=Q(amount__gt=0), name="recurring_positive_amount"),
+        ]
+
+    def __str__(self) -> str:
+        return f"Recurring transaction: {self.IO}, {self.category_id}, {self.amount}, {self.get_period_display()}"  # type: ignore[reportAttributeAccessIssue]
+
+    @property
+    def wallet(self) -> Card | Cash | Cryptocurrency:
+        return self.card or self.cash or self.cryptocurrency  # type: ignore[reportReturnType]
+
+    @property
+    def wallet_lookup(self) -> dict[str, int | None]:
+        if self.card_id:  # type: ignore[reportAttributeAccessIssue]
+            return {"card_id": self.card_id}  # type: ignore[reportAttributeAccessIssue]
+        if self.cash_id:  # type: ignore[reportAttributeAccessIssue]
+            return {"cash_id": self.cash_id}  # type: ignore[reportAttributeAccessIssue]
+        return {"cryptocurrency_id": self.cryptocurrency_id}  # type: ignore[reportAttributeAccessIssue]
+
+    def occurrence(self, index: int) -> date | None:
+        """Return the date of the `index`-th (0-based) occurrence, or `None` if it's after `end_date`."""
+        if self.period == self.DAILY:
+            day = self.start_date + timedelta(days=index)
+        elif self.period == self.WEEKLY:
+            day = self.start_date + timedelta(weeks=index)
+        else:
+            months = self.start_date.month - 1 + index * (12 if self.period == self.YEARLY else 1)
+            year, month = self.start_date.year + months // 12, months % 12 + 1
+            day = date(year, month, min(self.start_date.day, monthrange(year, month)[1]))
+        return None if self.end_date and day > self.end_date else day
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        # (Re)schedule from the start when the schedule is edited before anything has been posted
+        if not self.occurrences:
+            self.next_date = self.occurrence(0)
+        super().save(*args, **kwargs)
+
+
+class MonthlyTurnoverManager(models.Manager["MonthlyTurnover"]):
+    def register(self, accountancy: Accountancy, sign: int = 1) -> None:
+        """Add (or with `sign=-1` remove) a single accountancy record to its monthly rollup row."""
+        self.add(
+            accountancy.wallet_lookup,
+            accountancy.IO,
+            timezone.localtime(accountancy.datetime).date().replace(day=1),
+            sign * accountancy.amount,
+            sign,
+        )
+
+    def add(
+        self, wallet_lookup: dict[str, int | None], io: str, month: date, amount: int, transactions: int = 1
+    ) -> None:
+        """Apply a turnover delta to a wallet's month. Must be called inside the accountancy transaction."""
+        rollup = self.filter(**wallet_lookup, IO=io, month=month)
+        updated = rollup.update(amount_sum=F("amount_sum") + amount, transactions=F("transactions") + transactions)
+        if not updated:
+            try:
+                with transaction.atomic():
+                    self.create(**wallet_lookup, IO=io, month=month, amount_sum=amount, transactions=transactions)
+            except IntegrityError:
+                # A concurrent transaction created the row first.
+                rollup.update(amount_sum=F("amount_sum") + amount, transactions=F("transactions") + transactions)
+        if transactions < 0:
+            rollup.filter(transactions__lte=0).delete()
+        BalanceCheckpoint.objects.shift(wallet_lookup, month, amount if io == Accountancy.INCOME else -amount)
+
+
+class MonthlyTurnover(models.Model):
+    """Per-wallet, per-month, per-IO sums of `Accountancy.amount`, maintained on every accountancy write."""
+
+    RELATED_NAME = "monthly_turnover"
+
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cash = models.ForeignKey(Cash, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cryptocurrency = models.ForeignKey(
+        Cryptocurrency, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True
+    )
+    IO = models.CharField(max_length=1, choices=Accountancy.IN_OUT_COME)
+    month = models.DateField()
+    amount_sum = models.BigIntegerField(default=0, help_text="In minor units of the wallet currency.")
+    transactions = models.IntegerField(default=0)
+
+    objects = MonthlyTurnoverManager()
+
+    class Meta:
+        ordering: ClassVar[list[str]] = ["-month"]
+        constraints: ClassVar[list[models.UniqueConstraint]] = [
+            models.UniqueConstraint(
+                fields=("card", "month", "IO"), condition=Q(card__isnull=False), name="unique_card_monthly_turnover"
+            ),
+            models.UniqueConstraint(
+                fields=("cash", "month", "IO"), condition=Q(cash__isnull=False), name="unique_cash_monthly_turnover"
+            ),
+            models.UniqueConstraint(
+                fields=("cryptocurrency", "month", "IO"),
+                condition=Q(cryptocurrency__isnull=False),
+                name="unique_cryptocurrency_monthly_turnover",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Monthly turnover: {self.IO}, {self.month:%m.%Y}, {self.amount_sum}"
+
+
+class BalanceCheckpointManager(models.Manager["BalanceCheckpoint"]):
+    def shift(self, wallet_lookup: dict[str, int | None], month: date, net: int) -> None:
+        """Add a net balance change of a month to its checkpoint and all the later ones."""
+        if not net:
+            return
+        if not self.filter(**wallet_lookup, month=month).exists():
+            # Months without records have no checkpoint, the closest earlier one applies to them
+            previous = self.filter(**wallet_lookup, month__lt=month).order_by("-month").first()
+            try:
+                with transaction.atomic():
+                    self.create(**wallet_lookup, month=month, net_total=previous.net_total if previous else 0)
+            except IntegrityError:
+                # A concurrent transaction created the row first.
+                pass
+        self.filter(**wallet_lookup, month__gte=month).update(net_total=F("net_total") + net)
+
+
+class BalanceCheckpoint(models.Model):
+    """Incomes minus outcomes of a wallet's records up to the end of a month, see `manager.balance_history`.
+
+    Maintained together with `MonthlyTurnover`, so a past balance is the current one minus the latest
+    `net_total` plus the checkpoint's, with only the records of one month left to add.
+    """
+
+    RELATED_NAME = "balance_checkpoints"
+
+    card = models.ForeignKey(Card, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cash = models.ForeignKey(Cash, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True)
+    cryptocurrency = models.ForeignKey(
+        Cryptocurrency, on_delete=models.CASCADE, related_name=RELATED_NAME, null=True, blank=True
+    )
+    month = models.DateField()
+    net_total = models.BigIntegerField(default=0, help_text="In minor units of the wallet currency.")
+
+    objects = BalanceCheckpointManager()
+
+    class Meta:
+        ordering: ClassVar[list[str]] = ["-month"]
+        constraints: ClassVar[list[models.UniqueConstraint]] = [
+            models.UniqueConstraint(
+                fields=("card", "month"), condition=Q(card__isnull=False), name="unique_card_balance_checkpoint"
+            ),
+            models.UniqueConstraint(
+                fields=("cash", "month"), condition=Q(cash__isnull=False), name="unique_cash_balance_checkpoint"
+            ),
+            models.UniqueConstraint(
+                fields=("cryptocurrency", "month"),
+                condition=Q(cryptocurrency__isnull=False),
+                name="unique_cryptocurrency_balance_checkpoint",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Balance checkpoint: {self.month:%m.%Y}, {self.net_total}"
+
+
+class ExchangeRate(models.Model):
+    """Daily value of one unit of a currency or a cryptocurrency in the base currency, `settings.BASE_CURRENCY`."""
+
+    date = models.DateField()
+    currency = models.ForeignKey(
+        Currency, on_delete=models.CASCADE, related_name="exchange_rates", null=True, blank=True
+    )
+    crypto_name = models.CharField(max_length=50, blank=True, help_text="Lowercased `Cryptocurrency.name`.")
+    rate = models.DecimalField(max_digits=30, decimal_places=12)
+
+    class Meta:
+        ordering: ClassVar[list[str]] = ["-date"]
+        constraints: ClassVar[list[models.BaseConstraint]] = [
+            models.CheckConstraint(
+                condition=(Q(currency__isnull=False) & Q(crypto_name=""))
+                | (Q(currency__isnull=True) & ~Q(crypto_name="")),
+                name="exchange_rate_one_asset",
+            ),
+            models.CheckConstraint(condition=Q(rate__gt=0), name="positive_exchange_rate"),
+            models.UniqueConstraint(
+                fields=("date", "currency"), condition=Q(currency__isnull=False), name="unique_currency_rate_date"
+            ),
+            models.UniqueConstraint(
+                fields=("date", "crypto_name"), condition=Q(currency__isnull=True), name="unique_crypto_rate_date"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"Exchange rate: {self.currency_id or self.crypto_name}, {self.date}, {self.rate}"  # type: ignore[reportAttributeAccessIssue]
+
+
+class Job(models.Model):
+    """Background work run outside of the request by `manage.py run_jobs`, see `manager.jobs`."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUSES: ClassVar[dict[str, str]] = {
+        QUEUED: "Queued",
+        RUNNING: "Running",
+        SUCCEEDED: "Succeeded",
+        FAILED: "Failed",
+    }
+
+    user = models.ForeignKey(get_user_model(), on_delete=models.CASCADE, related_name="jobs", null=True, blank=True)
+    name = models.CharField(max_length=50)
+    status = models.CharField(max_length=9, choices=STATUSES, default=QUEUED)
+    payload = models.JSONField(default=dict, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    # Token of the claim that moved the job to `RUNNING`
+    claimed_by = models.CharField(max_length=32, blank=True, editable=False)
+    attempts = models.PositiveSmallIntegerField(default=0, editable=False)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes: ClassVar[list[models.Index]] = [models.Index(fields=("status", "id"), name="job_status_idx")]
+
+    def __str__(self) -> str:
+        return f"Job: {self.name}, {self.status}"
@@ -0,0 +1,19 @@
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+
+from django.core.exceptions import ValidationError
+
+# Cryptocurrency balances and amounts are kept in 1e-8 coin units (satoshi for Bitcoin)
+CRYPTO_DECIMAL_PLACES = 8
+
+
+def to_minor(amount: Decimal | str | int, decimal_places: int) -> int:
+    """Convert an amount of money to the integer number of its minor units, e.g. `"12.5"` dollars to 1250 cents."""
+    try:
+        return int(Decimal(amount).scaleb(decimal_places).to_integral_value(ROUND_HALF_UP))
+    except (InvalidOperation, ValueError, TypeError, OverflowError):
+        raise ValidationError(f"'{amount}' is not a valid amount.") from None
+
+
+def from_minor(units: int, decimal_places: int) -> Decimal:
+    """Convert an integer number of minor units back to an amount, e.g. 1250 cents to `Decimal("12.50")`."""
+    return Decimal(units).scaleb(-decimal_places)
@@ -0,0 +1,113 @@
+import base64
+import binascii
+import json
+import operator
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q, QuerySet
+from django.http import Http404
+
+
+@dataclass(frozen=True, slots=True)
+class CursorPage:
+    object_list: list
+    has_next: bool
+    has_previous: bool
+    next_cursor: str | None
+    previous_cursor: str | None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next or self.has_previous
+
+
+def _key(row: Any, fields: tuple[str, ...]) -> list:
+    return [row[field] if isinstance(row, dict) else getattr(row, field) for field in fields]
+
+
+class CursorPaginationMixin:
+    """Keyset pagination for `ListView`s.
+
+    Pages are fetched with `WHERE (key) < (last key of the previous page) ORDER BY key LIMIT n + 1` instead of
+    `OFFSET`, and nothing is counted, so a deep page costs as much as the first one. The position is passed in
+    the `cursor` query parameter as an opaque token. `cursor_ordering` must make the order total (end with a
+    unique field) and its fields have to be selected by the queryset.
+    """
+
+    cursor_ordering: tuple[str, ...] = ("-id",)
+    cursor_query_param = "cursor"
+
+    def _fields(self) -> tuple[str, ...]:
+        return tuple(field.lstrip("-") for field in self.cursor_ordering)
+
+    def encode_cursor(self, direction: str, row: Any) -> str:
+        key = [value.isoformat() if hasattr(value, "isoformat") else value for value in _key(row, self._fields())]
+        return base64.urlsafe_b64encode(json.dumps([direction, key]).encode()).decode()
+
+    def decode_cursor(self, queryset: QuerySet, cursor: str) -> tuple[str, list]:
+        try:
+            direction, key = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if direction not in ("next", "previous") or len(key) != len(self.cursor_ordering):
+                raise ValueError
+            opts = queryset.model._meta
+            return direction, [
+                opts.get_field(field).to_python(value) for field, value in zip(self._fields(), key, strict=True)
+            ]
+        except (ValueError, TypeError, binascii.Error, ValidationError):
+            raise Http404("Invalid cursor.") from None
+
+    def _after(self, ordering: tuple[str, ...], key: list) -> Q:
+        """Expand the row-value comparison `(a, b, ...) > key` for the given ordering into plain lookups."""
+        fields = self._fields()
+        q_filter = reduce(
+            operator.or_,
+            (
+                Q(
+                    **dict(zip(fields[:position], key, strict=False)),
+                    **{f"{fields[position]}__{'lt' if field.startswith('-') else 'gt'}": key[position]},
+                )
+                for position, field in enumerate(ordering)
+            ),
+        )
+        # The inclusive bound on the leading field lets the database range-scan an index on it.
+        return Q(**{f"{fields[0]}__{'lte' if ordering[0].startswith('-') else 'gte'}": key[0]}) & q_filter
+
+    def _page_slice(self, queryset: QuerySet, page_size: int) -> tuple[QuerySet, str, bool]:
+        cursor = self.request.GET.get(self.cursor_query_param)  # type: ignore[reportAttributeAccessIssue]
+        direction, ordering = "next", self.cursor_ordering
+        if cursor:
+            direction, key = self.decode_cursor(queryset, cursor)
+            if direction == "previous":
+                ordering = tuple(field[1:] if field.startswith("-") else f"-{field}" for field in ordering)
+            queryset = queryset.filter(self._after(ordering, key))
+
+        return queryset.order_by(*ordering)[: page_size + 1], direction, bool(cursor)
+
+    def _page(
+        self, rows: list, page_size: int, direction: str, has_cursor: bool
+    ) -> tuple[None, CursorPage, list, bool]:
+        has_more, rows = len(rows) > page_size, rows[:page_size]
+        if direction == "previous":
+            rows.reverse()
+            has_next, has_previous = True, has_more
+        else:
+            has_next, has_previous = has_more, has_cursor
+
+        page = CursorPage(
+            object_list=rows,
+            has_next=has_next,
+            has_previous=has_previous,
+            next_cursor=self.encode_cursor("next", rows[-1]) if has_next and rows else None,
+            previous_cursor=self.encode_cursor("previous", rows[0]) if has_previous and rows else None,
+        )
+        return None, page, rows, page.has_other_pages()
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple[None, CursorPage, list, bool]:
+        rows, direction, has_cursor = self._page_slice(queryset, page_size)
+        return self._page(list(rows), page_size, direction, has_cursor)
+
+    async def apaginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple[None, CursorPage, list, bool]:
+        rows, direction, has_cursor = self._page_slice(queryset, page_size)
+        return self._page([row async for row in rows], page_size, direction, has_cursor)
@@ -0,0 +1,93 @@
+from itertools import repeat
+from typing import NamedTuple
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import Case, F, Sum, Value, When
+from django.db.models.functions import Coalesce
+
+from manager.cache import bump_user_data_version
+from manager.jobs import job_executor
+from manager.models import Accountancy
+from manager.wallet_operations import WALLET_MODELS
+
+# Number of users whose wallets are reconciled by one aggregate query per wallet type
+RECONCILE_BATCH_SIZE = 1000
+
+
+class Drift(NamedTuple):
+    wallet_type: str
+    wallet_id: int
+    user_id: int
+    balance: int
+    expected: int
+
+
+class ReconcileResult(NamedTuple):
+    checked: int
+    drifts: list[Drift]
+    fixed: int
+
+
+def user_id_ranges(batch_size: int = RECONCILE_BATCH_SIZE) -> list[tuple[int, int | None]]:
+    """Split the user ids into half-open `[start, stop)` ranges of `batch_size` users, the last one unbounded."""
+    user_ids = get_user_model().objects.order_by("id").values_list("id", flat=True)
+    starts = [user_id for index, user_id in enumerate(user_ids.iterator()) if not index % batch_size]
+    return list(zip(starts, [*starts[1:], None], strict=True))
+
+
+def reconcile_users(start: int, stop: int | None, fix: bool = False) -> ReconcileResult:
+    """Compare the wallet balances of the users in `[start, stop)` with their opening balances plus the records.
+
+    With `fix` a drifted balance is overwritten by the expected one, unless it was changed meanwhile
+    or the expected balance is negative.
+    """
+    checked, drifts, fixed = 0, [], 0
+    net = Sum(
+        Case(
+            When(accountancy__IO=Accountancy.INCOME, then=F("accountancy__amount")),
+            default=-F("accountancy__amount"),
+        )
+    )
+    for wallet_type, model in WALLET_MODELS.items():
+        wallets = model.objects.filter(user_id__gte=start)
+        if stop is not None:
+            wallets = wallets.filter(user_id__lt=stop)
+        rows = (
+            wallets.order_by()
+            .annotate(expected=F("opening_balance") + Coalesce(net, Value(0)))
+            .values_list("id", "user_id", "balance", "expected")
+        )
+        for wallet_id, user_id, balance, expected in rows:
+            checked += 1
+            if balance == expected:
+                continue
+            drifts.append(Drift(wallet_type, wallet_id, user_id, balance, expected))
+            if fix and expected >= 0 and model.objects.filter(id=wallet_id, balance=balance).update(balance=expected):
+                fixed += 1
+                bump_user_data_version(user_id)
+    return ReconcileResult(checked, drifts, fixed)
+
+
+def _reconcile_chunk(user_range: tuple[int, int | None], fix: bool) -> ReconcileResult:
+    try:
+        return reconcile_users(*user_range, fix=fix)
+    finally:
+        connections.close_all()
+
+
+def reconcile_balances(
+    fix: bool = False, workers: int = 1, processes: bool = False, batch_size: int = RECONCILE_BATCH_SIZE
+) -> ReconcileResult:
+    """Reconcile the wallets of all users, spreading the user id ranges over a pool of `workers`."""
+    ranges = user_id_ranges(batch_size)
+    if workers == 1:
+        results = [reconcile_users(*user_range, fix=fix) for user_range in ranges]
+    else:
+        with job_executor(workers, processes) as executor:
+            results = list(executor.map(_reconcile_chunk, ranges, repeat(fix)))
+    return ReconcileResult(
+        sum(result.checked for result in results),
+        [drift for result in results for drift in result.drifts],
+        sum(result.fixed for result in results),
+    )
@@ -0,0 +1,123 @@
+from collections import defaultdict
+from datetime import date, datetime, time
+from typing import NamedTuple
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from manager.cache import bump_user_data_version
+from manager.models import Accountancy, MonthlyTurnover, RecurringTransaction
+from manager.wallet_operations import WALLET_MODELS
+
+RECURRING_BATCH_SIZE = 500
+# `wallet_lookup` keys of `RecurringTransaction` and `Accountancy` by wallet model
+WALLET_FIELDS = {"card_id": "card", "cash_id": "cash", "cryptocurrency_id": "crypto"}
+
+
+class MaterializeResult(NamedTuple):
+    created: int
+    # Schedules left due because their wallet can't afford the outcomes
+    skipped: int
+
+
+def _due_records(recurring: RecurringTransaction, today: date) -> tuple[list[Accountancy], int]:
+    """Build the records of every occurrence due by `today` and return them with the index of the next one."""
+    records = []
+    index = recurring.occurrences
+    tz = timezone.get_current_timezone()
+    while (day := recurring.occurrence(index)) is not None and day <= today:
+        records.append(
+            Accountancy(
+                **recurring.wallet_lookup,
+                IO=recurring.IO,
+                category_id=recurring.category_id,  # type: ignore[reportAttributeAccessIssue]
+                amount=recurring.amount,
+                datetime=timezone.make_aware(datetime.combine(day, time.min), tz),
+            )
+        )
+        index += 1
+    return records, index
+
+
+def _materialize_batch(batch: list[RecurringTransaction], today: date) -> MaterializeResult:
+    by_wallet: defaultdict[tuple[str, int], list[RecurringTransaction]] = defaultdict(list)
+    for recurring in batch:
+        ((field, wallet_id),) = recurring.wallet_lookup.items()
+        by_wallet[field, wallet_id].append(recurring)  # type: ignore[reportArgumentType]
+
+    # Lock the wallets in a fixed order, one query per wallet type
+    wallets: dict[tuple[str, int], tuple[int, int]] = {}
+    for field, wallet_type in WALLET_FIELDS.items():
+        ids = sorted(wallet_id for wallet_field, wallet_id in by_wallet if wallet_field == field)
+        if ids:
+            rows = WALLET_MODELS[wallet_type].objects.select_for_update().filter(id__in=ids).order_by("id")
+            wallets.update(
+                {
+                    (field, wallet_id): (balance, user_id)
+                    for wallet_id, balance, user_id in rows.values_list("id", "balance", "user_id")
+                }
+            )
+
+    records: list[Accountancy] = []
+    scheduled: list[RecurringTransaction] = []
+    turnover: defaultdict[tuple[str, int, str, date], list[int]] = defaultdict(lambda: [0, 0])
+    skipped = 0
+    for (field, wallet_id), schedules in by_wallet.items():
+        balance, user_id = wallets[field, wallet_id]
+        wallet_records, next_indexes = [], []
+        for recurring in schedules:
+            due, next_index = _due_records(recurring, today)
+            wallet_records += due
+            next_indexes.append(next_index)
+        net = sum(record.amount if record.IO == Accountancy.INCOME else -record.amount for record in wallet_records)
+        if balance + net < 0:
+            skipped += len(schedules)
+            continue
+
+        WALLET_MODELS[WALLET_FIELDS[field]].objects.filter(id=wallet_id).update(balance=F("balance") + net)
+        for record in wallet_records:
+            month_turnover = turnover[
+                field, wallet_id, record.IO, timezone.localtime(record.datetime).date().replace(day=1)
+            ]
+            month_turnover[0] += record.amount
+            month_turnover[1] += 1
+        for recurring, next_index in zip(schedules, next_indexes, strict=True):
+            recurring.occurrences = next_index
+            recurring.next_date = recurring.occurrence(next_index)
+            scheduled.append(recurring)
+        records += wallet_records
+        bump_user_data_version(user_id)
+
+    Accountancy.objects.bulk_create(records)
+    for (field, wallet_id, io, month), (amount, transactions) in turnover.items():
+        MonthlyTurnover.objects.add({field: wallet_id}, io, month, amount, transactions)
+    RecurringTransaction.objects.bulk_update(scheduled, ["occurrences", "next_date"])
+    return MaterializeResult(len(records), skipped)
+
+
+def materialize_recurring(today: date | None = None, batch_size: int = RECURRING_BATCH_SIZE) -> MaterializeResult:
+    """Post every occurrence of the recurring transactions that is due by `today`, across all users.
+
+    Each batch of schedules is one transaction: its records are inserted with one `bulk_create`, every wallet
+    gets one aggregated balance update and the schedules are moved to their next date together with them, so
+    re-runs are idempotent and catching up after downtime posts all the missed occurrences in one pass.
+    Schedules locked by another run are skipped rather than waited for.
+    """
+    today = today or timezone.localdate()
+    created = skipped = 0
+    last_id = 0
+    while True:
+        with transaction.atomic():
+            batch = list(
+                RecurringTransaction.objects.select_for_update(skip_locked=True)
+                .filter(next_date__lte=today, id__gt=last_id)
+                .order_by("id")[:batch_size]
+            )
+            if not batch:
+                break
+            result = _materialize_batch(batch, today)
+        created += result.created
+        skipped += result.skipped
+        last_id = batch[-1].id  # type: ignore[reportAttributeAccessIssue]
+    return MaterializeResult(created, skipped)
@@ -0,0 +1,16 @@
+from django.db.models import QuerySet
+
+from manager.models import Category
+
+
+def search_categories(queryset: QuerySet, term: str, user_id: int | None = None) -> QuerySet:
+    """Filter accountancy records whose category name contains `term`, ignoring case.
+
+    Only the categories of `user_id` and the default ones, or all of them without a user (the admin), are
+    matched, by a trigram index on PostgreSQL; the records are matched by their indexed `category_id`.
+    """
+    term = term.strip()
+    if not term:
+        return queryset
+    categories = Category.objects.all() if user_id is None else Category.objects.for_user(user_id)
+    return queryset.filter(category__in=categories.filter(name__icontains=term))
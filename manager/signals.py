@@ -0,0 +1,43 @@
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from manager.cache import bump_user_data_version
+from manager.currencies import currencies
+from manager.exchange_rates import exchange_rates
+from manager.models import Card, Cash, Cryptocurrency, Currency, ExchangeRate
+
+
+def invalidate_wallet_owner_cache(sender: type, instance: Card | Cash | Cryptocurrency, **kwargs: Any) -> None:
+    bump_user_data_version(instance.user_id)  # type: ignore[reportAttributeAccessIssue]
+
+
+def set_opening_balance(sender: type, instance: Card | Cash | Cryptocurrency, raw: bool, **kwargs: Any) -> None:
+    if instance._state.adding and not raw:
+        instance.opening_balance = instance.balance
+
+
+def invalidate_new_user_cache(sender: type, instance: Any, created: bool, **kwargs: Any) -> None:
+    # Start a new account from a fresh version, even if its id was used before (e.g. in rolled back tests).
+    if created:
+        bump_user_data_version(instance.id)
+
+
+def refresh_currency_registry(sender: type, **kwargs: Any) -> None:
+    currencies.refresh()
+
+
+def refresh_exchange_rates(sender: type, **kwargs: Any) -> None:
+    exchange_rates.refresh()
+
+
+for wallet_model in (Card, Cash, Cryptocurrency):
+    pre_save.connect(set_opening_balance, sender=wallet_model)
+    post_save.connect(invalidate_wallet_owner_cache, sender=wallet_model)
+    post_delete.connect(invalidate_wallet_owner_cache, sender=wallet_model)
+post_save.connect(invalidate_new_user_cache, sender=get_user_model())
+post_save.connect(refresh_currency_registry, sender=Currency)
+post_delete.connect(refresh_currency_registry, sender=Currency)
+post_save.connect(refresh_exchange_rates, sender=ExchangeRate)
+post_delete.connect(refresh_exchange_rates, sender=ExchangeRate)
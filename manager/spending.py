@@ -0,0 +1,137 @@
+from datetime import date
+from typing import Any
+
+from django.core.cache import cache
+from django.db.models import Count, Q, QuerySet, Sum
+
+from manager.cache import cached_wallet_objects, user_data_version
+from manager.currencies import currencies
+from manager.models import Accountancy, Card, Cash, Cryptocurrency
+from manager.money import from_minor
+from manager.wallet_operations import date_range_filter
+
+SPENDING_CACHE_TIMEOUT = 60 * 60
+
+
+def spending_query(wallets: Q, start: date | None, end: date | None) -> QuerySet:
+    """Return one grouped query of the total amount and number of records per wallet, direction and category."""
+    return (
+        Accountancy.objects.filter(wallets & date_range_filter(start, end))
+        .order_by()
+        .values("card_id", "cash_id", "cryptocurrency_id", "IO", "category_id", "category__name", "category__icon")
+        .annotate(total=Sum("amount"), transactions=Count("id"))
+    )
+
+
+def _wallet_info(wallet: Card | Cash | Cryptocurrency) -> dict[str, Any]:
+    if isinstance(wallet, Cryptocurrency):
+        return {"wallet": f"crypto - {wallet.id}", "name": wallet.name, "currency": wallet.name}  # type: ignore[reportAttributeAccessIssue]
+    currency = currencies.get(wallet.currency_id).abbreviation  # type: ignore[reportAttributeAccessIssue]
+    if isinstance(wallet, Card):
+        return {"wallet": f"card - {wallet.id}", "name": f"{wallet.bank_name} - {wallet.type}", "currency": currency}  # type: ignore[reportAttributeAccessIssue]
+    return {"wallet": f"cash - {wallet.id}", "name": "Cash", "currency": currency}  # type: ignore[reportAttributeAccessIssue]
+
+
+def _breakdown(rows: QuerySet, wallets: dict[str, Card | Cash | Cryptocurrency]) -> dict[str, Any]:
+    # Totals are summed in minor units and only converted at the end; amounts of different currencies are
+    # never added up, so the per-category and per-direction totals are keyed by currency.
+    per_wallet: dict[str, dict[str, Any]] = {}
+    per_category: dict[int, dict[str, Any]] = {}
+    per_io: dict[str, dict[str, int]] = {Accountancy.INCOME: {}, Accountancy.OUTCOME: {}}
+    decimal_places: dict[str, int] = {}
+
+    for row in rows:
+        if row["card_id"]:
+            key = f"card - {row['card_id']}"
+        elif row["cash_id"]:
+            key = f"cash - {row['cash_id']}"
+        else:
+            key = f"crypto - {row['cryptocurrency_id']}"
+        if key not in per_wallet:
+            per_wallet[key] = {**_wallet_info(wallets[key]), "I": 0, "O": 0, "categories": {}}
+        wallet = per_wallet[key]
+        currency = wallet["currency"]
+        decimal_places[currency] = wallets[key].decimal_places
+
+        wallet[row["IO"]] += row["total"]
+        wallet_category = wallet["categories"].setdefault(
+            row["category_id"],
+            {"id": row["category_id"], "name": row["category__name"], "amount": 0, "transactions": 0},
+        )
+        wallet_category["amount"] += row["total"]
+        wallet_category["transactions"] += row["transactions"]
+
+        category = per_category.setdefault(
+            row["category_id"],
+            {
+                "id": row["category_id"],
+                "name": row["category__name"],
+                "icon": row["category__icon"],
+                "IO": row["IO"],
+                "totals": {},
+                "transactions": 0,
+            },
+        )
+        category["totals"][currency] = category["totals"].get(currency, 0) + row["total"]
+        category["transactions"] += row["transactions"]
+        per_io[row["IO"]][currency] = per_io[row["IO"]].get(currency, 0) + row["total"]
+
+    def amount(units: int, currency: str) -> str:
+        return str(from_minor(units, decimal_places[currency]))
+
+    return {
+        "wallets": [
+            {
+                **{field: wallet[field] for field in ("wallet", "name", "currency")},
+                "income": amount(wallet["I"], wallet["currency"]),
+                "outcome": amount(wallet["O"], wallet["currency"]),
+                "categories": [
+                    {**category, "amount": amount(category["amount"], wallet["currency"])}
+                    for category in wallet["categories"].values()
+                ],
+            }
+            for wallet in per_wallet.values()
+        ],
+        "categories": [
+            {
+                **category,
+                "totals": {currency: amount(units, currency) for currency, units in category["totals"].items()},
+            }
+            for category in sorted(per_category.values(), key=lambda category: category["id"])
+        ],
+        "IO": {
+            io: {currency: amount(units, currency) for currency, units in totals.items()}
+            for io, totals in per_io.items()
+        },
+    }
+
+
+def spending_breakdown(user_id: int, start: date | None = None, end: date | None = None) -> dict[str, Any]:
+    """Return the user's income and outcome totals per category, direction and wallet as a JSON-ready dict.
+
+    The totals come from a single grouped query and are cached until the user's data version changes, i.e.
+    until a transaction is posted, edited or deleted, or a wallet changes.
+    """
+    key = f"zlatnic:user:{user_id}:spending:{user_data_version(user_id)}:{start}:{end}"
+    breakdown = cache.get(key)
+    if breakdown is not None:
+        return breakdown
+
+    cards, cash, crypto = cached_wallet_objects(user_id)
+    wallets: dict[str, Card | Cash | Cryptocurrency] = {
+        **{f"card - {wallet.id}": wallet for wallet in cards},  # type: ignore[reportAttributeAccessIssue]
+        **{f"cash - {wallet.id}": wallet for wallet in cash},  # type: ignore[reportAttributeAccessIssue]
+        **{f"crypto - {wallet.id}": wallet for wallet in crypto},  # type: ignore[reportAttributeAccessIssue]
+    }
+    wallet_ids = (
+        Q(card_id__in=[wallet.id for wallet in cards])  # type: ignore[reportAttributeAccessIssue]
+        | Q(cash_id__in=[wallet.id for wallet in cash])  # type: ignore[reportAttributeAccessIssue]
+        | Q(cryptocurrency_id__in=[wallet.id for wallet in crypto])  # type: ignore[reportAttributeAccessIssue]
+    )
+    breakdown = {
+        "start": start.isoformat() if start else None,
+        "end": end.isoformat() if end else None,
+        **_breakdown(spending_query(wallet_ids, start, end), wallets),
+    }
+    cache.set(key, breakdown, SPENDING_CACHE_TIMEOUT)
+    return breakdown
@@ -0,0 +1,169 @@
+import csv
+import re
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, tzinfo
+from decimal import Decimal, InvalidOperation
+from itertools import batched
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from manager.cache import bump_user_data_version
+from manager.models import Accountancy, Category, MonthlyTurnover
+from manager.money import to_minor
+from manager.wallet_operations import WALLET_MODELS
+
+IMPORT_BATCH_SIZE = 1000
+# Larger uploads are imported by a background job instead of the request
+IMPORT_SYNC_MAX_SIZE = 1024 * 1024
+DEFAULT_IO_TYPE = "Other"
+
+OFX_TAG = re.compile(r"<(/?)([A-Z0-9.]+)>([^<]*)")
+OFX_DATETIME = re.compile(r"(\d{8})(\d{6})?")
+
+
+@dataclass(frozen=True, slots=True)
+class StatementRow:
+    datetime: datetime
+    IO: str
+    IO_type: str
+    amount: Decimal
+
+
+def _amount(value: str, line: int) -> Decimal:
+    try:
+        amount = Decimal(value.strip().replace(",", "."))
+    except InvalidOperation:
+        amount = None
+    # NaN can't be compared, the infinities have no minor units
+    if amount is None or not amount.is_finite():
+        raise ValidationError(f"Line {line}: '{value}' is not a valid amount.")
+    return amount
+
+
+def _row(moment: datetime, amount: Decimal, io: str | None, io_type: str | None, tz: tzinfo) -> StatementRow:
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment, tz)
+    if not io:
+        io = Accountancy.OUTCOME if amount < 0 else Accountancy.INCOME
+    return StatementRow(moment, io, (io_type or DEFAULT_IO_TYPE)[:50], abs(amount))
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[StatementRow]:
+    """Stream rows of a CSV statement with `datetime`, `amount` and optional `IO`, `IO_type` columns.
+
+    Without an `IO` column negative amounts are booked as outcomes and positive ones as incomes.
+    """
+    tz = timezone.get_current_timezone()
+    reader = csv.DictReader(lines)
+    if not reader.fieldnames or not {"datetime", "amount"} <= set(reader.fieldnames):
+        raise ValidationError("The CSV statement must have 'datetime' and 'amount' columns.")
+
+    for row in reader:
+        # The cells missing from a short row are `None`
+        value = row["datetime"] or ""
+        try:
+            moment = parse_datetime(value.strip())
+        except ValueError:
+            moment = None
+        if moment is None:
+            raise ValidationError(f"Line {reader.line_num}: '{value}' is not a valid date.")
+        io = (row.get("IO") or "").strip()[:1].upper()
+        if io and io not in Accountancy.IN_OUT_COME:
+            raise ValidationError(f"Line {reader.line_num}: '{row['IO']}' is neither income nor outcome.")
+        yield _row(moment, _amount(row["amount"] or "", reader.line_num), io, (row.get("IO_type") or "").strip(), tz)
+
+
+def read_ofx(lines: Iterable[str]) -> Iterator[StatementRow]:
+    """Stream the `<STMTTRN>` transactions of an OFX (SGML or XML) statement."""
+    tz = timezone.get_current_timezone()
+    transaction_tags: dict[str, str] | None = None
+    for line_number, line in enumerate(lines, start=1):
+        for closing, tag, value in OFX_TAG.findall(line):
+            if tag == "STMTTRN":
+                if closing and transaction_tags is not None:
+                    yield _ofx_row(transaction_tags, line_number, tz)
+                transaction_tags = None if closing else {}
+            elif transaction_tags is not None and not closing:
+                transaction_tags[tag] = value.strip()
+
+
+def _ofx_row(tags: dict[str, str], line: int, tz: tzinfo) -> StatementRow:
+    posted = OFX_DATETIME.match(tags.get("DTPOSTED", ""))
+    if "TRNAMT" not in tags or posted is None:
+        raise ValidationError(f"Line {line}: the transaction has no amount or posting date.")
+    try:
+        moment = datetime.strptime(posted.group(1) + (posted.group(2) or "000000"), "%Y%m%d%H%M%S")  # noqa: DTZ007
+    except ValueError:
+        raise ValidationError(f"Line {line}: '{tags['DTPOSTED']}' is not a valid posting date.") from None
+    return _row(moment, _amount(tags["TRNAMT"], line), None, None, tz)
+
+
+class StatementCategories:
+    """Resolve the `IO_type` names of statement rows to the user's categories, creating the unknown ones."""
+
+    def __init__(self, user_id: int) -> None:
+        self.user_id = user_id
+        self.ids = {
+            (io, name.lower()): category_id
+            for category_id, io, name in Category.objects.for_user(user_id).values_list("id", "IO", "name")
+        }
+
+    def get(self, io: str, name: str) -> int:
+        key = (io, name.lower())
+        if key not in self.ids:
+            self.ids[key] = Category.objects.create(user_id=self.user_id, IO=io, name=name).id  # type: ignore[reportAttributeAccessIssue]
+        return self.ids[key]
+
+
+def import_statement(
+    rows: Iterable[StatementRow], wallet_type: str, wallet_id: int, batch_size: int = IMPORT_BATCH_SIZE
+) -> int:
+    """Insert statement rows into a wallet's accountancy and apply their net sum to its balance.
+
+    Rows are inserted with batched `bulk_create`, while only the per-month turnover, the net balance delta
+    and the category ids are kept in memory, so the whole import runs in one transaction with a flat memory
+    footprint.
+    """
+    model = WALLET_MODELS[wallet_type]
+    wallet_lookup: dict[str, int | None] = {f"{model._meta.model_name}_id": wallet_id}
+    turnover: defaultdict[tuple[str, date], list[int]] = defaultdict(lambda: [0, 0])
+    net = 0
+    imported = 0
+    tz = timezone.get_current_timezone()
+
+    with transaction.atomic():
+        wallet = model.objects.select_for_update().get(id=wallet_id)
+        categories = StatementCategories(wallet.user_id)  # type: ignore[reportAttributeAccessIssue]
+        for batch in batched(rows, batch_size, strict=False):
+            records = [
+                Accountancy(
+                    **wallet_lookup,
+                    IO=row.IO,
+                    category_id=categories.get(row.IO, row.IO_type),
+                    amount=to_minor(row.amount, wallet.decimal_places),
+                    datetime=row.datetime,
+                )
+                for row in batch
+            ]
+            Accountancy.objects.bulk_create(records)
+            for record in records:
+                net += record.amount if record.IO == Accountancy.INCOME else -record.amount
+                month_turnover = turnover[record.IO, timezone.localtime(record.datetime, tz).date().replace(day=1)]
+                month_turnover[0] += record.amount
+                month_turnover[1] += 1
+            imported += len(batch)
+
+        if wallet.balance + net < 0:
+            raise ValidationError("There's too small amount of money on the balance")
+        model.objects.filter(id=wallet_id).update(balance=F("balance") + net)
+        for (io, month), (amount, transactions) in turnover.items():
+            MonthlyTurnover.objects.add(wallet_lookup, io, month, amount, transactions)
+        bump_user_data_version(wallet.user_id)
+
+    return imported
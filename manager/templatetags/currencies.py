@@ -0,0 +1,32 @@
+from decimal import Decimal
+
+from django import template
+
+from manager.currencies import currencies
+from manager.exchange_rates import convert
+from manager.models import Card, Cash, Cryptocurrency
+from manager.money import CRYPTO_DECIMAL_PLACES, from_minor
+
+register = template.Library()
+
+
+@register.filter
+def currency_sign(currency_id: int) -> str:
+    return currencies.get(currency_id).sign
+
+
+@register.filter
+def currency_name(currency_id: int) -> str:
+    return currencies.get(currency_id).name
+
+
+@register.filter
+def minor_units(units: int, currency_id: int | None) -> Decimal:
+    """Render an amount stored in minor units of the currency, or in those of cryptocurrencies without one."""
+    return from_minor(units, currencies.get(currency_id).decimal_places if currency_id else CRYPTO_DECIMAL_PLACES)
+
+
+@register.filter
+def base_value(wallet: Card | Cash | Cryptocurrency) -> Decimal | None:
+    """Value of the wallet balance in the base currency, `None` without an exchange rate."""
+    return convert(wallet)
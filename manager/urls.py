@@ -9,17 +9,26 @@ from .views import (
     CashCreateView,
     CashDeleteView,
     CashUpdateView,
+    CategoryCreateView,
     CryptoCreateView,
     CryptoDeleteView,
     CryptoUpdateView,
     MonthlyAccountancy,
     MonthlyAccountancyList,
+    accountancy_analytics,
+    accountancy_export,
+    balance_history,
     index,
+    job_status,
+    spending,
+    statement_import,
+    transfer,
     wallets,
 )
 
 urlpatterns = [
     path("wallets/", wallets, name="wallets"),
+    path("wallets/transfer/", transfer, name="transfer"),
     path("wallets/card/", CardCreateView.as_view(), name="card-create"),
     path("wallets/card/update/<int:pk>/", CardUpdateView.as_view(), name="card-update"),
     path("wallets/card/delete/<int:pk>/", CardDeleteView.as_view(), name="card-delete"),
@@ -38,6 +47,7 @@ urlpatterns = [
         name="crypto-delete",
     ),
     path("", index, name="index"),
+    path("categories/", CategoryCreateView.as_view(), name="category-create"),
     path(
         "accountancy/",
         MonthlyAccountancyList.as_view(),
@@ -48,6 +58,20 @@ urlpatterns = [
         MonthlyAccountancy.as_view(),
         name="monthly-accountancy",
     ),
+    path(
+        "accountancy/analytics/<str:wallet>/<int:wallet_id>/",
+        accountancy_analytics,
+        name="accountancy-analytics",
+    ),
+    path(
+        "accountancy/balance/<str:wallet>/<int:wallet_id>/",
+        balance_history,
+        name="balance-history",
+    ),
+    path("accountancy/import/", statement_import, name="statement-import"),
+    path("accountancy/export/", accountancy_export, name="accountancy-export"),
+    path("accountancy/spending/", spending, name="spending"),
+    path("jobs/<int:pk>/", job_status, name="job-status"),
     path(
         "accountancy/update/<int:pk>/",
         AccountancyUpdate.as_view(),
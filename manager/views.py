@@ -1,43 +1,112 @@
+import asyncio
+import math
+from collections.abc import Iterable
+from datetime import MAXYEAR, MINYEAR, timedelta
+from decimal import Decimal
+from io import TextIOWrapper
 from typing import Any, cast
+from uuid import uuid4
 
 from django.contrib.auth.decorators import login_required
-from django.contrib.auth.mixins import LoginRequiredMixin
+from django.contrib.auth.mixins import AccessMixin, LoginRequiredMixin
+from django.contrib.auth.views import redirect_to_login
 from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
 from django.core.handlers.wsgi import WSGIRequest
-from django.db.models import Manager, Q, QuerySet, Sum
-from django.db.models.functions import Round, TruncMonth
-from django.http.response import HttpResponse
-from django.shortcuts import render
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Coalesce
+from django.forms import modelform_factory
+from django.http import Http404, HttpRequest, HttpResponseRedirect, JsonResponse
+from django.http.response import HttpResponse, HttpResponseBase, StreamingHttpResponse
+from django.shortcuts import get_object_or_404, render
+from django.template.response import TemplateResponse
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views import generic
 
-from manager.forms import AccountancyForm, AccountancySearchForm
-from manager.models import Accountancy, Card, Cash, Cryptocurrency
-from manager.wallet_operations import change_wallet_balance, monthly_financial_turnover, wallet_choice
-
-
-def wallet_objects(request: WSGIRequest) -> tuple[QuerySet, QuerySet, QuerySet]:
-    user = request.user
-    cards = user.cards.select_related("currency")  # type: ignore[reportAttributeAccessIssue]
-    cash_types = user.cash.select_related("currency")  # type: ignore[reportAttributeAccessIssue]
-    crypto = user.cryptocurrencies.all()  # type: ignore[reportAttributeAccessIssue]
-
-    return cards, cash_types, crypto
+from manager.accountancy_export import EXPORT_FORMATS, export_lines, user_accountancy
+from manager.analytics import ROLLING_WINDOWS, analyze_spending, load_spending
+from manager.balance_history import BALANCE_HISTORY_DAYS, balance_at, daily_balances
+from manager.cache import acached_wallet_objects, afragment_cache_context, cached_wallet_objects
+from manager.conditional import page_validators
+from manager.exchange_rates import anet_worth, exchange_rates
+from manager.forms import (
+    AccountancyExportForm,
+    AccountancyForm,
+    AccountancySearchForm,
+    BalanceHistoryForm,
+    CategoryForm,
+    DateRangeForm,
+    StatementImportForm,
+    TransferForm,
+    WalletForm,
+)
+from manager.jobs import enqueue
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, Job, MonthlyTurnover
+from manager.money import from_minor, to_minor
+from manager.pagination import CursorPage, CursorPaginationMixin
+from manager.spending import spending_breakdown
+from manager.statement_import import IMPORT_SYNC_MAX_SIZE, import_statement, read_csv, read_ofx
+from manager.wallet_operations import (
+    WALLET_MODELS,
+    amonthly_financial_turnover,
+    apost_transaction,
+    awallet_decimal_places,
+    delete_transaction,
+    monthly_wallet_accountancy,
+    post_transfer,
+    wallet_filter,
+)
+
+
+def wallet_objects(request: WSGIRequest) -> tuple[list[Card], list[Cash], list[Cryptocurrency]]:
+    return cached_wallet_objects(request.user.id)  # type: ignore[reportAttributeAccessIssue]
+
+
+def wallet_options(
+    cards: Iterable[Card], cash_types: Iterable[Cash], crypto: Iterable[Cryptocurrency]
+) -> list[list[str | Card | Cash | Cryptocurrency]]:
+    """Return `[value, wallet]` pairs with the `"<type> - <id>"` values posted as `wallet_choice`."""
+    return [
+        *([f"card - {card.id}", card] for card in cards),
+        *([f"cash - {cash.id}", cash] for cash in cash_types),
+        *([f"crypto - {cryptocurrency.id}", cryptocurrency] for cryptocurrency in crypto),
+    ]
 
 
 @login_required
-def wallets(request: WSGIRequest) -> HttpResponse:
-    cards, cash_types, crypto = wallet_objects(request)
+async def wallets(request: HttpRequest) -> HttpResponseBase:
+    request.user = user = await request.auser()
+    # The net worth is converted with the latest rate snapshot, so the page changes with it too
+    validators = await page_validators(request, (await exchange_rates.asnapshot()).date)
+    if response := validators.not_modified(request):
+        return response
+
+    (cards, cash_types, crypto), net_worth, fragment_cache_context = await asyncio.gather(
+        acached_wallet_objects(user.id),  # type: ignore[reportArgumentType]
+        anet_worth(user.id),  # type: ignore[reportArgumentType]
+        afragment_cache_context(user.id),  # type: ignore[reportArgumentType]
+    )
 
     context = {
         "cards_list": cards,
         "cash_list": cash_types,
         "crypto_list": crypto,
+        "net_worth": net_worth,
+        **fragment_cache_context,
     }
-    return render(request, "manager/wallets.html", context)
+    # Unlike `render()`, the response is rendered by the handler, in a thread where templates may use the ORM
+    return validators.apply(TemplateResponse(request, "manager/wallets.html", context))
+
+
+class WalletFormMixin:
+    """Build the wallet form of the view's fields on `WalletForm`, with the currencies of the registry."""
 
+    def get_form_class(self) -> Any:
+        return modelform_factory(self.model, form=WalletForm, fields=self.fields)  # type: ignore[reportAttributeAccessIssue]
 
-class CardCreateView(LoginRequiredMixin, generic.CreateView):
+
+class CardCreateView(LoginRequiredMixin, WalletFormMixin, generic.CreateView):
     model = Card
     fields = (
         "user",
@@ -49,7 +118,17 @@ class CardCreateView(LoginRequiredMixin, generic.CreateView):
     success_url = reverse_lazy("manager:wallets")
 
 
-class CardUpdateView(LoginRequiredMixin, generic.UpdateView):
+class WalletCurrencyMixin(WalletFormMixin):
+    """Keep the currency of a wallet that has money or records, which are in minor units of that currency."""
+
+    def get_form_class(self) -> Any:
+        wallet = self.object  # type: ignore[reportAttributeAccessIssue]
+        if wallet.balance or wallet.accountancy.exists() or wallet.recurring_transactions.exists():
+            self.fields = tuple(field for field in self.fields if field != "currency")  # type: ignore[reportAttributeAccessIssue]
+        return super().get_form_class()  # type: ignore[reportAttributeAccessIssue]
+
+
+class CardUpdateView(LoginRequiredMixin, WalletCurrencyMixin, generic.UpdateView):
     model = Card
     fields = (
         "user",
@@ -65,7 +144,7 @@ class CardDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("manager:wallets")
 
 
-class CashCreateView(LoginRequiredMixin, generic.CreateView):
+class CashCreateView(LoginRequiredMixin, WalletFormMixin, generic.CreateView):
     model = Cash
     fields = (
         "user",
@@ -74,7 +153,7 @@ class CashCreateView(LoginRequiredMixin, generic.CreateView):
     success_url = reverse_lazy("manager:wallets")
 
 
-class CashUpdateView(LoginRequiredMixin, generic.UpdateView):
+class CashUpdateView(LoginRequiredMixin, WalletCurrencyMixin, generic.UpdateView):
     model = Cash
     fields = (
         "user",
@@ -111,115 +190,279 @@ class CryptoDeleteView(LoginRequiredMixin, generic.DeleteView):
     success_url = reverse_lazy("manager:wallets")
 
 
+class CategoryCreateView(LoginRequiredMixin, generic.CreateView):
+    model = Category
+    form_class = CategoryForm
+    success_url = reverse_lazy("manager:index")
+
+    def get_form(self, form_class: type[CategoryForm] | None = None) -> CategoryForm:
+        form = super().get_form(form_class)
+        form.instance.user = self.request.user
+        return form
+
+
 @login_required
-def index(request: WSGIRequest) -> HttpResponse:
+async def index(request: HttpRequest) -> HttpResponse:
     """Function-based view for the base page of the site."""
-    wallets_set: list[list[str | Card | Cash | Cryptocurrency]] = []
     error = False
     income = outcome = 0
-    accountancy = Accountancy.objects
-
-    cards, cash_types, crypto = wallet_objects(request)
-
-    if cards:
-        wallets_set.extend([f"card - {card.id}", card] for card in cards)
 
-    if cash_types:
-        wallets_set.extend([f"cash - {cash.id}", cash] for cash in cash_types)
-
-    if crypto:
-        wallets_set.extend([f"crypto - {crypto.id}", crypto] for crypto in crypto)
+    request.user = user = await request.auser()
+    wallets_set = wallet_options(*await acached_wallet_objects(user.id))  # type: ignore[reportArgumentType]
+    # Transfers are made on their own page, so that both of their records are posted
+    categories = {
+        category.id: category
+        async for category in Category.objects.for_user(user.id).exclude(user=None, name=Category.TRANSFER)  # type: ignore[reportArgumentType]
+    }
 
     if request.POST.get("wallet_choice"):
-        wallets_set, error, income, outcome = process_wallet_post(request, wallets_set, accountancy)
+        wallets_set, error, income, outcome = await process_wallet_post(request, wallets_set, categories)
+
+    current_balance = Decimal(0)
+    if wallets_set and not isinstance(wallets_set[0][1], str):
+        wallet = wallets_set[0][1]
+        current_balance = from_minor(wallet.balance, await awallet_decimal_places(wallet))
 
+    outcome_categories = [category for category in categories.values() if category.IO == Accountancy.OUTCOME]
+    # The outcome buttons are split between the panels on both sides of the balance
+    half = (len(outcome_categories) + 1) // 2
     context = {
         "wallets": wallets_set,
-        "current_balance": wallets_set[0][1].balance if wallets_set and not isinstance(wallets_set[0][1], str) else 0,
+        "current_balance": current_balance,
         "Income": income,
         "Outcome": outcome,
         "error": error,
+        "income_categories": [category for category in categories.values() if category.IO == Accountancy.INCOME],
+        "outcome_categories": (outcome_categories[:half], outcome_categories[half:]),
+        **await afragment_cache_context(user.id),  # type: ignore[reportArgumentType]
     }
 
-    return render(request, "manager/index.html", context=context)
+    return TemplateResponse(request, "manager/index.html", context=context)
 
 
-def process_wallet_post(
-    request: WSGIRequest, wallets_set: list[list[str | Card | Cash | Cryptocurrency]], accountancy: Manager[Accountancy]
-) -> tuple[list[list[str | Card | Cash | Cryptocurrency]], ValidationError | None, float, float]:
+async def process_wallet_post(
+    request: HttpRequest,
+    wallets_set: list[list[str | Card | Cash | Cryptocurrency]],
+    categories: dict[int, Category],
+) -> tuple[list[list[str | Card | Cash | Cryptocurrency]], ValidationError | None, Decimal, Decimal]:
     error = None
     wallet_type, wallet_id = request.POST["wallet_choice"].split(" - ")
-    q_filter, wallet_obj = wallet_choice(wallet_type, int(wallet_id))
+    q_filter = wallet_filter(wallet_type, int(wallet_id))
+
+    # Move selected wallet at the top
+    for wallet_index, wallet in enumerate(wallets_set):
+        if wallet[0] == request.POST["wallet_choice"]:
+            wallets_set.insert(0, wallets_set.pop(wallet_index))
+            break
+    else:
+        return wallets_set, ValidationError("There's no such wallet."), Decimal(0), Decimal(0)
+    wallet_obj = cast("Card | Cash | Cryptocurrency", wallets_set[0][1])
+    decimal_places = await awallet_decimal_places(wallet_obj)
 
     if ("Outcome" in request.POST or request.POST["Income"] != "none") and request.POST["amount"]:
-        amount = float(request.POST["amount"])
         expense = "Outcome" if "Outcome" in request.POST else "Income"
 
         try:
-            wallet_obj = change_wallet_balance(expense, wallet_obj, amount)
-
-            acc_data = {
-                "IO": expense[0],
-                "IO_type": request.POST[expense],
-                "amount": amount,
-            }
-
-            if wallet_type == "card":
-                accountancy.create(card=wallet_obj, **acc_data)
-            elif wallet_type == "cash":
-                accountancy.create(cash=wallet_obj, **acc_data)
-            elif wallet_type == "crypto":
-                accountancy.create(cryptocurrency=wallet_obj, **acc_data)
-            wallet_obj.save()
-
+            category = categories.get(int(request.POST[expense])) if request.POST[expense].isdigit() else None
+            if category is None or category.IO != expense[0]:
+                raise ValidationError("There's no such category.")
+            amount = to_minor(request.POST["amount"], decimal_places)
+            wallet_obj.balance = await apost_transaction(wallet_type, int(wallet_id), expense[0], category.id, amount)
         except ValidationError as ve:
             error = ve
 
-    # Move selected wallet at the top
-    for wallet_index, wallet in enumerate(wallets_set):
-        if wallet[0] == request.POST["wallet_choice"]:
-            wallets_set.insert(0, wallets_set.pop(wallet_index))
-            wallets_set[0][1] = wallet_obj
-            break
-
     # Get monthly incomes and outcomes
-    income = monthly_financial_turnover(q_filter, "I")
-    outcome = monthly_financial_turnover(q_filter, "O")
+    income, outcome = await asyncio.gather(
+        amonthly_financial_turnover(q_filter, "I"), amonthly_financial_turnover(q_filter, "O")
+    )
 
-    return wallets_set, error, income, outcome
+    return (
+        wallets_set,
+        error,
+        from_minor(income, decimal_places),
+        from_minor(outcome, decimal_places),
+    )
 
 
-class MonthlyAccountancyList(LoginRequiredMixin, generic.ListView):
-    model: type[Accountancy] = Accountancy  # type: ignore[reportIncompatibleVariableOverride]
+@login_required
+def statement_import(request: WSGIRequest) -> HttpResponse:
+    """Import a bank statement file into the accountancy of one of the user's wallets.
+
+    Files over `IMPORT_SYNC_MAX_SIZE` are saved and imported by a background job instead.
+    """
+    imported = job = None
+    form = StatementImportForm(
+        request.POST or None, request.FILES or None, wallets=wallet_options(*wallet_objects(request))
+    )
+
+    if request.method == "POST" and form.is_valid():
+        wallet_type, wallet_id = form.cleaned_data["wallet_choice"].split(" - ")
+        statement = form.cleaned_data["statement"]
+        is_ofx = statement.name.lower().endswith(".ofx")
+        if statement.size > IMPORT_SYNC_MAX_SIZE:
+            path = default_storage.save(f"statements/{uuid4().hex}.{'ofx' if is_ofx else 'csv'}", statement)
+            job = enqueue(
+                "import_statement",
+                {"path": path, "wallet": wallet_type, "wallet_id": int(wallet_id)},
+                request.user.id,  # type: ignore[reportArgumentType]
+            )
+        else:
+            reader = read_ofx if is_ofx else read_csv
+            try:
+                imported = import_statement(
+                    reader(TextIOWrapper(statement.file, encoding="utf-8-sig", newline="")),
+                    wallet_type,
+                    int(wallet_id),
+                )
+            except ValidationError as ve:
+                form.add_error(None, ve)
+
+    return render(request, "manager/statement_import.html", context={"form": form, "imported": imported, "job": job})
+
+
+@login_required
+def transfer(request: WSGIRequest) -> HttpResponse:
+    """Move money between two of the user's wallets."""
+    form = TransferForm(request.POST or None, wallets=wallet_options(*wallet_objects(request)))
+
+    if request.method == "POST" and form.is_valid():
+        source, destination = form.cleaned_data["source"], form.cleaned_data["destination"]
+        received = form.cleaned_data["received"]
+        try:
+            post_transfer(
+                request.user.id,  # type: ignore[reportArgumentType]
+                (source.split(" - ")[0], int(source.split(" - ")[1])),
+                (destination.split(" - ")[0], int(destination.split(" - ")[1])),
+                to_minor(form.cleaned_data["amount"], form.wallets[source].decimal_places),
+                None if received is None else to_minor(received, form.wallets[destination].decimal_places),
+            )
+        except ValidationError as ve:
+            form.add_error(None, ve)
+        else:
+            return HttpResponseRedirect(reverse_lazy("manager:wallets"))
+
+    return render(request, "manager/transfer.html", context={"form": form})
+
+
+@login_required
+def job_status(request: WSGIRequest, pk: int) -> JsonResponse:
+    """Poll the status of one of the user's background jobs."""
+    job = get_object_or_404(Job, pk=pk, user_id=request.user.id)
+    return JsonResponse(
+        {
+            "id": job.id,  # type: ignore[reportAttributeAccessIssue]
+            "name": job.name,
+            "status": job.status,
+            "result": job.result,
+            "error": job.error,
+            "created_at": job.created_at,
+            "started_at": job.started_at,
+            "finished_at": job.finished_at,
+        }
+    )
+
+
+@login_required
+def accountancy_export(request: WSGIRequest) -> HttpResponse | StreamingHttpResponse:
+    """Stream the user's whole (or date/wallet filtered) accountancy history as CSV or NDJSON."""
+    wallets = wallet_options(*wallet_objects(request))
+    form = AccountancyExportForm(request.GET or None, wallets=wallets)
+    if not form.is_valid():
+        return render(request, "manager/accountancy_export.html", context={"form": form})
+
+    wallet_type, _, wallet_id = form.cleaned_data["wallet_choice"].partition(" - ")
+    queryset = user_accountancy(
+        request.user.id,  # type: ignore[reportAttributeAccessIssue]
+        form.cleaned_data["start"],
+        form.cleaned_data["end"],
+        wallet_type,
+        int(wallet_id or 0),
+    )
+    export_format = form.cleaned_data["format"]
+    decimal_places = {value: wallet.decimal_places for value, wallet in wallets}
+    categories = dict(Category.objects.for_user(request.user.id).values_list("id", "name"))  # type: ignore[reportArgumentType]
+    response = StreamingHttpResponse(
+        export_lines(queryset, export_format, decimal_places, categories),  # type: ignore[reportArgumentType]
+        content_type=EXPORT_FORMATS[export_format],
+    )
+    response["Content-Disposition"] = f'attachment; filename="zlatnic-accountancy.{export_format}"'
+    return response
+
+
+@login_required
+def spending(request: WSGIRequest) -> JsonResponse:
+    """Income and outcome totals per category, direction and wallet for charts, of the current month by default."""
+    form = DateRangeForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    start, end = form.cleaned_data["start"], form.cleaned_data["end"]
+    if not start and not end:
+        start = timezone.localdate().replace(day=1)
+    return JsonResponse(spending_breakdown(request.user.id, start, end))  # type: ignore[reportArgumentType]
+
+
+class AsyncLoginRequiredMixin(AccessMixin):
+    """`LoginRequiredMixin` for class-based views with async handlers."""
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        request.user = await request.auser()
+        if not request.user.is_authenticated:
+            return redirect_to_login(request.get_full_path(), self.get_login_url(), self.get_redirect_field_name())
+        return await super().dispatch(request, *args, **kwargs)  # type: ignore[reportAttributeAccessIssue]
+
+
+class ConditionalPageMixin:
+    """Answer the conditional GETs of a page that only changes with the user's data before its view runs."""
+
+    async def dispatch(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if request.method not in ("GET", "HEAD") or not (await request.auser()).is_authenticated:
+            return await super().dispatch(request, *args, **kwargs)  # type: ignore[reportAttributeAccessIssue]
+        validators = await page_validators(request)
+        if response := validators.not_modified(request):
+            return response
+        return validators.apply(await super().dispatch(request, *args, **kwargs))  # type: ignore[reportAttributeAccessIssue]
+
+
+class AsyncCursorListView(AsyncLoginRequiredMixin, CursorPaginationMixin, generic.ListView):
+    """`ListView` that fetches its cursor page with the async ORM."""
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        self.object_list = self.get_queryset()
+        self.page = await self.apaginate_queryset(self.object_list, self.get_paginate_by(self.object_list))  # type: ignore[reportArgumentType]
+        return self.render_to_response(self.get_context_data())
+
+    def paginate_queryset(self, queryset: QuerySet, page_size: int) -> tuple[None, CursorPage, list, bool]:
+        return self.page
+
+
+class MonthlyAccountancyList(ConditionalPageMixin, AsyncCursorListView):
+    model: type[MonthlyTurnover] = MonthlyTurnover  # type: ignore[reportIncompatibleVariableOverride]
     template_name = "manager/monthly_accountancy_list.html"
+    context_object_name = "accountancy_list"
     paginate_by = 10
+    # Each rollup row is one wallet's incomes or outcomes of a month, so its id orders the wallets within a month
+    cursor_ordering = ("-month", "-id")
 
     def get_queryset(self) -> QuerySet:
         user_id = self.request.user.id  # type: ignore[reportAttributeAccessIssue]
 
-        # Get month expenses
+        # Get month expenses from the rollup maintained on every accountancy write
         self.queryset = cast(
             "QuerySet",
             self.model.objects.filter(Q(card__user=user_id) | Q(cash__user=user_id) | Q(cryptocurrency__user=user_id))
-            .annotate(
-                month=TruncMonth("datetime"),
-            )
-            .values("month")
-            .annotate(
-                amount_sum=Round(Sum("amount"), 8),
-            )
             .values(
+                "id",
                 "card_id",
                 "card__bank_name",
                 "card__type",
-                "card__currency__sign",
                 "cash_id",
-                "cash__currency__name",
                 "cryptocurrency_id",
                 "cryptocurrency__name",
                 "IO",
                 "amount_sum",
                 "month",
+                currency_id=Coalesce("card__currency_id", "cash__currency_id"),
             )
             .order_by("-month"),
         )
@@ -227,46 +470,167 @@ class MonthlyAccountancyList(LoginRequiredMixin, generic.ListView):
         return self.queryset
 
 
-class MonthlyAccountancy(LoginRequiredMixin, generic.ListView):
+class MonthlyAccountancy(ConditionalPageMixin, AsyncCursorListView):
     model: type[Accountancy] = Accountancy  # type: ignore[reportIncompatibleVariableOverride]
     template_name = "manager/monthly_accountancy.html"
     paginate_by = 10
+    cursor_ordering = ("-datetime", "-id")
+
+    async def get(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
+        # The month after the last one of `MAXYEAR` can't be a `datetime`
+        if (
+            kwargs["wallet"] not in WALLET_MODELS
+            or not 1 <= kwargs["month"] <= 12
+            or not MINYEAR <= kwargs["year"] < MAXYEAR
+        ):
+            raise Http404
+        # The amounts are in minor units of the wallet currency, cryptocurrencies have none
+        self.currency_id = None
+        if kwargs["wallet"] != "crypto":
+            self.currency_id = (
+                await WALLET_MODELS[kwargs["wallet"]]
+                .objects.filter(id=kwargs["wallet_id"])
+                .values_list("currency_id", flat=True)
+                .afirst()
+            )
+        return await super().get(request, *args, **kwargs)
 
     def get_context_data(self, **kwargs: Any) -> dict[str, Any]:
         context = super().get_context_data(**kwargs)
         io_type = self.request.GET.get("IO_type", "")
         context["search_form"] = AccountancySearchForm(initial={"IO_type": io_type})
+        context["currency_id"] = self.currency_id
 
         return context
 
     def get_queryset(self) -> QuerySet:
         details = self.request.resolver_match.kwargs  # type: ignore[reportOptionalMemberAccess]
-        q_filter, _ = wallet_choice(details["wallet"], details["wallet_id"])
 
         # Get accountancy per specific month & year
         self.queryset = cast(
             "QuerySet",
-            self.model.objects.filter(
-                q_filter & Q(datetime__month=details["month"]) & Q(datetime__year=details["year"])
-            )
-            .order_by("-datetime")
-            .values("id", "IO", "IO_type", "amount", "datetime"),
+            monthly_wallet_accountancy(
+                details["wallet"], details["wallet_id"], details["year"], details["month"]
+            ).values("id", "IO", "amount", "datetime", category_name=F("category__name")),
         )
 
         form = AccountancySearchForm(self.request.GET)
         if form.is_valid():
-            return self.queryset.filter(IO_type__icontains=form.cleaned_data["IO_type"])
+            return form.search(self.queryset, self.request.user.id)  # type: ignore[reportAttributeAccessIssue]
 
         return self.queryset
 
 
+@login_required
+def balance_history(request: WSGIRequest, wallet: str, wallet_id: int) -> JsonResponse:
+    """A wallet's balance at the end of a day, or its daily balances of a date range (the last 30 days by default)."""
+    if wallet not in WALLET_MODELS:
+        raise Http404
+    wallet_obj = get_object_or_404(WALLET_MODELS[wallet], id=wallet_id, user=request.user)
+    form = BalanceHistoryForm(request.GET)
+    if not form.is_valid():
+        return JsonResponse({"errors": form.errors}, status=400)
+
+    decimal_places = wallet_obj.decimal_places
+    if form.cleaned_data["date"]:
+        day = form.cleaned_data["date"]
+        return JsonResponse({"date": day, "balance": from_minor(balance_at(wallet_obj, wallet, day), decimal_places)})
+
+    end = form.cleaned_data["end"] or timezone.localdate()
+    start = form.cleaned_data["start"] or end - timedelta(days=BALANCE_HISTORY_DAYS - 1)
+    days, balances = daily_balances(wallet_obj, wallet, start, end)
+    return JsonResponse(
+        {
+            "start": start,
+            "end": end,
+            "balances": [
+                {"date": day, "balance": from_minor(units, decimal_places)}
+                for day, units in zip(days.tolist(), balances.tolist(), strict=True)
+            ],
+        }
+    )
+
+
+@login_required
+def accountancy_analytics(request: WSGIRequest, wallet: str, wallet_id: int) -> HttpResponse:
+    """Spending series, rolling averages, an end-of-month projection and category anomalies of a wallet."""
+    if wallet not in WALLET_MODELS:
+        raise Http404
+    wallet_obj = get_object_or_404(WALLET_MODELS[wallet], id=wallet_id, user=request.user)
+    decimal_places = wallet_obj.decimal_places
+    analytics = analyze_spending(load_spending(wallet_filter(wallet, wallet_id)), timezone.localdate())
+
+    def money(units: float) -> Decimal | None:
+        return None if math.isnan(units) else from_minor(round(units), decimal_places)
+
+    months = [
+        {
+            "month": month.item(),
+            "spent": money(spent),
+            # The rolling averages are of the completed months only
+            "averages": [
+                money(analytics.rolling[window][index]) if index < len(analytics.months) - 1 else None
+                for window in ROLLING_WINDOWS
+            ],
+        }
+        for index, (month, spent) in enumerate(zip(analytics.months, analytics.monthly, strict=True))
+    ]
+    names = dict(Category.objects.filter(id__in=analytics.category_ids.tolist()).values_list("id", "name"))
+    categories = [
+        {
+            "name": names[category_id],
+            "spent": money(current),
+            "mean": money(mean),
+            "z_score": None if math.isnan(z_score) else round(z_score, 1),
+            "anomaly": anomaly,
+        }
+        for category_id, current, mean, z_score, anomaly in zip(
+            analytics.category_ids.tolist(),
+            analytics.category_current.tolist(),
+            analytics.category_mean.tolist(),
+            analytics.category_z_scores.tolist(),
+            analytics.anomalies.tolist(),
+            strict=True,
+        )
+    ]
+    context = {
+        "wallet": wallet_obj,
+        "months": months[::-1],
+        "rolling_windows": ROLLING_WINDOWS,
+        "month_spent": money(analytics.month_spent),
+        "projection": money(analytics.projection),
+        "categories": sorted(categories, key=lambda category: category["spent"], reverse=True),
+        "daily": {
+            "days": analytics.days.astype(str).tolist(),
+            "amounts": (analytics.daily / 10**decimal_places).round(decimal_places).tolist(),
+        },
+    }
+    return render(request, "manager/accountancy_analytics.html", context=context)
+
+
 class AccountancyUpdate(LoginRequiredMixin, generic.UpdateView):
     model = Accountancy
     form_class = AccountancyForm
     template_name = "manager/accountancy_form.html"
     success_url = reverse_lazy("manager:monthly-accountancy-list")
 
+    def form_valid(self, form: Any) -> HttpResponse:
+        # The balance may have changed since the form was cleaned, `update_transaction()` checks it again
+        try:
+            return super().form_valid(form)
+        except ValidationError as error:
+            form.add_error(None, error)
+            return self.form_invalid(form)
+
 
 class AccountancyDelete(LoginRequiredMixin, generic.DeleteView):
     model = Accountancy
     success_url = reverse_lazy("manager:monthly-accountancy-list")
+
+    def form_valid(self, form: Any) -> HttpResponse:
+        try:
+            delete_transaction(self.object)
+        except ValidationError as error:
+            form.add_error(None, error)
+            return self.form_invalid(form)
+        return HttpResponseRedirect(self.get_success_url())
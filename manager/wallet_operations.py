@@ -1,44 +1,227 @@
-from datetime import UTC, datetime
+from datetime import date, datetime, time, timedelta
+from uuid import uuid4
 
+from asgiref.sync import sync_to_async
 from django.core.exceptions import ValidationError
-from django.db.models import Q, Sum
+from django.db import transaction
+from django.db.models import F, Q, QuerySet
+from django.utils import timezone
 
-from manager.models import Accountancy, Card, Cash, Cryptocurrency
+from manager.cache import bump_user_data_version
+from manager.currencies import currencies
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, MonthlyTurnover
 
+WALLET_MODELS: dict[str, type[Card | Cash | Cryptocurrency]] = {"card": Card, "cash": Cash, "crypto": Cryptocurrency}
+
+
+def wallet_filter(wallet_type: str, wallet_id: int) -> Q:
+    if wallet_type == "card":
+        return Q(card_id=wallet_id)
+    if wallet_type == "cash":
+        return Q(cash_id=wallet_id)
+    return Q(cryptocurrency_id=wallet_id)
 
-def wallet_choice(wallet_type: str, wallet_id: int) -> tuple[Q, Card | Cash | Cryptocurrency]:
-    q_filter = Q()
 
+def wallet_choice(wallet_type: str, wallet_id: int) -> tuple[Q, Card | Cash | Cryptocurrency]:
     if wallet_type == "card":
-        q_filter = Q(card_id=wallet_id)
         wallet_obj = Card.objects.get(id=wallet_id)
     elif wallet_type == "cash":
-        q_filter = Q(cash_id=wallet_id)
         wallet_obj = Cash.objects.get(id=wallet_id)
     else:
-        q_filter = Q(cryptocurrency_id=wallet_id)
         wallet_obj = Cryptocurrency.objects.get(id=wallet_id)
 
-    return q_filter, wallet_obj
+    return wallet_filter(wallet_type, wallet_id), wallet_obj
+
+
+async def awallet_decimal_places(wallet: Card | Cash | Cryptocurrency) -> int:
+    """Return `wallet.decimal_places` without loading the currency registry synchronously."""
+    if isinstance(wallet, Cryptocurrency):
+        return wallet.decimal_places
+    return (await currencies.aget(wallet.currency_id)).decimal_places  # type: ignore[reportAttributeAccessIssue]
+
+
+def month_range(year: int, month: int) -> tuple[datetime, datetime]:
+    """Return half-open `[start, end)` bounds of a month in the current time zone.
+
+    Range predicates on `datetime` can be served by the wallet/datetime indexes of `Accountancy`,
+    unlike `datetime__month`/`datetime__year` lookups, which compile to `EXTRACT()` calls.
+    """
+    start = timezone.make_aware(datetime(year, month, 1))  # noqa: DTZ001
+    end = timezone.make_aware(datetime(year + month // 12, month % 12 + 1, 1))  # noqa: DTZ001
+    return start, end
+
+
+def date_range_filter(start: date | None, end: date | None) -> Q:
+    """Return the `datetime` predicates of the days from `start` to `end` inclusive, in the current time zone."""
+    q_filter = Q()
+    if start:
+        q_filter &= Q(datetime__gte=timezone.make_aware(datetime.combine(start, time.min)))
+    if end:
+        q_filter &= Q(datetime__lt=timezone.make_aware(datetime.combine(end + timedelta(days=1), time.min)))
+    return q_filter
+
+
+def monthly_wallet_accountancy(wallet_type: str, wallet_id: int, year: int, month: int) -> QuerySet[Accountancy]:
+    start, end = month_range(year, month)
+    return Accountancy.objects.filter(
+        wallet_filter(wallet_type, wallet_id) & Q(datetime__gte=start) & Q(datetime__lt=end)
+    ).order_by("-datetime")
 
 
 def monthly_financial_turnover(q_filter: Q, turnover_type: str) -> int:
-    turnover = Accountancy.objects.filter(
-        q_filter & Q(IO=turnover_type) & Q(datetime__month=datetime.now(UTC).month)
-    ).aggregate(Sum("amount"))
-    if not turnover or not turnover.get("amount__sum"):
-        return 0
-    return round(turnover["amount__sum"], 8)
+    """Return the current month's incomes or outcomes of a wallet in its minor units."""
+    turnover = (
+        MonthlyTurnover.objects.filter(q_filter & Q(IO=turnover_type) & Q(month=timezone.localdate().replace(day=1)))
+        .values_list("amount_sum", flat=True)
+        .first()
+    )
+    return turnover or 0
+
+
+async def amonthly_financial_turnover(q_filter: Q, turnover_type: str) -> int:
+    turnover = await (
+        MonthlyTurnover.objects.filter(q_filter & Q(IO=turnover_type) & Q(month=timezone.localdate().replace(day=1)))
+        .values_list("amount_sum", flat=True)
+        .afirst()
+    )
+    return turnover or 0
 
 
 def change_wallet_balance(
-    expense: str, wallet_obj: Card | Cash | Cryptocurrency, amount: float
+    expense: str, wallet_obj: Card | Cash | Cryptocurrency, amount: int
 ) -> Card | Cash | Cryptocurrency:
-    if expense in ("Outcome", "O") and wallet_obj.balance < amount:
-        raise ValidationError("There's too small amount of money on the balance")
     if expense in ("Outcome", "O"):
-        wallet_obj.balance = float(wallet_obj.balance) - amount
-    elif expense in ("Income", "I"):
-        wallet_obj.balance = float(wallet_obj.balance) + amount
+        amount = -amount
+    elif expense not in ("Income", "I"):
+        return wallet_obj
+    # A lowered income takes money back as well, which may have been spent already
+    if wallet_obj.balance + amount < 0:
+        raise ValidationError("There's too small amount of money on the balance")
+    wallet_obj.balance += amount
 
     return wallet_obj
+
+
+def post_transaction(wallet_type: str, wallet_id: int, io: str, category_id: int, amount: int) -> int:
+    """Change a wallet balance, record the accountancy entry and return the new balance in one transaction.
+
+    `amount` and the balance are in minor units of the wallet currency. The balance is changed by a conditional
+    `UPDATE ... SET balance = balance ± amount`, so concurrent posts to the same wallet can't overwrite each other;
+    the `positive_*_balance` check constraints are the backstop.
+    """
+    if amount < 0:
+        raise ValidationError("Amount can't be negative.")
+
+    model = WALLET_MODELS[wallet_type]
+    wallets = model.objects.filter(id=wallet_id)
+
+    with transaction.atomic():
+        if io == Accountancy.OUTCOME:
+            updated = wallets.filter(balance__gte=amount).update(balance=F("balance") - amount)
+        else:
+            updated = wallets.update(balance=F("balance") + amount)
+        if not updated:
+            if not wallets.exists():
+                raise model.DoesNotExist
+            raise ValidationError("There's too small amount of money on the balance")
+
+        Accountancy.objects.create(
+            **{f"{model._meta.model_name}_id": wallet_id}, IO=io, category_id=category_id, amount=amount
+        )
+        balance, user_id = wallets.values_list("balance", "user_id").get()
+        bump_user_data_version(user_id)
+
+    return balance
+
+
+def post_transfer(
+    user_id: int,
+    source: tuple[str, int],
+    destination: tuple[str, int],
+    amount: int,
+    received: int | None = None,
+) -> tuple[Accountancy, Accountancy]:
+    """Move money between two of the user's `(wallet type, id)` wallets and return the outcome and income records.
+
+    `amount` is taken from the source in its minor units and `received`, `amount` by default, is added to
+    the destination in its own. Both balance updates and the two records linked by a `transfer` id are written
+    in one transaction. The wallets are always updated in the order of their type and id, so the row locks of
+    two opposite transfers can't deadlock.
+    """
+    received = amount if received is None else received
+    if amount <= 0 or received <= 0:
+        raise ValidationError("Amount must be positive.")
+    if source == destination:
+        raise ValidationError("Choose two different wallets.")
+
+    categories = dict(Category.objects.filter(user=None, name=Category.TRANSFER).values_list("IO", "id"))
+    legs = {source: (Accountancy.OUTCOME, amount), destination: (Accountancy.INCOME, received)}
+    transfer = uuid4()
+    with transaction.atomic():
+        for wallet_type, wallet_id in sorted(legs):
+            io, leg_amount = legs[wallet_type, wallet_id]
+            model = WALLET_MODELS[wallet_type]
+            wallets = model.objects.filter(id=wallet_id, user_id=user_id)
+            if io == Accountancy.OUTCOME:
+                updated = wallets.filter(balance__gte=leg_amount).update(balance=F("balance") - leg_amount)
+            else:
+                updated = wallets.update(balance=F("balance") + leg_amount)
+            if not updated:
+                if not wallets.exists():
+                    raise model.DoesNotExist
+                raise ValidationError("There's too small amount of money on the balance")
+
+        outcome, income = (
+            Accountancy.objects.create(
+                **{f"{WALLET_MODELS[wallet_type]._meta.model_name}_id": wallet_id},
+                IO=io,
+                category_id=categories[io],
+                amount=leg_amount,
+                transfer=transfer,
+            )
+            for (wallet_type, wallet_id), (io, leg_amount) in legs.items()
+        )
+        bump_user_data_version(user_id)
+
+    return outcome, income
+
+
+def _shift_wallet_balance(record: Accountancy, change: int) -> int:
+    """Add `change` to the balance of the record's wallet unless it would go negative. Returns the wallet owner id."""
+    ((field, wallet_id),) = record.wallet_lookup.items()
+    wallets = record._meta.get_field(field.removesuffix("_id")).related_model.objects.filter(id=wallet_id)  # type: ignore[reportOptionalMemberAccess]
+    if not wallets.filter(balance__gte=-change).update(balance=F("balance") + change):
+        raise ValidationError("There's too small amount of money on the balance")
+    return wallets.values_list("user_id", flat=True).get()
+
+
+def update_transaction(record: Accountancy, amount: int) -> None:
+    """Change the amount of an accountancy entry and its wallet balance by the difference in one transaction.
+
+    The previous amount is read from the locked row, not from the possibly stale `record`.
+    """
+    with transaction.atomic():
+        previous = Accountancy.objects.select_for_update().values_list("amount", flat=True).get(pk=record.pk)
+        difference = amount - previous
+        user_id = _shift_wallet_balance(record, difference if record.IO == Accountancy.INCOME else -difference)
+        record.amount = amount
+        record.save()
+        bump_user_data_version(user_id)
+
+
+def delete_transaction(record: Accountancy) -> None:
+    """Delete an accountancy entry, or both of a transfer, and take it back from the wallet balance in one transaction."""
+    records = Accountancy.objects.select_for_update()
+    with transaction.atomic():
+        locked = list(records.filter(transfer=record.transfer) if record.transfer else records.filter(pk=record.pk))
+        if not locked:
+            raise Accountancy.DoesNotExist
+        # The same wallet order as `post_transfer()`
+        for item in sorted(locked, key=lambda item: tuple(item.wallet_lookup.items())):
+            user_id = _shift_wallet_balance(item, -item.amount if item.IO == Accountancy.INCOME else item.amount)
+            item.delete()
+        bump_user_data_version(user_id)
+
+
+# The async ORM has no `atomic()`, so the transactional write runs in the thread used for sync ORM calls.
+apost_transaction = sync_to_async(post_transaction)
@@ -0,0 +1,72 @@
+import json
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from faker import Faker
+
+from manager.models import Accountancy, Card, Cash, Category, Currency
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+EXPORT_URL = reverse("manager:accountancy-export")
+
+fake = Faker()
+
+
+class AccountancyExportTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        other_user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(user)
+
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=user, bank_name="Mono", type="Payment card", currency=currency)
+        self.cash = Cash.objects.create(user=user, currency=currency)
+        other_card = Card.objects.create(user=other_user, bank_name="Mono", type="Payment card", currency=currency)
+        salary = Category.objects.get(user=None, IO="I", name="Salary")
+        coffee = Category.objects.create(user=user, IO="O", name="Coffee")
+        home = Category.objects.create(user=other_user, IO="O", name="Flat")
+        Accountancy.objects.create(
+            card=self.card, IO="I", category=salary, amount=10000, datetime=datetime(2023, 1, 10, tzinfo=UTC)
+        )
+        Accountancy.objects.create(
+            cash=self.cash, IO="O", category=coffee, amount=250, datetime=datetime(2023, 2, 10, tzinfo=UTC)
+        )
+        Accountancy.objects.create(
+            card=other_card, IO="O", category=home, amount=700, datetime=datetime(2023, 1, 10, tzinfo=UTC)
+        )
+
+    def test_export_form_is_rendered_without_parameters(self) -> None:
+        response = self.client.get(EXPORT_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "manager/accountancy_export.html")
+
+    def test_csv_export_streams_only_the_users_history(self) -> None:
+        response = self.client.get(EXPORT_URL, {"format": "csv"})
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        lines = b"".join(response.streaming_content).decode().splitlines()  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual(lines[0], "datetime,wallet,IO,IO_type,amount")
+        self.assertEqual(
+            [line.split(",")[1:] for line in lines[1:]],
+            [
+                [f"card - {self.card.id}", "I", "Salary", "100.00"],
+                [f"cash - {self.cash.id}", "O", "Coffee", "2.50"],
+            ],
+        )
+
+    def test_ndjson_export_with_filters(self) -> None:
+        response = self.client.get(EXPORT_URL, {"format": "ndjson", "start": "2023-02-01", "end": "2023-02-28"})
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual([record["IO_type"] for record in records], ["Coffee"])
+
+        response = self.client.get(EXPORT_URL, {"format": "ndjson", "wallet_choice": f"card - {self.card.id}"})
+        records = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual([record["IO_type"] for record in records], ["Salary"])
@@ -0,0 +1,132 @@
+import time
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+import numpy as np
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from manager.analytics import SpendingHistory, analyze_spending, load_spending, local_days
+from manager.models import Accountancy, Card, Category, Currency
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+def history(records: list[tuple[str, int, int]]) -> SpendingHistory:
+    days, categories, amounts = zip(*records, strict=True)
+    return SpendingHistory(
+        np.array(days, dtype="datetime64[D]"), np.array(categories, dtype=np.int64), np.array(amounts, dtype=np.int64)
+    )
+
+
+class AnalyzeSpendingTests(TestCase):
+    def setUp(self) -> None:
+        food, home = 1, 2
+        records = [(f"2024-{month:02}-10", food, amount) for month, amount in enumerate((90, 110, 90, 110, 100), 1)]
+        records += [(f"2024-{month:02}-10", home, 500) for month in range(1, 7)]
+        records += [("2024-06-10", food, 300), ("2024-06-20", food, 1000)]
+        self.analytics = analyze_spending(history(records), date(2024, 6, 15))
+
+    def test_daily_and_monthly_series(self) -> None:
+        self.assertEqual((str(self.analytics.days[0]), str(self.analytics.days[-1])), ("2024-01-10", "2024-06-15"))
+        self.assertEqual(len(self.analytics.daily), len(self.analytics.days))
+        self.assertEqual(self.analytics.daily[-6], 800)
+        self.assertEqual(self.analytics.monthly.tolist(), [590, 610, 590, 610, 600, 800])
+
+    def test_rolling_averages_of_completed_months(self) -> None:
+        np.testing.assert_allclose(self.analytics.rolling[3], [np.nan, np.nan, 1790 / 3, 1810 / 3, 600], equal_nan=True)
+        self.assertTrue(np.isnan(self.analytics.rolling[6]).all())
+
+    def test_projection(self) -> None:
+        self.assertEqual(self.analytics.month_spent, 800)
+        self.assertEqual(self.analytics.projection, 800 / 15 * 30)
+
+    def test_category_anomalies(self) -> None:
+        self.assertEqual(self.analytics.category_ids.tolist(), [1, 2])
+        self.assertEqual(self.analytics.category_current.tolist(), [300, 500])
+        self.assertEqual(self.analytics.anomalies.tolist(), [True, False])
+        self.assertTrue(np.isnan(self.analytics.category_z_scores[1]))
+
+    def test_history_without_past_records(self) -> None:
+        analytics = analyze_spending(history([("2024-06-20", 1, 1)]), date(2024, 6, 15))
+
+        self.assertEqual(analytics.monthly.tolist(), [0])
+        self.assertEqual(analytics.projection, 0)
+        self.assertEqual(len(analytics.category_ids), 0)
+
+    def test_large_history_is_fast(self) -> None:
+        rng = np.random.default_rng(0)
+        size = 200_000
+        large = SpendingHistory(
+            np.datetime64("2015-01-01") + rng.integers(0, 3650, size).astype("timedelta64[D]"),
+            rng.integers(1, 30, size),
+            rng.integers(1, 100_000, size),
+        )
+
+        start = time.perf_counter()
+        analytics = analyze_spending(large, date(2025, 1, 1))
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(analytics.monthly.sum(), large.amounts.sum())
+
+
+class AnalyticsViewTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(self.user)
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        food = Category.objects.get(user=None, IO="O", name="Food")
+        salary = Category.objects.get(user=None, IO="I", name="Salary")
+        Accountancy.objects.create(card=self.card, IO="O", category=food, amount=1050)
+        Accountancy.objects.create(card=self.card, IO="I", category=salary, amount=99999)
+        Accountancy.objects.create(
+            card=self.card, IO="O", category=food, amount=500, datetime=datetime(2020, 1, 1, 12, tzinfo=UTC)
+        )
+
+    def test_load_spending_fetches_outcomes(self) -> None:
+        spending = load_spending(Q(card_id=self.card.id))
+
+        self.assertEqual(sorted(spending.amounts.tolist()), [500, 1050])
+        self.assertIn(np.datetime64(timezone.localdate(), "D"), spending.days)
+
+    def test_local_days_follow_dst(self) -> None:
+        moments = [
+            datetime(2024, 3, 30, 21, 59, tzinfo=UTC),  # 23:59 EET
+            datetime(2024, 3, 30, 22, 0, tzinfo=UTC),  # 00:00 EET
+            datetime(2024, 3, 31, 0, 30, tzinfo=UTC),  # 02:30 EET, before the switch to summer time
+            datetime(2024, 3, 31, 21, 30, tzinfo=UTC),  # 00:30 EEST
+            datetime(2024, 10, 26, 21, 30, tzinfo=UTC),  # 00:30 EEST
+        ]
+        timestamps = np.array([moment.timestamp() for moment in moments])
+
+        with timezone.override("Europe/Kyiv"):
+            days = local_days(timestamps)
+        self.assertEqual(
+            days.astype(str).tolist(), ["2024-03-30", "2024-03-31", "2024-03-31", "2024-04-01", "2024-10-27"]
+        )
+
+    def test_analytics_view(self) -> None:
+        response = self.client.get(reverse("manager:accountancy-analytics", args=["card", self.card.id]))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(str(response.context["month_spent"]), "10.50")
+        self.assertEqual(str(response.context["months"][0]["spent"]), "10.50")
+        self.assertEqual([category["name"] for category in response.context["categories"]], ["Food"])
+        self.assertContains(response, 'id="daily-spending"')
+
+    def test_analytics_of_other_users_wallet(self) -> None:
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(other_user)
+
+        response = self.client.get(reverse("manager:accountancy-analytics", args=["card", self.card.id]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse("manager:accountancy-analytics", args=["bank", self.card.id]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,127 @@
+from datetime import UTC, date, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from manager.balance_history import balance_at, daily_balances, rebuild_balance_checkpoints
+from manager.models import Accountancy, BalanceCheckpoint, Card, Category, Currency
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+OPENING_BALANCE = 10000
+
+
+class BalanceHistoryTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(
+            user=self.user, bank_name="Mono", type="Payment card", currency=currency, balance=OPENING_BALANCE
+        )
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
+        for moment, io, amount in (
+            (datetime(2023, 12, 31, 22, 30, tzinfo=UTC), "I", 5000),  # 2024-01-01 00:30 in Kyiv
+            (datetime(2024, 1, 15, 12, tzinfo=UTC), "O", 1200),
+            (datetime(2024, 3, 3, 12, tzinfo=UTC), "O", 300),
+            (datetime(2024, 3, 31, 12, tzinfo=UTC), "I", 700),
+            (datetime(2030, 1, 1, 12, tzinfo=UTC), "O", 100),
+        ):
+            self.post(moment, io, amount)
+
+    def post(self, moment: datetime, io: str, amount: int) -> Accountancy:
+        record = Accountancy.objects.create(
+            card=self.card, IO=io, category=self.salary if io == "I" else self.food, amount=amount, datetime=moment
+        )
+        self.card.balance += amount if io == "I" else -amount
+        self.card.save()
+        return record
+
+    def replayed_balance(self, day: date) -> int:
+        return OPENING_BALANCE + sum(
+            amount if io == "I" else -amount
+            for moment, io, amount in Accountancy.objects.values_list("datetime", "IO", "amount")
+            if timezone.localtime(moment).date() <= day
+        )
+
+    def checkpoints(self) -> dict[date, int]:
+        return dict(BalanceCheckpoint.objects.filter(card=self.card).values_list("month", "net_total"))
+
+    def test_checkpoints_are_written_with_the_records(self) -> None:
+        self.assertEqual(
+            self.checkpoints(),
+            {date(2024, 1, 1): 3800, date(2024, 3, 1): 4200, date(2030, 1, 1): 4100},
+        )
+
+        record = self.post(datetime(2024, 2, 10, 12, tzinfo=UTC), "O", 1000)
+        self.assertEqual(self.checkpoints()[date(2024, 2, 1)], 2800)
+        self.assertEqual(self.checkpoints()[date(2024, 3, 1)], 3200)
+
+        record.datetime = datetime(2024, 3, 10, 12, tzinfo=UTC)
+        record.save()
+        self.assertEqual(self.checkpoints()[date(2024, 2, 1)], 3800)
+        record.delete()
+        self.assertEqual(self.checkpoints()[date(2030, 1, 1)], 4100)
+
+    def test_rebuild_matches_the_maintained_checkpoints(self) -> None:
+        maintained = self.checkpoints()
+
+        self.assertEqual(rebuild_balance_checkpoints(), 3)
+        self.assertEqual(self.checkpoints(), maintained)
+
+    def test_balance_at(self) -> None:
+        for day in (date(2023, 12, 31), date(2024, 1, 1), date(2024, 2, 20), date(2024, 3, 31), date(2025, 1, 1)):
+            expected = self.replayed_balance(day)
+            with self.subTest(day=day), self.assertNumQueries(3):
+                self.assertEqual(balance_at(self.card, "card", day), expected)
+
+    def test_daily_balances(self) -> None:
+        days, balances = daily_balances(self.card, "card", date(2023, 12, 20), date(2024, 3, 31))
+
+        self.assertEqual((days[0].item(), days[-1].item()), (date(2023, 12, 20), date(2024, 3, 31)))
+        self.assertEqual(
+            balances.tolist(),
+            [self.replayed_balance(day.item()) for day in days],
+        )
+
+    def test_balance_history_view(self) -> None:
+        self.client.force_login(self.user)
+        url = reverse("manager:balance-history", args=["card", self.card.id])
+
+        response = self.client.get(url, {"date": "2024-01-20"})
+        self.assertEqual(response.json(), {"date": "2024-01-20", "balance": "138.00"})
+
+        response = self.client.get(url, {"start": "2024-03-02", "end": "2024-03-04"})
+        self.assertEqual(
+            response.json()["balances"],
+            [
+                {"date": "2024-03-02", "balance": "138.00"},
+                {"date": "2024-03-03", "balance": "135.00"},
+                {"date": "2024-03-04", "balance": "135.00"},
+            ],
+        )
+
+        response = self.client.get(url)
+        self.assertEqual(len(response.json()["balances"]), 30)
+        self.assertEqual(response.json()["end"], str(timezone.localdate()))
+        self.assertEqual(response.json()["start"], str(timezone.localdate() - timedelta(days=29)))
+
+        response = self.client.get(url, {"date": "2024-01-20", "start": "2024-01-01"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_balance_history_of_other_users_wallet(self) -> None:
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(other_user)
+
+        response = self.client.get(reverse("manager:balance-history", args=["card", self.card.id]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(reverse("manager:balance-history", args=["bank", self.card.id]))
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,72 @@
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import LiveServerTestCase, TestCase
+
+from manager.models import Accountancy, Card, Cash, Cryptocurrency, Currency, MonthlyTurnover
+
+
+class BenchmarkCommandsTests(TestCase):
+    def setUp(self) -> None:
+        Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        Currency.objects.create(name="Euro", abbreviation="EUR", sign="€")
+
+    def test_seed_data(self) -> None:
+        call_command("seed_data", users=2, wallets=2, records=30, years=2, stdout=StringIO())
+
+        self.assertEqual(Card.objects.count(), 4)
+        self.assertEqual(Cash.objects.count(), 4)
+        self.assertEqual(Cryptocurrency.objects.count(), 4)
+        self.assertGreaterEqual(Accountancy.objects.count(), 12 * 30)
+        self.assertEqual(
+            MonthlyTurnover.objects.aggregate(transactions=Sum("transactions"))["transactions"],
+            Accountancy.objects.count(),
+        )
+        for card in Card.objects.all():
+            records = Accountancy.objects.filter(card=card)
+            incomes = sum(records.filter(IO="I").values_list("amount", flat=True))
+            outcomes = sum(records.filter(IO="O").values_list("amount", flat=True))
+            self.assertAlmostEqual(card.balance, incomes - outcomes, places=2)
+
+    def test_benchmark_reports_every_scenario(self) -> None:
+        call_command("seed_data", users=1, wallets=1, records=20, stdout=StringIO())
+        records = Accountancy.objects.count()
+        stdout = StringIO()
+
+        call_command("benchmark", iterations=2, warmup=0, stdout=stdout)
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(
+            set(report["scenarios"]),
+            {
+                "wallets",
+                "index",
+                "index_post",
+                "monthly_accountancy_list",
+                "monthly_accountancy_search",
+                "accountancy_update",
+                "accountancy_update_post",
+            },
+        )
+        for result in report["scenarios"].values():
+            self.assertLessEqual(result["p50_ms"], result["p99_ms"])
+            self.assertGreater(result["queries"], 0)
+        self.assertEqual(set(report["fragment_cache"]), {"wallets", "index"})
+        # The POST requests are rolled back
+        self.assertEqual(Accountancy.objects.count(), records)
+
+
+class LoadTestCommandTests(LiveServerTestCase):
+    def test_load_test_reports_requests_per_second(self) -> None:
+        Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        call_command("seed_data", users=1, wallets=1, records=20, stdout=StringIO())
+        stdout = StringIO()
+
+        call_command("load_test", url=self.live_server_url, concurrency=2, duration=0.5, stdout=stdout)
+
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(report["errors"], 0)
+        self.assertGreater(report["requests_per_second"], 0)
+        self.assertNotIn("index_post", report["scenarios"])
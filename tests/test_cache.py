@@ -0,0 +1,100 @@
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+
+from manager.cache import cached_wallet_objects, user_data_version, wallet_cache_stats
+from manager.models import Card, Category, Currency
+from manager.wallet_operations import post_transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class WalletCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=self.currency)
+
+    def test_wallets_are_served_from_cache(self) -> None:
+        cached_wallet_objects(self.user.id)
+
+        with self.assertNumQueries(0):
+            cards, cash, crypto = cached_wallet_objects(self.user.id)
+
+        self.assertEqual((cards, cash, crypto), ([self.card], [], []))
+        self.assertEqual(wallet_cache_stats(), {"hits": 1, "misses": 1})
+
+    def test_wallet_changes_invalidate_cache(self) -> None:
+        version = user_data_version(self.user.id)
+        cached_wallet_objects(self.user.id)
+
+        new_card = Card.objects.create(user=self.user, bank_name="Privat", type="Storage card", currency=self.currency)
+
+        self.assertGreater(user_data_version(self.user.id), version)
+        self.assertIn(new_card, cached_wallet_objects(self.user.id)[0])
+
+    def test_balance_posting_invalidates_cache(self) -> None:
+        cached_wallet_objects(self.user.id)
+
+        post_transaction("card", self.card.id, "I", Category.objects.get(user=None, IO="I", name="Salary").id, 10)
+
+        self.assertEqual(cached_wallet_objects(self.user.id)[0][0].balance, 10)
+
+
+class FragmentCacheTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(self.user)
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+
+    def rename_card(self) -> None:
+        """Rename the card without the signals and drop the cached wallet objects, but keep the data version."""
+        Card.objects.filter(id=self.card.id).update(bank_name="Privat")  # type: ignore[reportAttributeAccessIssue]
+        cache.delete(f"zlatnic:user:{self.user.id}:wallets:{user_data_version(self.user.id)}")
+
+    def test_wallet_tables_are_cached_until_the_data_changes(self) -> None:
+        self.client.get(reverse("manager:wallets"))
+        self.rename_card()
+
+        self.assertContains(self.client.get(reverse("manager:wallets")), "Mono")
+
+        self.card.refresh_from_db()
+        self.card.save()
+        self.assertContains(self.client.get(reverse("manager:wallets")), "Privat")
+
+    def test_fragments_are_not_shared_between_users(self) -> None:
+        self.client.get(reverse("manager:wallets"))
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(other_user)
+
+        self.assertNotContains(self.client.get(reverse("manager:wallets")), "Mono")
+
+    def test_index_wallet_select_shows_the_posted_balance(self) -> None:
+        self.client.get(reverse("manager:index"))
+
+        response = self.client.post(
+            reverse("manager:index"),
+            {"wallet_choice": f"card - {self.card.id}", "Income": self.salary.id, "amount": "100"},  # type: ignore[reportAttributeAccessIssue]
+        )
+
+        self.assertContains(response, "Card: Mono - Payment card - 100.00")
+
+    @override_settings(FRAGMENT_CACHE_TIMEOUT=0)
+    def test_fragment_cache_can_be_disabled(self) -> None:
+        self.client.get(reverse("manager:wallets"))
+        self.rename_card()
+
+        self.assertContains(self.client.get(reverse("manager:wallets")), "Privat")
@@ -0,0 +1,82 @@
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+
+from manager.models import Accountancy, Card, Category, Currency
+from manager.wallet_operations import post_transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class ConditionalGetTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(self.user)
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        Accountancy.objects.create(
+            card=self.card, IO="I", category=self.salary, amount=100, datetime=datetime(2022, 11, 1, tzinfo=UTC)
+        )
+        self.urls = (
+            reverse("manager:wallets"),
+            reverse("manager:monthly-accountancy-list"),
+            reverse(
+                "manager:monthly-accountancy",
+                kwargs={"wallet": "card", "wallet_id": self.card.id, "month": 11, "year": 2022},  # type: ignore[reportAttributeAccessIssue]
+            ),
+        )
+
+    def test_unchanged_pages_are_not_modified(self) -> None:
+        for url in self.urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("Last-Modified", response.headers)
+                self.assertIn("private", response.headers["Cache-Control"])
+
+                # Only the session and the user are read
+                with self.assertNumQueries(2):
+                    response = self.client.get(url, headers={"if-none-match": response.headers["ETag"]})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+
+                response = self.client.get(url, headers={"if-modified-since": response.headers["Last-Modified"]})
+                self.assertEqual(response.status_code, 304)
+
+    def test_changed_pages_are_rendered(self) -> None:
+        etags = [self.client.get(url).headers["ETag"] for url in self.urls]
+
+        post_transaction("card", self.card.id, "I", self.salary.id, 100)  # type: ignore[reportAttributeAccessIssue]
+
+        for url, etag in zip(self.urls, etags, strict=True):
+            with self.subTest(url=url):
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_pages_of_another_release_are_rendered(self) -> None:
+        etag = self.client.get(self.urls[0]).headers["ETag"]
+
+        with override_settings(RELEASE="next"):
+            response = self.client.get(self.urls[0], headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_anonymous_users_are_redirected(self) -> None:
+        etags = [self.client.get(url).headers["ETag"] for url in self.urls]
+        self.client.logout()
+
+        for url, etag in zip(self.urls, etags, strict=True):
+            with self.subTest(url=url):
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 302)
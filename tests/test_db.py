@@ -0,0 +1,32 @@
+from unittest import skipUnless
+
+from django.conf import settings
+from django.db import connection
+from django.test import SimpleTestCase, override_settings
+
+from manager.db import apply_sqlite_pragmas
+
+
+class SQLitePragmasTests(SimpleTestCase):
+    databases = {"default"}
+
+    def pragma(self, name: str) -> str | int:
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    @skipUnless(settings.DATABASE_PROFILE == "tuned", "Tests run with another DATABASE_PROFILE.")
+    def test_tuned_profile_is_applied_to_new_connections(self) -> None:
+        connection.close()
+        connection.ensure_connection()
+
+        self.assertEqual(self.pragma("journal_mode"), "wal")
+        self.assertEqual(self.pragma("synchronous"), 1)
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+
+    @override_settings(SQLITE_PRAGMAS={"cache_size": -4096})
+    def test_pragmas_come_from_the_settings(self) -> None:
+        apply_sqlite_pragmas(type(connection), connection)
+
+        self.assertEqual(self.pragma("cache_size"), -4096)
+        connection.close()
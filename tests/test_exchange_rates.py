@@ -0,0 +1,92 @@
+import tempfile
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from faker import Faker
+
+from manager.currencies import currencies
+from manager.exchange_rates import convert, exchange_rates, net_worth, read_rates
+from manager.models import Card, Cash, Cryptocurrency, Currency, ExchangeRate
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+RATES = """date,asset,rate
+2024-01-01,EUR,1.0
+2024-01-02,EUR,1.1
+2024-01-02,JPY,0.0067
+2024-01-02,Bitcoin,60000
+"""
+
+fake = Faker()
+
+
+class NetWorthTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        usd = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        eur = Currency.objects.create(name="Euro", abbreviation="EUR", sign="€")
+        jpy = Currency.objects.create(name="Yen", abbreviation="JPY", sign="¥", decimal_places=0)
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment", balance=10000, currency=usd)
+        Card.objects.create(user=self.user, bank_name="MUFG", type="Payment", balance=150000, currency=jpy)
+        Cash.objects.create(user=self.user, balance=5000, currency=eur)
+        self.bitcoin = Cryptocurrency.objects.create(user=self.user, name="BitCoin", balance=50_000_000)
+        Cryptocurrency.objects.create(user=self.user, name="Dogecoin", balance=100_000_000)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory, "rates.csv")
+            path.write_text(RATES)
+            call_command("load_exchange_rates", path, stdout=StringIO())
+
+    def test_rates_are_loaded(self) -> None:
+        self.assertEqual(ExchangeRate.objects.count(), 4)
+        self.assertEqual(ExchangeRate.objects.get(crypto_name="bitcoin").rate, 60000)
+
+    def test_net_worth_in_one_query(self) -> None:
+        currencies.all()
+        exchange_rates.snapshot()
+        with self.assertNumQueries(1):
+            worth = net_worth(self.user.id)
+
+        # 100 $ + 150000 ¥ * 0.0067 + 50 € * 1.1 + 0.5 BTC * 60000, Dogecoin has no rate
+        assert worth is not None
+        self.assertEqual(worth.amount, Decimal("31160.00"))
+        self.assertEqual((worth.currency.abbreviation, worth.date, worth.unconverted), ("USD", date(2024, 1, 2), 1))
+
+    def test_convert_uses_cached_snapshot(self) -> None:
+        exchange_rates.snapshot()
+        with self.assertNumQueries(0):
+            self.assertEqual(convert(self.bitcoin), Decimal("30000.00"))
+            self.assertEqual(convert(self.card), Decimal("100.00"))
+
+    def test_snapshot_is_refreshed_on_change(self) -> None:
+        exchange_rates.snapshot()
+        ExchangeRate.objects.create(date=date(2024, 1, 3), crypto_name="bitcoin", rate=70000)
+        self.assertEqual(convert(self.bitcoin), Decimal("35000.00"))
+
+    def test_invalid_rates(self) -> None:
+        for rates in (
+            "date,asset\n",
+            "date,asset,rate\n2024-13-01,EUR,1\n",
+            "date,asset,rate\n2024-01-01,EUR,-1\n",
+            "date,asset,rate\n2024-01-01,EUR,NaN\n",
+            "date,asset,rate\n2024-01-01,EUR,Infinity\n",
+        ):
+            with self.subTest(rates=rates), self.assertRaises(ValidationError):
+                read_rates(rates.splitlines())
+
+    def test_wallets_view_shows_net_worth(self) -> None:
+        self.client.force_login(self.user)
+        response = self.client.get(reverse("manager:wallets"))
+
+        self.assertEqual(response.context["net_worth"].amount, Decimal("31160.00"))
+        self.assertContains(response, "Net worth - 31160.00 $")
@@ -2,11 +2,14 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from django.contrib.auth import get_user_model
+from django.forms import modelform_factory
 from django.test import TestCase
 from django.urls import reverse
 from faker import Faker
 
-from manager.models import Accountancy, Card, Currency
+from manager.currencies import currencies
+from manager.forms import WalletForm
+from manager.models import Accountancy, Card, Category, Currency
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import UserManager
@@ -22,28 +25,96 @@ class FormTests(TestCase):
 
         self.currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
         self.card = Card.objects.create(
-            user=self.user, bank_name="Mono", type="Payment card", balance=150, currency=self.currency
+            user=self.user, bank_name="Mono", type="Payment card", balance=15000, currency=self.currency
         )
 
     def test_outcome_accountancy_form_for_incomes(self) -> None:
-        accountancy_income = Accountancy.objects.create(card=self.card, IO="I", IO_type="Salary", amount=100)
+        accountancy_income = Accountancy.objects.create(
+            card=self.card, IO="I", category=Category.objects.get(user=None, IO="I", name="Salary"), amount=10000
+        )
 
-        form_data = {"wallet_choice": f"card - {accountancy_income.amount}", "amount": "50"}
+        form_data = {"wallet_choice": f"card - {accountancy_income.amount_decimal}", "amount": "50"}
         response = self.client.post(path=reverse("manager:accountancy-update", kwargs={"pk": 1}), data=form_data)
 
         self.assertEqual(response.status_code, 302)
-        self.assertEqual(Card.objects.get(id=1).balance, 100)
-        self.assertEqual(Accountancy.objects.get(id=1).amount, 50)
+        self.assertEqual(Card.objects.get(id=1).balance, 10000)
+        self.assertEqual(Accountancy.objects.get(id=1).amount, 5000)
 
     def test_outcome_accountancy_form_for_outcomes(self) -> None:
-        accountancy_outcome = Accountancy.objects.create(card=self.card, IO="O", IO_type="Home", amount=100)
+        accountancy_outcome = Accountancy.objects.create(
+            card=self.card, IO="O", category=Category.objects.get(user=None, IO="O", name="Home"), amount=10000
+        )
 
-        form_data = {"wallet_choice": f"card - {accountancy_outcome.amount}", "amount": "50"}
+        form_data = {"wallet_choice": f"card - {accountancy_outcome.amount_decimal}", "amount": "50"}
         response = self.client.post(path=reverse("manager:accountancy-update", kwargs={"pk": 1}), data=form_data)
 
         self.assertEqual(response.status_code, 302)
-        self.assertEqual(Card.objects.get(id=1).balance, 200)
-        self.assertEqual(Accountancy.objects.get(id=1).amount, 50)
+        self.assertEqual(Card.objects.get(id=1).balance, 20000)
+        self.assertEqual(Accountancy.objects.get(id=1).amount, 5000)
+
+    def test_accountancy_form_ignores_the_posted_previous_amount(self) -> None:
+        accountancy = Accountancy.objects.create(
+            card=self.card, IO="I", category=Category.objects.get(user=None, IO="I", name="Salary"), amount=10000
+        )
+        url = reverse("manager:accountancy-update", kwargs={"pk": accountancy.id})  # type: ignore[reportAttributeAccessIssue]
+
+        # The same stale form submitted twice changes the balance once
+        for _ in range(2):
+            self.client.post(url, data={"wallet_choice": "card - 100.00", "amount": "50"})
+
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 10000)
+
+    def test_lowered_income_already_spent(self) -> None:
+        accountancy = Accountancy.objects.create(
+            card=self.card, IO="I", category=Category.objects.get(user=None, IO="I", name="Salary"), amount=10000
+        )
+        Card.objects.filter(id=self.card.id).update(balance=1000)  # type: ignore[reportAttributeAccessIssue]
+        url = reverse("manager:accountancy-update", kwargs={"pk": accountancy.id})  # type: ignore[reportAttributeAccessIssue]
+
+        response = self.client.post(url, data={"wallet_choice": "card - 100.00", "amount": "10"})
+
+        self.assertFormError(response.context["form"], None, "There's too small amount of money on the balance")
+        self.card.refresh_from_db()
+        self.assertEqual((self.card.balance, Accountancy.objects.get().amount), (1000, 10000))
+
+    def test_delete_accountancy_reverts_the_balance(self) -> None:
+        accountancy = Accountancy.objects.create(
+            card=self.card, IO="O", category=Category.objects.get(user=None, IO="O", name="Home"), amount=10000
+        )
+
+        response = self.client.post(reverse("manager:accountancy-delete", kwargs={"pk": accountancy.id}))  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Accountancy.objects.exists())
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 25000)
+
+    def test_delete_unaffordable_income(self) -> None:
+        accountancy = Accountancy.objects.create(
+            card=self.card, IO="I", category=Category.objects.get(user=None, IO="I", name="Salary"), amount=20000
+        )
+
+        response = self.client.post(reverse("manager:accountancy-delete", kwargs={"pk": accountancy.id}))  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertContains(response, "There&#x27;s too small amount of money on the balance")
+        self.assertTrue(Accountancy.objects.exists())
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 15000)
+
+    def test_wallet_form_currencies_come_from_the_registry(self) -> None:
+        card_form = modelform_factory(Card, form=WalletForm, fields=("bank_name", "type", "currency"))
+        currencies.all()
+
+        with self.assertNumQueries(0):
+            html = card_form(instance=self.card).as_p()
+        self.assertInHTML(f'<option value="{self.currency.id}" selected>U. S. Dollar (USD)</option>', html)  # type: ignore[reportAttributeAccessIssue]
+
+        form = card_form({"bank_name": "Mono", "type": "Payment card", "currency": self.currency.id})  # type: ignore[reportAttributeAccessIssue]
+        self.assertTrue(form.is_valid())
+        self.assertEqual(form.cleaned_data["currency"], self.currency)
+        form = card_form({"bank_name": "Mono", "type": "Payment card", "currency": 999})
+        self.assertIn("currency", form.errors)
 
 
 class SearchFormTests(TestCase):
@@ -56,11 +127,12 @@ class SearchFormTests(TestCase):
         self.card = Card.objects.create(
             user=user, bank_name="Mono", type="Payment card", balance=150, currency=self.currency
         )
+        home, pets = Category.objects.filter(user=None, IO="O", name__in=("Home", "Pets")).order_by("name")
         Accountancy.objects.create(
-            card=self.card, IO="O", IO_type="Home", amount=15, datetime=datetime(2022, 12, 1, tzinfo=UTC)
+            card=self.card, IO="O", category=home, amount=15, datetime=datetime(2022, 12, 1, tzinfo=UTC)
         )
         Accountancy.objects.create(
-            card=self.card, IO="O", IO_type="Pets", amount=8, datetime=datetime(2022, 12, 1, tzinfo=UTC)
+            card=self.card, IO="O", category=pets, amount=8, datetime=datetime(2022, 12, 1, tzinfo=UTC)
         )
 
     def test_monthly_accountancy_search_form(self) -> None:
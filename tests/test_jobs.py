@@ -0,0 +1,132 @@
+from datetime import timedelta
+from io import StringIO
+from typing import TYPE_CHECKING
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from manager.jobs import claim_jobs, enqueue, requeue_stale_jobs, run_job
+from manager.models import Card, Category, Currency, Job, RecurringTransaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+CSV_STATEMENT = "datetime,amount,IO_type\n2024-01-05 10:00,1000.50,Salary\n2024-01-06 12:30,-20.25,Food\n"
+
+
+class JobTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+
+    def test_enqueue_unknown_job(self) -> None:
+        with self.assertRaises(ValueError):
+            enqueue("unknown")
+
+    def test_claim_jobs_once(self) -> None:
+        jobs = [enqueue("materialize_recurring") for _ in range(3)]
+
+        self.assertEqual(claim_jobs(2), [jobs[0].id, jobs[1].id])
+        self.assertEqual(claim_jobs(2), [jobs[2].id])
+        self.assertEqual(claim_jobs(2), [])
+        jobs[0].refresh_from_db()
+        self.assertEqual((jobs[0].status, jobs[0].attempts), (Job.RUNNING, 1))
+        self.assertIsNotNone(jobs[0].started_at)
+
+    def test_run_job(self) -> None:
+        RecurringTransaction.objects.create(
+            card=self.card,
+            IO="I",
+            category=Category.objects.get(user=None, IO="I", name="Salary"),
+            amount=100,
+            start_date=timezone.localdate(),
+        )
+        job = enqueue("materialize_recurring")
+        claim_jobs(1)
+
+        self.assertEqual(run_job(job.id), Job.SUCCEEDED)  # type: ignore[reportAttributeAccessIssue]
+        job.refresh_from_db()
+        self.assertEqual(job.result, {"created": 1, "skipped": 0})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failed_job(self) -> None:
+        path = default_storage.save("statements/test.csv", ContentFile(b"datetime,amount\n2024-01-05,-1\n"))
+        job = enqueue("import_statement", {"path": path, "wallet": "card", "wallet_id": self.card.id})
+        claim_jobs(1)
+
+        self.assertEqual(run_job(job.id), Job.FAILED)  # type: ignore[reportAttributeAccessIssue]
+        job.refresh_from_db()
+        self.assertEqual(job.error, "There's too small amount of money on the balance")
+        self.assertIsNone(job.result)
+        self.assertFalse(default_storage.exists(path))
+
+    def test_requeue_stale_jobs(self) -> None:
+        stale, abandoned, recent = (enqueue("materialize_recurring") for _ in range(3))
+        claim_jobs(3)
+        Job.objects.filter(id__in=(stale.id, abandoned.id)).update(started_at=timezone.now() - timedelta(hours=2))  # type: ignore[reportAttributeAccessIssue]
+        Job.objects.filter(id=abandoned.id).update(attempts=3)  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(requeue_stale_jobs(timedelta(hours=1)), 1)
+        self.assertEqual(
+            dict(Job.objects.values_list("id", "status")),
+            {stale.id: Job.QUEUED, abandoned.id: Job.FAILED, recent.id: Job.RUNNING},  # type: ignore[reportAttributeAccessIssue]
+        )
+
+    def test_large_statement_is_imported_by_a_job(self) -> None:
+        self.client.force_login(self.user)
+        statement = SimpleUploadedFile("statement.csv", CSV_STATEMENT.encode(), content_type="text/csv")
+
+        with mock.patch("manager.views.IMPORT_SYNC_MAX_SIZE", 10):
+            response = self.client.post(
+                reverse("manager:statement-import"), {"wallet_choice": f"card - {self.card.id}", "statement": statement}
+            )
+
+        job = response.context["job"]
+        self.assertEqual((job.name, job.user_id, job.status), ("import_statement", self.user.id, Job.QUEUED))
+        self.assertContains(response, reverse("manager:job-status", args=[job.id]))
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 0)
+
+        claim_jobs(1)
+        run_job(job.id)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 98025)
+
+        response = self.client.get(reverse("manager:job-status", args=[job.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], Job.SUCCEEDED)
+        self.assertEqual(response.json()["result"], {"imported": 2})
+
+    def test_job_status_of_other_user(self) -> None:
+        job = enqueue("materialize_recurring", user_id=self.user.id)
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(other_user)
+
+        response = self.client.get(reverse("manager:job-status", args=[job.id]))
+        self.assertEqual(response.status_code, 404)
+
+
+class JobWorkerTests(TransactionTestCase):
+    def test_worker_runs_jobs_in_a_pool(self) -> None:
+        jobs = [enqueue("materialize_recurring") for _ in range(5)]
+
+        out = StringIO()
+        call_command("run_jobs", "--once", "--workers", "3", "--poll-interval", "0.01", stdout=out)
+
+        self.assertIn("Ran 5 jobs.", out.getvalue())
+        self.assertEqual(
+            list(Job.objects.filter(id__in=[job.id for job in jobs]).values_list("status", flat=True).distinct()),  # type: ignore[reportAttributeAccessIssue]
+            [Job.SUCCEEDED],
+        )
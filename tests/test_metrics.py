@@ -0,0 +1,65 @@
+import re
+from typing import TYPE_CHECKING
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from faker import Faker
+
+from manager.metrics import assert_max_queries
+from manager.models import Card, Currency
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+WALLETS_URL = reverse("manager:wallets")
+SERVER_TIMING = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries", template;dur=([\d.]+), view;dur=[\d.]+')
+
+fake = Faker()
+
+
+@override_settings(
+    MIDDLEWARE=["manager.metrics.RequestMetricsMiddleware", *settings.MIDDLEWARE],
+    TEMPLATES=[{**settings.TEMPLATES[0], "BACKEND": "manager.metrics.DjangoTemplates"}],
+)
+class RequestMetricsTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(self.user)
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+
+    def assert_server_timing(self, header: str) -> None:
+        timing = SERVER_TIMING.fullmatch(header)
+        self.assertIsNotNone(timing, header)
+        self.assertGreater(int(timing[1]), 0)  # type: ignore[reportOptionalSubscript]
+        self.assertGreater(float(timing[2]), 0)  # type: ignore[reportOptionalSubscript]
+
+    def test_server_timing_header(self) -> None:
+        with assert_max_queries(10) as captured:
+            response = self.client.get(WALLETS_URL)
+
+        self.assert_server_timing(response["Server-Timing"])
+        self.assertEqual(SERVER_TIMING.fullmatch(response["Server-Timing"])[1], str(len(captured)))  # type: ignore[reportOptionalSubscript]
+
+    async def test_server_timing_header_under_asgi(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(WALLETS_URL)
+
+        self.assert_server_timing(response["Server-Timing"])
+
+    def test_requests_over_budget_are_logged(self) -> None:
+        with (
+            override_settings(REQUEST_METRICS_BUDGETS={"queries": 1}),
+            self.assertLogs("manager.metrics", "WARNING") as logs,
+        ):
+            self.client.get(WALLETS_URL)
+
+        self.assertIn(f"GET {WALLETS_URL} is over budget", logs.output[0])
+
+    def test_assert_max_queries(self) -> None:
+        with self.assertRaisesMessage(AssertionError, "2 queries executed, the budget is 1"), assert_max_queries(1):
+            list(Card.objects.all())
+            list(Currency.objects.all())
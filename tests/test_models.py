@@ -1,15 +1,19 @@
+from decimal import Decimal
 from typing import TYPE_CHECKING
+from unittest import mock
 
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
 from django.test import TestCase
 from faker import Faker
 
+from manager.currencies import currencies
 from manager.models import Card, Cash, Cryptocurrency, Currency
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import UserManager
 
-BALANCE = 150.0002
+BALANCE = 15002
 
 fake = Faker()
 
@@ -39,19 +43,52 @@ class ModelsTest(TestCase):
     def test_card_str(self) -> None:
         self.assertEqual(
             str(self.card),
-            f"Card: {self.card.bank_name} - {self.card.type} - {self.card.balance} {self.card.currency.sign}",
+            f"Card: {self.card.bank_name} - {self.card.type} - {self.card.balance_decimal} {self.card.currency.sign}",
         )
 
-    def test_card_clean(self) -> None:
-        self.assertEqual(self.card.balance, round(BALANCE, 2))
+    def test_wallet_str_resolves_currency_without_query(self) -> None:
+        str(self.card)
+        card = Card.objects.get(id=self.card.id)
+        cash = Cash.objects.get(id=self.cash.id)
+        with self.assertNumQueries(0):
+            self.assertTrue(str(card).endswith(" $"))
+            self.assertTrue(str(cash).endswith(" $ (USD)"))
+
+    def test_currency_registry_is_refreshed_on_change(self) -> None:
+        str(self.card)
+        self.currency.sign = "US$"
+        self.currency.save()
+        self.assertTrue(str(self.card).endswith(" US$"))
+
+    def test_currency_registry_expires(self) -> None:
+        str(self.card)
+        # Changed by another process, whose signals don't reach this one
+        Currency.objects.filter(id=self.currency.id).update(sign="US$")  # type: ignore[reportAttributeAccessIssue]
+        self.assertTrue(str(self.card).endswith(" $"))
+
+        with mock.patch.object(currencies, "ttl", 0):
+            self.assertTrue(str(self.card).endswith(" US$"))
+
+    def test_currency_decimal_places_are_kept_with_wallets(self) -> None:
+        self.currency.decimal_places = 0
+        with self.assertRaises(ValidationError):
+            self.currency.full_clean()
+
+        euro = Currency.objects.create(name="Euro", abbreviation="EUR", sign="€")
+        euro.decimal_places = 0
+        euro.full_clean()
+
+    def test_card_balance_decimal(self) -> None:
+        self.assertEqual(self.card.balance_decimal, Decimal("150.02"))
 
     def test_cash_str(self) -> None:
         self.assertEqual(
-            str(self.cash), f"Cash - {self.cash.balance} {self.cash.currency.sign} ({self.currency.abbreviation})"
+            str(self.cash),
+            f"Cash - {self.cash.balance_decimal} {self.cash.currency.sign} ({self.currency.abbreviation})",
         )
 
-    def test_cash_clean(self) -> None:
-        self.assertEqual(self.cash.balance, round(BALANCE, 2))
+    def test_cash_balance_decimal(self) -> None:
+        self.assertEqual(self.cash.balance_decimal, Decimal("150.02"))
 
     def test_cryptocurrency_str(self) -> None:
-        self.assertEqual(str(self.crypto), f"Cryptocurrency: {self.crypto.name} - {self.crypto.balance}")
+        self.assertEqual(str(self.crypto), f"Cryptocurrency: {self.crypto.name} - {self.crypto.balance_decimal}")
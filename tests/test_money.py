@@ -0,0 +1,29 @@
+from decimal import Decimal
+
+from django.core.exceptions import ValidationError
+from django.test import SimpleTestCase
+
+from manager.money import from_minor, to_minor
+
+
+class MoneyTests(SimpleTestCase):
+    def test_to_minor(self) -> None:
+        self.assertEqual(to_minor("12.34", 2), 1234)
+        self.assertEqual(to_minor("0.1", 2), 10)
+        self.assertEqual(to_minor("0.005", 2), 1)
+        self.assertEqual(to_minor("1500", 0), 1500)
+        self.assertEqual(to_minor(Decimal("0.00012345"), 8), 12345)
+
+    def test_invalid_amount(self) -> None:
+        for amount in ("", "ten", "NaN", "Infinity", None):
+            with self.subTest(amount=amount), self.assertRaises(ValidationError):
+                to_minor(amount, 2)  # type: ignore[reportArgumentType]
+
+    def test_from_minor(self) -> None:
+        self.assertEqual(str(from_minor(1234, 2)), "12.34")
+        self.assertEqual(str(from_minor(10, 2)), "0.10")
+        self.assertEqual(str(from_minor(1500, 0)), "1500")
+        self.assertEqual(str(from_minor(12345, 8)), "0.00012345")
+
+    def test_sums_are_exact(self) -> None:
+        self.assertEqual(from_minor(sum(to_minor("0.1", 2) for _ in range(10)), 2), Decimal(1))
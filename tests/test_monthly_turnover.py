@@ -0,0 +1,65 @@
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from faker import Faker
+
+from manager.models import Accountancy, Card, Category, Currency, MonthlyTurnover
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class MonthlyTurnoverTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        self.month = timezone.localdate().replace(day=1)
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
+
+    def test_rollup_follows_accountancy_writes(self) -> None:
+        first = Accountancy.objects.create(card=self.card, IO="O", category=self.food, amount=1050)
+        Accountancy.objects.create(card=self.card, IO="O", category=self.food, amount=425)
+        Accountancy.objects.create(card=self.card, IO="I", category=self.salary, amount=10000)
+
+        outcome = MonthlyTurnover.objects.get(card=self.card, IO="O", month=self.month)
+        self.assertEqual((outcome.amount_sum, outcome.transactions), (1475, 2))
+
+        first.amount = 2000
+        first.save()
+        outcome.refresh_from_db()
+        self.assertEqual((outcome.amount_sum, outcome.transactions), (2425, 2))
+
+        first.IO = "I"
+        first.save()
+        outcome.refresh_from_db()
+        self.assertEqual((outcome.amount_sum, outcome.transactions), (425, 1))
+        self.assertEqual(MonthlyTurnover.objects.get(card=self.card, IO="I", month=self.month).amount_sum, 12000)
+
+        first.delete()
+        self.assertEqual(MonthlyTurnover.objects.get(card=self.card, IO="I", month=self.month).transactions, 1)
+
+    def test_empty_rollup_rows_are_removed(self) -> None:
+        Accountancy.objects.create(card=self.card, IO="O", category=self.food, amount=10).delete()
+
+        self.assertFalse(MonthlyTurnover.objects.exists())
+
+    def test_rebuild_command(self) -> None:
+        Accountancy.objects.create(card=self.card, IO="O", category=self.food, amount=10)
+        Accountancy.objects.create(card=self.card, IO="O", category=self.food, amount=5)
+        expected = list(MonthlyTurnover.objects.values("card_id", "IO", "month", "amount_sum", "transactions"))
+        MonthlyTurnover.objects.update(amount_sum=0, transactions=0)
+
+        call_command("rebuild_monthly_turnover", stdout=StringIO())
+
+        self.assertEqual(
+            list(MonthlyTurnover.objects.values("card_id", "IO", "month", "amount_sum", "transactions")), expected
+        )
@@ -0,0 +1,96 @@
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from faker import Faker
+
+from manager.currencies import currencies
+from manager.models import Accountancy, Card, Cash, Category, Currency
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+ACCOUNTANCY_URL = reverse("manager:monthly-accountancy-list")
+
+fake = Faker()
+
+
+class CursorPaginationTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(user)
+
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=user, bank_name="Mono", type="Payment card", currency=currency)
+        cash = Cash.objects.create(user=user, currency=currency)
+        salary = Category.objects.get(user=None, IO="I", name="Salary")
+        food = Category.objects.get(user=None, IO="O", name="Food")
+        start = datetime(2023, 3, 1, tzinfo=UTC)
+        # Every second record shares its datetime with the previous one to exercise the id tie-breaker
+        Accountancy.objects.bulk_create(
+            Accountancy(
+                card=self.card, IO="O", category=food, amount=index, datetime=start + timedelta(hours=index // 2)
+            )
+            for index in range(25)
+        )
+        for month in range(1, 7):
+            Accountancy.objects.create(
+                cash=cash, IO="I", category=salary, amount=1, datetime=datetime(2022, month, 5, tzinfo=UTC)
+            )
+            Accountancy.objects.create(
+                cash=cash, IO="O", category=food, amount=1, datetime=datetime(2022, month, 6, tzinfo=UTC)
+            )
+
+        self.detail_url = reverse(
+            "manager:monthly-accountancy",
+            kwargs={"wallet": "card", "wallet_id": self.card.id, "month": 3, "year": 2023},
+        )
+
+    def walk(self, url: str, key: str) -> tuple[list, list]:
+        """Follow the next links to the last page and the previous links back to the first one."""
+        forward, pages = [], []
+        response = self.client.get(url)
+        while True:
+            page = response.context["page_obj"]
+            pages.append([row[key] for row in page.object_list])
+            forward.extend(row[key] for row in page.object_list)
+            if not page.has_next:
+                break
+            response = self.client.get(url, {"cursor": page.next_cursor})
+
+        backward = [[row[key] for row in page.object_list]]
+        while page.has_previous:
+            page = self.client.get(url, {"cursor": page.previous_cursor}).context["page_obj"]
+            backward.insert(0, [row[key] for row in page.object_list])
+        self.assertEqual(backward, pages)
+        return forward, pages
+
+    def test_detail_pages_follow_datetime_and_id(self) -> None:
+        ids, pages = self.walk(self.detail_url, "id")
+
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertEqual(
+            ids,
+            list(Accountancy.objects.filter(card=self.card).order_by("-datetime", "-id").values_list("id", flat=True)),
+        )
+
+    def test_monthly_pages_follow_month_and_wallet(self) -> None:
+        months, pages = self.walk(ACCOUNTANCY_URL, "month")
+
+        # The bulk created card records bypass the rollup, so only the cash incomes and outcomes are listed
+        self.assertEqual([len(page) for page in pages], [10, 2])
+        self.assertEqual(months, sorted(months, reverse=True))
+
+    def test_deep_page_costs_as_much_as_the_first_one(self) -> None:
+        currencies.all()
+        # Session, user, the wallet currency and the page itself: neither OFFSET nor COUNT(*)
+        with self.assertNumQueries(4):
+            response = self.client.get(self.detail_url)
+        with self.assertNumQueries(4):
+            self.client.get(self.detail_url, {"cursor": response.context["page_obj"].next_cursor})
+
+    def test_invalid_cursor(self) -> None:
+        self.assertEqual(self.client.get(self.detail_url, {"cursor": "not a cursor"}).status_code, 404)
@@ -0,0 +1,56 @@
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+from django.test import TestCase
+from django.utils import timezone
+from faker import Faker
+
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, Currency, MonthlyTurnover
+from manager.wallet_operations import month_range, monthly_wallet_accountancy
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class QueryPlanTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=user, bank_name="Mono", type="Payment card", currency=currency)
+        self.cash = Cash.objects.create(user=user, currency=currency)
+        self.crypto = Cryptocurrency.objects.create(user=user, name="BitCoin")
+        salary = Category.objects.get(user=None, IO="I", name="Salary")
+        Accountancy.objects.create(card=self.card, IO="I", category=salary, amount=10)
+        Accountancy.objects.create(cash=self.cash, IO="I", category=salary, amount=10)
+        Accountancy.objects.create(cryptocurrency=self.crypto, IO="I", category=salary, amount=10)
+
+    def test_monthly_wallet_accountancy_uses_wallet_datetime_indexes(self) -> None:
+        today = timezone.localdate()
+        for wallet_type, wallet, index in (
+            ("card", self.card, "acc_card_datetime_idx"),
+            ("cash", self.cash, "acc_cash_datetime_idx"),
+            ("crypto", self.crypto, "acc_crypto_datetime_idx"),
+        ):
+            with self.subTest(wallet_type=wallet_type):
+                queryset = monthly_wallet_accountancy(wallet_type, wallet.id, today.year, today.month)
+
+                self.assertEqual(queryset.count(), 1)
+                self.assertIn(index, queryset.values("id", "IO", "category_id", "amount", "datetime").explain())
+
+    def test_monthly_financial_turnover_uses_rollup_index(self) -> None:
+        queryset = MonthlyTurnover.objects.filter(
+            Q(card_id=self.card.id) & Q(IO="I") & Q(month=timezone.localdate().replace(day=1))
+        ).values_list("amount_sum", flat=True)
+
+        self.assertEqual(list(queryset), [10])
+        self.assertIn("unique_card_monthly_turnover", queryset.explain())
+
+    def test_month_range_is_half_open_and_year_aware(self) -> None:
+        start, end = month_range(2022, 12)
+
+        self.assertEqual((start.year, start.month, start.day), (2022, 12, 1))
+        self.assertEqual((end.year, end.month, end.day), (2023, 1, 1))
@@ -0,0 +1,84 @@
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from faker import Faker
+
+from manager.models import Accountancy, Card, Cash, Category, Currency
+from manager.reconciliation import Drift, reconcile_balances, reconcile_users, user_id_ranges
+from manager.wallet_operations import post_transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class ReconciliationTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(
+            user=self.user, bank_name="Mono", type="Payment card", currency=currency, balance=1000
+        )
+        self.cash = Cash.objects.create(user=self.user, currency=currency)
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
+        post_transaction("card", self.card.id, "I", self.salary.id, 500)  # type: ignore[reportAttributeAccessIssue]
+        post_transaction("card", self.card.id, "O", self.food.id, 200)  # type: ignore[reportAttributeAccessIssue]
+
+    def test_opening_balance(self) -> None:
+        self.card.refresh_from_db()
+        self.assertEqual((self.card.opening_balance, self.card.balance), (1000, 1300))
+
+    def test_balances_without_drift(self) -> None:
+        self.assertEqual(reconcile_balances(), (2, [], 0))
+
+    def test_fix_drift(self) -> None:
+        # A record saved without changing the balance, as the old delete view left them the other way round
+        Accountancy.objects.create(cash=self.cash, IO="I", category=self.salary, amount=70)
+
+        with self.assertNumQueries(3):
+            result = reconcile_users(self.user.id, None)
+        self.assertEqual(result.drifts, [Drift("cash", self.cash.id, self.user.id, 0, 70)])  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(reconcile_balances(fix=True).fixed, 1)
+        self.cash.refresh_from_db()
+        self.assertEqual(self.cash.balance, 70)
+        self.assertEqual(reconcile_balances(), (2, [], 0))
+
+    def test_negative_expected_balance_is_not_fixed(self) -> None:
+        Accountancy.objects.create(cash=self.cash, IO="O", category=self.food, amount=70)
+
+        result = reconcile_balances(fix=True)
+        self.assertEqual((len(result.drifts), result.fixed), (1, 0))
+        self.cash.refresh_from_db()
+        self.assertEqual(self.cash.balance, 0)
+
+    def test_user_id_ranges(self) -> None:
+        user_manager = get_user_model().objects
+        users = [self.user, *(user_manager.create_user(username=fake.pystr()) for _ in range(4))]
+
+        self.assertEqual(
+            user_id_ranges(2),
+            [(users[0].id, users[2].id), (users[2].id, users[4].id), (users[4].id, None)],
+        )
+
+
+class ReconcileBalancesCommandTests(TransactionTestCase):
+    def test_workers_check_every_user(self) -> None:
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        salary = Category.objects.create(IO="I", name="Salary")
+        for _ in range(5):
+            user = get_user_model().objects.create_user(username=fake.pystr())
+            card = Card.objects.create(user=user, bank_name="Mono", type="Payment card", currency=currency)
+            Accountancy.objects.create(card=card, IO="I", category=salary, amount=100)
+
+        out = StringIO()
+        call_command("reconcile_balances", "--fix", "--workers", "3", "--batch-size", "2", stdout=out)
+
+        self.assertIn("Checked 5 wallets, 5 drifted, 5 fixed.", out.getvalue())
+        self.assertEqual(list(Card.objects.values_list("balance", flat=True).distinct()), [100])
@@ -0,0 +1,121 @@
+from datetime import date
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+from faker import Faker
+
+from manager.metrics import assert_max_queries
+from manager.models import Accountancy, Card, Cash, Category, Currency, MonthlyTurnover, RecurringTransaction
+from manager.recurring import materialize_recurring
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class RecurringTransactionTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        self.cash = Cash.objects.create(user=self.user, currency=currency, balance=500)
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.home = Category.objects.get(user=None, IO="O", name="Home")
+
+    def test_monthly_occurrences_keep_the_day_of_the_month(self) -> None:
+        recurring = RecurringTransaction.objects.create(
+            card=self.card, IO="I", category=self.salary, amount=100, start_date=date(2024, 1, 31)
+        )
+
+        self.assertEqual(recurring.next_date, date(2024, 1, 31))
+        self.assertEqual(
+            [recurring.occurrence(index) for index in range(4)],
+            [date(2024, 1, 31), date(2024, 2, 29), date(2024, 3, 31), date(2024, 4, 30)],
+        )
+
+    def test_catch_up_is_one_idempotent_pass(self) -> None:
+        salary = RecurringTransaction.objects.create(
+            card=self.card, IO="I", category=self.salary, amount=100000, start_date=date(2024, 1, 31)
+        )
+        rent = RecurringTransaction.objects.create(
+            card=self.card, IO="O", category=self.home, amount=40000, start_date=date(2024, 2, 1)
+        )
+        RecurringTransaction.objects.create(
+            cash=self.cash,
+            IO="O",
+            category=self.home,
+            amount=10,
+            period=RecurringTransaction.WEEKLY,
+            start_date=date(2024, 3, 1),
+        )
+
+        self.assertEqual(materialize_recurring(date(2024, 4, 15)), (3 + 3 + 7, 0))
+
+        self.card.refresh_from_db()
+        self.cash.refresh_from_db()
+        self.assertEqual(self.card.balance, 3 * 100000 - 3 * 40000)
+        self.assertEqual(self.cash.balance, 500 - 7 * 10)
+        salary.refresh_from_db()
+        rent.refresh_from_db()
+        self.assertEqual((salary.occurrences, salary.next_date), (3, date(2024, 4, 30)))
+        self.assertEqual((rent.occurrences, rent.next_date), (3, date(2024, 5, 1)))
+        self.assertEqual(MonthlyTurnover.objects.get(card=self.card, IO="O", month=date(2024, 3, 1)).amount_sum, 40000)
+        self.assertEqual(
+            timezone.localtime(Accountancy.objects.filter(card=self.card).earliest("datetime").datetime).date(),
+            date(2024, 1, 31),
+        )
+
+        self.assertEqual(materialize_recurring(date(2024, 4, 15)), (0, 0))
+        self.assertEqual(Accountancy.objects.count(), 13)
+
+    def test_queries_do_not_grow_with_occurrences(self) -> None:
+        for _ in range(20):
+            RecurringTransaction.objects.create(
+                card=self.card,
+                IO="I",
+                category=self.salary,
+                amount=1,
+                period=RecurringTransaction.DAILY,
+                start_date=date(2024, 1, 1),
+            )
+
+        # Two batches of about fifteen queries (SQLite splits the inserts) plus the empty one
+        with assert_max_queries(36):
+            result = materialize_recurring(date(2024, 1, 31), batch_size=10)
+        self.assertEqual(result.created, 20 * 31)
+
+    def test_unaffordable_outcomes_are_left_due(self) -> None:
+        recurring = RecurringTransaction.objects.create(
+            cash=self.cash, IO="O", category=self.home, amount=300, start_date=date(2024, 1, 1)
+        )
+
+        self.assertEqual(materialize_recurring(date(2024, 2, 1)), (0, 1))
+        recurring.refresh_from_db()
+        self.assertEqual(recurring.next_date, date(2024, 1, 1))
+
+        Cash.objects.filter(id=self.cash.id).update(balance=600)
+        self.assertEqual(materialize_recurring(date(2024, 2, 1)), (2, 0))
+
+    def test_schedule_ends(self) -> None:
+        recurring = RecurringTransaction.objects.create(
+            card=self.card,
+            IO="I",
+            category=self.salary,
+            amount=1,
+            period=RecurringTransaction.DAILY,
+            start_date=date(2024, 1, 1),
+            end_date=date(2024, 1, 3),
+        )
+
+        out = StringIO()
+        call_command("materialize_recurring", "--date", "2024-02-01", stdout=out)
+
+        self.assertIn("Posted 3 recurring transactions.", out.getvalue())
+        recurring.refresh_from_db()
+        self.assertIsNone(recurring.next_date)
@@ -0,0 +1,67 @@
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from manager.models import Accountancy, Card, Category, Currency
+from manager.search import search_categories
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class SearchTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_superuser(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+        for io, name in (("I", "Salary"), ("O", "Food"), ("O", "Fast food"), ("O", "Pets"), ("O", 'Say "hi"')):
+            category, _ = Category.objects.get_or_create(
+                user=None if name in {"Salary", "Food", "Pets"} else self.user, IO=io, name=name
+            )
+            Accountancy.objects.create(card=self.card, IO=io, category=category, amount=1)
+
+    def search(self, term: str) -> list[str]:
+        records = search_categories(Accountancy.objects.filter(card=self.card), term, self.user.id)
+        return sorted(records.values_list("category__name", flat=True))
+
+    def test_search_ignores_case(self) -> None:
+        self.assertEqual(self.search("FOOD"), ["Fast food", "Food"])
+        self.assertEqual(self.search("ala"), ["Salary"])
+        self.assertEqual(self.search('"hi"'), ['Say "hi"'])
+        self.assertEqual(len(self.search("  ")), 5)
+
+    def test_search_follows_renamed_category(self) -> None:
+        Category.objects.filter(user=self.user, name="Fast food").update(name="Takeaway")
+
+        self.assertEqual(self.search("food"), ["Food"])
+        self.assertEqual(self.search("away"), ["Takeaway"])
+
+    def test_search_skips_categories_of_other_users(self) -> None:
+        other_user = get_user_model().objects.create_user(username=fake.pystr())
+        category = Category.objects.create(user=other_user, IO="O", name="Food court")
+        Accountancy.objects.create(card=self.card, IO="O", category=category, amount=1)
+
+        self.assertEqual(self.search("food"), ["Fast food", "Food"])
+
+    def test_admin_and_monthly_search(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse("admin:manager_accountancy_changelist"), {"q": "food"})
+        self.assertEqual(response.context["cl"].result_count, 2)
+
+        month = timezone.localtime(Accountancy.objects.filter(card=self.card).first().datetime)  # type: ignore[reportOptionalMemberAccess]
+        url = reverse(
+            "manager:monthly-accountancy",
+            kwargs={"wallet": "card", "wallet_id": self.card.id, "month": month.month, "year": month.year},
+        )
+        response = self.client.get(url, {"IO_type": "food"})
+        self.assertEqual(
+            sorted(row["category_name"] for row in response.context["accountancy_list"]), ["Fast food", "Food"]
+        )
@@ -0,0 +1,109 @@
+from datetime import UTC, date, datetime
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from faker import Faker
+
+from manager.cache import cached_wallet_objects
+from manager.currencies import currencies
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, Currency
+from manager.spending import spending_breakdown
+from manager.wallet_operations import post_transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+SPENDING_URL = reverse("manager:spending")
+
+fake = Faker()
+
+
+class SpendingBreakdownTests(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        other_user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(self.user)
+
+        usd = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        jpy = Currency.objects.create(name="Japanese Yen", abbreviation="JPY", sign="¥", decimal_places=0)
+        self.card = Card.objects.create(
+            user=self.user, bank_name="Mono", type="Payment card", balance=1000, currency=usd
+        )
+        self.cash = Cash.objects.create(user=self.user, currency=jpy)
+        self.crypto = Cryptocurrency.objects.create(user=self.user, name="BitCoin")
+        other_card = Card.objects.create(user=other_user, bank_name="Mono", type="Payment card", currency=usd)
+
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
+        in_range, out_of_range = datetime(2023, 1, 10, tzinfo=UTC), datetime(2023, 2, 10, tzinfo=UTC)
+        for wallet, io, category, amount, moment in (
+            ({"card": self.card}, "I", self.salary, 10000, in_range),
+            ({"card": self.card}, "O", self.food, 250, in_range),
+            ({"card": self.card}, "O", self.food, 150, in_range),
+            ({"card": self.card}, "O", self.food, 999, out_of_range),
+            ({"cash": self.cash}, "O", self.food, 700, in_range),
+            ({"cryptocurrency": self.crypto}, "I", self.salary, 5000, in_range),
+            ({"card": other_card}, "O", self.food, 100, in_range),
+        ):
+            Accountancy.objects.create(**wallet, IO=io, category=category, amount=amount, datetime=moment)
+
+    def test_totals_per_category_direction_and_wallet(self) -> None:
+        breakdown = spending_breakdown(self.user.id, date(2023, 1, 1), date(2023, 1, 31))
+
+        self.assertEqual((breakdown["start"], breakdown["end"]), ("2023-01-01", "2023-01-31"))
+        self.assertEqual(
+            breakdown["IO"], {"I": {"USD": "100.00", "BitCoin": "0.00005000"}, "O": {"USD": "4.00", "JPY": "700"}}
+        )
+        food = next(category for category in breakdown["categories"] if category["id"] == self.food.id)
+        self.assertEqual(
+            (food["name"], food["IO"], food["totals"], food["transactions"]),
+            ("Food", "O", {"USD": "4.00", "JPY": "700"}, 3),
+        )
+        card = next(wallet for wallet in breakdown["wallets"] if wallet["wallet"] == f"card - {self.card.id}")
+        self.assertEqual((card["currency"], card["income"], card["outcome"]), ("USD", "100.00", "4.00"))
+        self.assertEqual(
+            sorted((category["name"], category["amount"], category["transactions"]) for category in card["categories"]),
+            [("Food", "4.00", 2), ("Salary", "100.00", 1)],
+        )
+
+    def test_breakdown_is_one_query_and_cached(self) -> None:
+        cached_wallet_objects(self.user.id)
+        currencies.all()
+
+        with self.assertNumQueries(1):
+            breakdown = spending_breakdown(self.user.id, date(2023, 1, 1), date(2023, 1, 31))
+        with self.assertNumQueries(0):
+            self.assertEqual(spending_breakdown(self.user.id, date(2023, 1, 1), date(2023, 1, 31)), breakdown)
+
+    def test_posting_invalidates_breakdown(self) -> None:
+        spending_breakdown(self.user.id)
+
+        post_transaction("card", self.card.id, "O", self.food.id, 100)
+
+        self.assertEqual(spending_breakdown(self.user.id)["IO"]["O"]["USD"], "14.99")
+
+    def test_deleting_invalidates_breakdown(self) -> None:
+        spending_breakdown(self.user.id)
+        record = Accountancy.objects.get(cash=self.cash)
+
+        self.client.post(reverse("manager:accountancy-delete", kwargs={"pk": record.id}))
+
+        self.assertNotIn("JPY", spending_breakdown(self.user.id)["IO"]["O"])
+
+    def test_spending_view(self) -> None:
+        response = self.client.get(SPENDING_URL, {"start": "2023-02-01", "end": "2023-02-28"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["IO"], {"I": {}, "O": {"USD": "9.99"}})
+
+        response = self.client.get(SPENDING_URL)
+        self.assertEqual(response.json()["start"], timezone.localdate().replace(day=1).isoformat())
+
+        response = self.client.get(SPENDING_URL, {"start": "2023-02-01", "end": "2023-01-01"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("errors", response.json())
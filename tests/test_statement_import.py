@@ -0,0 +1,121 @@
+from io import StringIO
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from django.urls import reverse
+from faker import Faker
+
+from manager.models import Accountancy, Card, Category, Currency, MonthlyTurnover
+from manager.statement_import import import_statement, read_csv, read_ofx
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+CSV_STATEMENT = """datetime,amount,IO_type
+2024-01-05,1000.50,Salary
+2024-01-06 12:30,-20.25,Food
+2024-02-01T09:00:00,-80,Home
+"""
+
+OFX_STATEMENT = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20240105120000[+2:EET]
+<TRNAMT>1000.50
+<NAME>Employer
+</STMTTRN>
+<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240106<TRNAMT>-20.25<NAME>Shop</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+fake = Faker()
+
+
+class StatementImportTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=self.user, bank_name="Mono", type="Payment card", currency=currency)
+
+    def test_read_csv(self) -> None:
+        rows = list(read_csv(StringIO(CSV_STATEMENT)))
+
+        self.assertEqual(
+            [(row.IO, row.IO_type, float(row.amount)) for row in rows],
+            [
+                ("I", "Salary", 1000.5),
+                ("O", "Food", 20.25),
+                ("O", "Home", 80),
+            ],
+        )
+        self.assertEqual((rows[1].datetime.day, rows[1].datetime.hour), (6, 12))
+
+    def test_read_ofx(self) -> None:
+        rows = list(read_ofx(StringIO(OFX_STATEMENT)))
+
+        self.assertEqual(
+            [(row.IO, float(row.amount), row.datetime.day) for row in rows], [("I", 1000.5, 5), ("O", 20.25, 6)]
+        )
+
+    def test_malformed_statements(self) -> None:
+        statements = (
+            (read_csv, "datetime,amount\n2024-01-05,NaN\n"),
+            (read_csv, "datetime,amount\n2024-01-05,sNaN\n"),
+            (read_csv, "datetime,amount\n2024-01-05,Infinity\n"),
+            (read_csv, "datetime,amount\n2024-13-05 10:00,1\n"),
+            (read_csv, "datetime,amount\n2024-01-05\n"),
+            (read_csv, "datetime,amount,IO\n\n,\n"),
+            (read_ofx, "<STMTTRN><DTPOSTED>20241399<TRNAMT>1</STMTTRN>"),
+            (read_ofx, "<STMTTRN><DTPOSTED>20240105<TRNAMT>-Inf</STMTTRN>"),
+        )
+        for read, statement in statements:
+            with self.subTest(statement=statement), self.assertRaises(ValidationError):
+                list(read(StringIO(statement)))
+
+    def test_import_statement(self) -> None:
+        imported = import_statement(read_csv(StringIO(CSV_STATEMENT)), "card", self.card.id, batch_size=2)
+
+        self.card.refresh_from_db()
+        self.assertEqual(imported, 3)
+        self.assertEqual(self.card.balance, 90025)
+        self.assertEqual(Accountancy.objects.filter(card=self.card).count(), 3)
+        self.assertEqual(
+            sorted(MonthlyTurnover.objects.values_list("IO", "month__month", "amount_sum", "transactions")),
+            [("I", 1, 100050, 1), ("O", 1, 2025, 1), ("O", 2, 8000, 1)],
+        )
+
+    def test_import_statement_resolves_categories(self) -> None:
+        statement = "datetime,amount,IO_type\n2024-01-05,10,salary\n2024-01-06,-1,Gym\n2024-01-07,-2,Gym\n"
+        import_statement(read_csv(StringIO(statement)), "card", self.card.id)
+
+        gym = Category.objects.get(user=self.user, IO="O", name="Gym")
+        self.assertEqual(
+            list(Accountancy.objects.order_by("datetime").values_list("category__user", "category__name")),
+            [(None, "Salary"), (self.user.id, "Gym"), (self.user.id, "Gym")],
+        )
+        self.assertEqual(Accountancy.objects.filter(category=gym).count(), 2)
+
+    def test_import_statement_is_atomic(self) -> None:
+        with self.assertRaises(ValidationError):
+            import_statement(read_csv(StringIO("datetime,amount\n2024-01-05,-1\n")), "card", self.card.id)
+
+        self.assertFalse(Accountancy.objects.exists())
+        self.assertFalse(MonthlyTurnover.objects.exists())
+
+    def test_upload_view(self) -> None:
+        self.client.force_login(self.user)
+        statement = SimpleUploadedFile("statement.csv", CSV_STATEMENT.encode(), content_type="text/csv")
+
+        response = self.client.post(
+            reverse("manager:statement-import"), {"wallet_choice": f"card - {self.card.id}", "statement": statement}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["imported"], 3)
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 90025)
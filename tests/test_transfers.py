@@ -0,0 +1,146 @@
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.test import TestCase
+from django.urls import reverse
+from faker import Faker
+
+from manager.models import Accountancy, Card, Cash, Category, Cryptocurrency, Currency
+from manager.reconciliation import reconcile_balances
+from manager.wallet_operations import delete_transaction, post_transaction, post_transfer
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+TRANSFER_URL = reverse("manager:transfer")
+
+
+class TransferTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        self.user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(
+            user=self.user, bank_name="Mono", type="Payment card", currency=currency, balance=10000
+        )
+        self.cash = Cash.objects.create(user=self.user, currency=currency, balance=500)
+        self.bitcoin = Cryptocurrency.objects.create(user=self.user, name="BitCoin")
+
+    def balances(self) -> tuple[int, int, int]:
+        for wallet in (self.card, self.cash, self.bitcoin):
+            wallet.refresh_from_db()
+        return self.card.balance, self.cash.balance, self.bitcoin.balance
+
+    def test_post_transfer(self) -> None:
+        outcome, income = post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(self.balances(), (7000, 3500, 0))
+        self.assertEqual((outcome.card_id, outcome.IO, outcome.amount), (self.card.id, "O", 3000))  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual((income.cash_id, income.IO, income.amount), (self.cash.id, "I", 3000))  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual(outcome.transfer, income.transfer)
+        self.assertEqual({outcome.category.name, income.category.name}, {Category.TRANSFER})
+        self.assertEqual(reconcile_balances().drifts, [])
+
+    def test_unaffordable_transfer_writes_nothing(self) -> None:
+        # The destination comes first in the lock order, so its balance is updated before the source is found short
+        with self.assertRaisesMessage(ValidationError, "There's too small amount of money on the balance"):
+            post_transfer(self.user.id, ("cash", self.cash.id), ("card", self.card.id), 501)  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(self.balances(), (10000, 500, 0))
+        self.assertFalse(Accountancy.objects.exists())
+
+    def test_transfer_to_other_users_wallet(self) -> None:
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        other_cash = Cash.objects.create(user=other_user, currency=self.card.currency)
+
+        with self.assertRaises(Cash.DoesNotExist):
+            post_transfer(self.user.id, ("card", self.card.id), ("cash", other_cash.id), 100)  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual(self.balances(), (10000, 500, 0))
+
+    def test_delete_transfer(self) -> None:
+        outcome, _ = post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+
+        delete_transaction(outcome)
+
+        self.assertEqual(self.balances(), (10000, 500, 0))
+        self.assertFalse(Accountancy.objects.exists())
+
+    def test_transfer_view(self) -> None:
+        self.client.force_login(self.user)
+
+        response = self.client.post(
+            TRANSFER_URL, {"source": f"card - {self.card.id}", "destination": f"cash - {self.cash.id}", "amount": "25"}
+        )
+        self.assertRedirects(response, reverse("manager:wallets"))
+        self.assertEqual(self.balances(), (7500, 3000, 0))
+
+        response = self.client.post(
+            TRANSFER_URL,
+            {"source": f"card - {self.card.id}", "destination": f"crypto - {self.bitcoin.id}", "amount": "25"},
+        )
+        self.assertFormError(
+            response.context["form"], "received", "The wallets have different currencies, enter the amount received."
+        )
+
+        response = self.client.post(
+            TRANSFER_URL,
+            {
+                "source": f"card - {self.card.id}",
+                "destination": f"crypto - {self.bitcoin.id}",
+                "amount": "25",
+                "received": "0.0004",
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.balances(), (5000, 3000, 40000))
+
+    def test_transfer_records_cannot_be_updated(self) -> None:
+        self.client.force_login(self.user)
+        outcome, _ = post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+
+        response = self.client.post(
+            reverse("manager:accountancy-update", kwargs={"pk": outcome.id}),  # type: ignore[reportAttributeAccessIssue]
+            {"wallet_choice": "card - 30.00", "amount": "10"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.balances(), (7000, 3500, 0))
+
+    def test_admin_deletes_revert_the_balances(self) -> None:
+        admin = get_user_model().objects.create_superuser(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(admin)
+        post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+        income = Accountancy.objects.get(cash=self.cash)
+
+        self.client.post(reverse("admin:manager_accountancy_delete", args=[income.id]), {"post": "yes"})  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual(self.balances(), (10000, 500, 0))
+        self.assertFalse(Accountancy.objects.exists())
+
+        post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+        post_transaction("cash", self.cash.id, "O", Category.objects.get(user=None, IO="O", name="Food").id, 100)  # type: ignore[reportAttributeAccessIssue]
+        self.client.post(
+            reverse("admin:manager_accountancy_changelist"),
+            {
+                "action": "delete_selected",
+                "post": "yes",
+                "_selected_action": list(Accountancy.objects.values_list("id", flat=True)),
+            },
+        )
+        self.assertEqual(self.balances(), (10000, 500, 0))
+        self.assertFalse(Accountancy.objects.exists())
+
+    def test_admin_delete_of_spent_income(self) -> None:
+        admin = get_user_model().objects.create_superuser(username=fake.pystr(), password=fake.pystr())
+        self.client.force_login(admin)
+        post_transfer(self.user.id, ("card", self.card.id), ("cash", self.cash.id), 3000)  # type: ignore[reportAttributeAccessIssue]
+        post_transaction("cash", self.cash.id, "O", Category.objects.get(user=None, IO="O", name="Food").id, 3500)  # type: ignore[reportAttributeAccessIssue]
+        income = Accountancy.objects.get(cash=self.cash, IO="I")
+
+        response = self.client.post(reverse("admin:manager_accountancy_delete", args=[income.id]), {"post": "yes"})  # type: ignore[reportAttributeAccessIssue]
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.balances(), (7000, 0, 0))
+        self.assertEqual(Accountancy.objects.count(), 3)
@@ -2,15 +2,18 @@ from datetime import UTC, datetime
 from typing import TYPE_CHECKING
 
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db.models import F, Q
 from django.test import TestCase
 from django.urls import reverse
 from faker import Faker
 
+from manager.exchange_rates import exchange_rates
+from manager.metrics import assert_max_queries
 from manager.models import (
     Accountancy,
     Card,
     Cash,
+    Category,
     Cryptocurrency,
     Currency,
 )
@@ -54,14 +57,16 @@ class PrivateViewsTests(TestCase):
         Cash.objects.create(user=self.user, currency=currency)
         bitcoin = Cryptocurrency.objects.create(user=self.user, name="BitCoin")
         Cryptocurrency.objects.create(user=self.user, name="Dogecoin")
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
         Accountancy.objects.create(
-            card=payment_card, IO="I", IO_type="Salary", amount="25000", datetime=datetime(2022, 11, 1, tzinfo=UTC)
+            card=payment_card, IO="I", category=self.salary, amount=2500000, datetime=datetime(2022, 11, 1, tzinfo=UTC)
         )
         Accountancy.objects.create(
             cryptocurrency=bitcoin,
             IO="I",
-            IO_type="Salary",
-            amount="0.00020001",
+            category=self.salary,
+            amount=20001,
             datetime=datetime(2022, 12, 1, tzinfo=UTC),
         )
 
@@ -87,8 +92,124 @@ class PrivateViewsTests(TestCase):
 
     def test_retrieve_wallets_financial_turnover(self) -> None:
         response = self.client.get(MONTHLY_ACCOUNTANCY_URL)
-        accountancy = Accountancy.objects.filter(Q(datetime__month=11))
+        accountancy = Accountancy.objects.filter(Q(datetime__month=11)).values(
+            "id", "IO", "amount", "datetime", category_name=F("category__name")
+        )
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(list(response.context["accountancy_list"]), list(accountancy))
         self.assertTemplateUsed(response, "manager/monthly_accountancy.html")
+
+    def test_post_expenses_on_index(self) -> None:
+        card = Card.objects.get(type="Payment card")
+        wallet_choice = f"card - {card.id}"
+
+        response = self.client.post(
+            INDEX_URL, {"wallet_choice": wallet_choice, "Income": self.salary.id, "amount": "100"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(response.context["error"])
+        self.assertEqual(response.context["current_balance"], 100)
+
+        response = self.client.post(
+            INDEX_URL, {"wallet_choice": wallet_choice, "Income": "none", "Outcome": self.food.id, "amount": "150"}
+        )
+        self.assertIsNotNone(response.context["error"])
+        self.assertEqual(response.context["current_balance"], 100)
+
+    def test_post_unknown_category_on_index(self) -> None:
+        card = Card.objects.get(type="Payment card")
+        wallet_choice = f"card - {card.id}"
+
+        for category in ("Salary", self.food.id, 0):
+            with self.subTest(category=category):
+                response = self.client.post(
+                    INDEX_URL, {"wallet_choice": wallet_choice, "Income": category, "amount": "100"}
+                )
+                self.assertEqual(response.context["error"].message, "There's no such category.")
+                self.assertEqual(response.context["current_balance"], 0)
+
+    def test_index_renders_user_categories(self) -> None:
+        other_user = get_user_model().objects.create_user(username=fake.pystr(), password=fake.pystr())
+        Category.objects.create(user=self.user, IO="O", name="Coffee")
+        Category.objects.create(user=other_user, IO="O", name="Tea")
+
+        response = self.client.get(INDEX_URL)
+        outcome = [category.name for half in response.context["outcome_categories"] for category in half]
+        self.assertIn("Food", outcome)
+        self.assertIn("Coffee", outcome)
+        self.assertNotIn("Tea", outcome)
+        self.assertEqual(
+            [category.name for category in response.context["income_categories"]],
+            ["Salary", "One-time", "Assets", "Passives", "Other"],
+        )
+        self.assertContains(response, f'value="{self.food.id}"')
+
+    def test_create_category(self) -> None:
+        url = reverse("manager:category-create")
+
+        response = self.client.post(url, {"IO": "O", "name": "Coffee"})
+        self.assertRedirects(response, INDEX_URL)
+        self.assertTrue(Category.objects.filter(user=self.user, IO="O", name="Coffee").exists())
+
+        response = self.client.post(url, {"IO": "O", "name": "food"})
+        self.assertEqual(response.status_code, 200)
+        self.assertFormError(response.context["form"], None, "There's such a category already.")
+
+    async def test_async_views_under_asgi(self) -> None:
+        await self.async_client.aforce_login(self.user)
+        card = await Card.objects.aget(type="Payment card")
+
+        response = await self.async_client.post(
+            INDEX_URL, {"wallet_choice": f"card - {card.id}", "Income": self.salary.id, "amount": "100"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context["current_balance"], 100)
+        self.assertEqual(response.context["Income"], 100)
+
+        response = await self.async_client.get(WALLETS_URL)
+        self.assertEqual(len(response.context["cards_list"]), 2)
+
+        response = await self.async_client.get(MONTHLY_ACCOUNTANCY_URL)
+        self.assertEqual(len(response.context["accountancy_list"]), 1)
+
+    def test_monthly_accountancy_of_unknown_wallet(self) -> None:
+        response = self.client.get(MONTHLY_ACCOUNTANCY_URL.replace("/card/", "/bond/"))
+        self.assertEqual(response.status_code, 404)
+
+    def test_monthly_accountancy_of_invalid_month(self) -> None:
+        for month, year in ((0, 2022), (13, 2022), (12, 9999), (1, 0)):
+            with self.subTest(month=month, year=year):
+                response = self.client.get(MONTHLY_ACCOUNTANCY_URL.replace("/11/2022/", f"/{month}/{year}/"))
+                self.assertEqual(response.status_code, 404)
+
+    def test_currency_of_wallet_with_records_is_kept(self) -> None:
+        euro = Currency.objects.create(name="Euro", abbreviation="EUR", sign="€")
+        payment_card, storage_card = Card.objects.order_by("id")
+
+        for card in (payment_card, storage_card):
+            self.client.post(
+                reverse("manager:card-update", args=[card.id]),  # type: ignore[reportAttributeAccessIssue]
+                {"user": self.user.id, "bank_name": "Privat", "type": card.type, "currency": euro.id},  # type: ignore[reportAttributeAccessIssue]
+            )
+            card.refresh_from_db()
+
+        self.assertEqual((payment_card.bank_name, payment_card.currency_id), ("Privat", 1))  # type: ignore[reportAttributeAccessIssue]
+        self.assertEqual((storage_card.bank_name, storage_card.currency_id), ("Privat", euro.id))  # type: ignore[reportAttributeAccessIssue]
+        response = self.client.get(reverse("manager:card-update", args=[payment_card.id]))  # type: ignore[reportAttributeAccessIssue]
+        self.assertContains(response, "The currency of a wallet with money or records can't be changed.")
+
+    def test_query_budgets(self) -> None:
+        currency = Currency.objects.get()
+        for index in range(5):
+            Card.objects.create(user=self.user, bank_name="Privat", type=f"Card {index}", currency=currency)
+
+        exchange_rates.refresh()
+
+        # Session, user, the three wallet types, the currency registry, the exchange rate snapshot and the net
+        # worth, however many wallets there are; the next views get the wallets from the cache, the index its
+        # categories and the monthly records their wallet currency
+        budgets = {WALLETS_URL: 8, INDEX_URL: 3, ACCOUNTANCY_URL: 3, MONTHLY_ACCOUNTANCY_URL: 4}
+        for url, budget in budgets.items():
+            with self.subTest(url=url), assert_max_queries(budget):
+                self.client.get(url)
@@ -0,0 +1,72 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from faker import Faker
+
+from manager.models import Accountancy, Card, Category, Currency
+from manager.wallet_operations import post_transaction
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import UserManager
+
+fake = Faker()
+
+
+class PostTransactionTests(TestCase):
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(
+            user=user, bank_name="Mono", type="Payment card", balance=1000, currency=currency
+        )
+        self.salary = Category.objects.get(user=None, IO="I", name="Salary")
+        self.food = Category.objects.get(user=None, IO="O", name="Food")
+
+    def test_post_income_and_outcome(self) -> None:
+        self.assertEqual(post_transaction("card", self.card.id, "I", self.salary.id, 555), 1555)
+        self.assertEqual(post_transaction("card", self.card.id, "O", self.food.id, 55), 1500)
+        self.assertEqual(Accountancy.objects.filter(card=self.card).count(), 2)
+
+    def test_outcome_above_balance_is_rejected(self) -> None:
+        with self.assertRaises(ValidationError):
+            post_transaction("card", self.card.id, "O", self.food.id, 1001)
+
+        self.card.refresh_from_db()
+        self.assertEqual(self.card.balance, 1000)
+        self.assertFalse(Accountancy.objects.exists())
+
+
+class ConcurrentPostTransactionTests(TransactionTestCase):
+    THREADS = 8
+    POSTS = 40
+
+    def setUp(self) -> None:
+        user_manager: UserManager = get_user_model().objects  # type: ignore[reportAssignmentType]
+        user = user_manager.create_user(username=fake.pystr(), password=fake.pystr())
+        currency = Currency.objects.create(name="U. S. Dollar", abbreviation="USD", sign="$")
+        self.card = Card.objects.create(user=user, bank_name="Mono", type="Payment card", balance=30, currency=currency)
+        # The default categories seeded by the migrations don't survive the flushes between transaction test cases
+        self.category = Category.objects.create(user=user, IO="O", name="Groceries")
+
+    def post_expense(self, _: int) -> bool:
+        try:
+            post_transaction("card", self.card.id, "O", self.category.id, 1)
+        except ValidationError:
+            return False
+        finally:
+            connection.close()
+        return True
+
+    def test_concurrent_expenses_do_not_lose_updates(self) -> None:
+        with ThreadPoolExecutor(max_workers=self.THREADS) as executor:
+            posted = sum(executor.map(self.post_expense, range(self.POSTS)))
+
+        self.card.refresh_from_db()
+        self.assertEqual(posted, 30)
+        self.assertEqual(self.card.balance, 0)
+        self.assertEqual(Accountancy.objects.filter(card=self.card).count(), posted)
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/4.1/ref/settings/
 import os
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -69,7 +71,6 @@ TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -77,22 +78,69 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Templates are compiled once per process. Django resets the cache when a template changes under
+            # `runserver`, so it's on in development too.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    ["django.template.loaders.filesystem.Loader", "django.template.loaders.app_directories.Loader"],
+                )
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = "zlatnic.wsgi.application"
 
+# Per-request SQL and timing metrics in `Server-Timing` headers, requests over the budgets are logged
+REQUEST_METRICS = os.getenv("REQUEST_METRICS", "").lower() in {"1", "true", "yes", "on"}
+REQUEST_METRICS_BUDGETS = {
+    "queries": int(os.getenv("REQUEST_METRICS_MAX_QUERIES", "20")),
+    "db_ms": float(os.getenv("REQUEST_METRICS_MAX_DB_MS", "200")),
+    "total_ms": float(os.getenv("REQUEST_METRICS_MAX_TOTAL_MS", "500")),
+}
+if REQUEST_METRICS:
+    MIDDLEWARE.insert(0, "manager.metrics.RequestMetricsMiddleware")
+    TEMPLATES[0]["BACKEND"] = "manager.metrics.DjangoTemplates"
+
+# Abbreviation of the currency the net worth is shown in, see the `load_exchange_rates` command
+BASE_CURRENCY = os.getenv("BASE_CURRENCY", "USD")
+
 
 # Database
 # https://docs.djangoproject.com/en/4.1/ref/settings/#databases
+# `DATABASE_PROFILE` selects how connections are managed, see "Database profiles" in the README:
+# - SQLite (DEBUG): "tuned" (WAL journal, `synchronous=NORMAL`, mmap, busy timeout) or "simple" (SQLite defaults);
+# - PostgreSQL: "pool" (psycopg's connection pool), "persistent" (`CONN_MAX_AGE` with health checks)
+#   or "simple" (a new connection, and TLS handshake, per request).
+
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "tuned" if DEBUG else "pool")
+if DATABASE_PROFILE not in ({"tuned", "simple"} if DEBUG else {"pool", "persistent", "simple"}):
+    raise ImproperlyConfigured(f"Unknown DATABASE_PROFILE '{DATABASE_PROFILE}'.")
 
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        # A file-backed test database lets concurrent connections wait for each other's locks
+        # instead of failing with "database table is locked" on a shared in-memory cache.
+        "TEST": {"NAME": BASE_DIR / "test_db.sqlite3"},
     }
 }
+# Applied to every new SQLite connection by `manager.db.apply_sqlite_pragmas()`
+SQLITE_PRAGMAS: dict[str, str | int] = {}
+if DATABASE_PROFILE == "tuned":
+    SQLITE_PRAGMAS = {
+        # First, so switching the journal mode waits for the other connections too
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+        # Persisted in the database file, unlike the other pragmas
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    }
+    # Writers take the lock when their transaction begins, instead of failing with "database is locked"
+    # when a reader upgrades to a writer
+    DATABASES["default"]["OPTIONS"] = {"transaction_mode": "IMMEDIATE"}
 
 if not DEBUG:
     DATABASES = {
@@ -108,6 +156,48 @@ if not DEBUG:
             },
         }
     }
+    if DATABASE_PROFILE == "pool":
+        from psycopg_pool import ConnectionPool
+
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DATABASE_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DATABASE_POOL_MAX_SIZE", "10")),
+            # Seconds a request waits for a free connection before failing
+            "timeout": float(os.getenv("DATABASE_POOL_TIMEOUT", "10")),
+            # Connections dropped by the server are replaced before they're handed out
+            "check": ConnectionPool.check_connection,
+        }
+    elif DATABASE_PROFILE == "persistent":
+        DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DATABASE_CONN_MAX_AGE", "600"))
+        DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# The per-user data versions that invalidate the wallet cache, the template fragments and the ETags are bumped
+# in the worker that handled the write, so outside DEBUG the cache must be shared between the workers: the
+# database table `zlatnic_cache` (made by `createcachetable`) by default, or e.g.
+# "django.core.cache.backends.redis.RedisCache" with a "redis://" location. Local memory is for DEBUG only.
+
+PROCESS_LOCAL_CACHE_BACKENDS = {
+    "django.core.cache.backends.locmem.LocMemCache",
+    "django.core.cache.backends.dummy.DummyCache",
+}
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv("CACHE_BACKEND")
+        or (
+            "django.core.cache.backends.locmem.LocMemCache" if DEBUG else "django.core.cache.backends.db.DatabaseCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION") or ("zlatnic" if DEBUG else "zlatnic_cache"),
+    }
+}
+if not DEBUG and CACHES["default"]["BACKEND"] in PROCESS_LOCAL_CACHE_BACKENDS:
+    raise ImproperlyConfigured(f"CACHE_BACKEND '{CACHES['default']['BACKEND']}' isn't shared between the workers.")
+# Part of the ETags of the pages served conditionally, see `manager.conditional`. Change it on every deploy, so
+# browsers don't keep the pages rendered by the previous release; Render sets `RENDER_GIT_COMMIT`.
+RELEASE = os.getenv("RELEASE") or os.getenv("RENDER_GIT_COMMIT", "")
+# Lifetime of the per-user `{% cache %}` template fragments in seconds, 0 disables them
+FRAGMENT_CACHE_TIMEOUT = int(os.getenv("FRAGMENT_CACHE_TIMEOUT", str(60 * 60 * 24)))
 
 # Password validation
 # https://docs.djangoproject.com/en/4.1/ref/settings/#auth-password-validators